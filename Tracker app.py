@@ -10,7 +10,457 @@ wish to populate the tables.
 import sqlite3
 import datetime
 import csv
-from operator import itemgetter
+import json
+import argparse
+import hashlib
+import array
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import http
+import io
+import os
+import pathlib
+import platform
+import queue
+import tempfile
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import shlex
+import sys
+import random
+import threading
+import time
+import urllib.parse
+from fractions import Fraction
+
+# NumPy is only needed for the analytics, so the rest of the app runs 
+# without it.
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+
+# INDEX DEFINITIONS
+
+# The indexes made by the third migration in the form [index name, table 
+# name, columns, is unique]. An index is never changed here once it has 
+# been released, as a database which has already been migrated would not
+# get the change; a new migration with its own list is added instead.
+# The date and category indexes also hold the amount and description so that
+# the range searches in retrieve_income_expense can be answered from the
+# index alone without visiting the tables. The category and date indexes 
+# are also used to find the records of a category when categories are 
+# listed or merged.
+INDEXES = [
+    ["Income_date_category_idx", "Income", 
+     "date, category_id, amount, description", False],
+    ["Income_category_date_idx", "Income", 
+     "category_id, date, amount, description", False],
+    ["Expenses_date_category_idx", "Expenses", 
+     "date, category_id, amount, description", False],
+    ["Expenses_category_date_idx", "Expenses", 
+     "category_id, date, amount, description", False],
+    ["Goals_date_idx", "Goals", "date", False],
+    ["DailyTotals_category_date_idx", "DailyTotals", 
+     "table_name, category_id, date, total, count, smallest_amount, "
+     + "largest_amount", False]
+]
+
+
+# The unique content hash indexes made by the fourth migration, which 
+# stopped the same record being added twice, in the same form as INDEXES.
+UNIQUE_CONTENT_HASH_INDEXES = [
+    ["Income_content_hash_idx", "Income", "content_hash", True],
+    ["Expenses_content_hash_idx", "Expenses", "content_hash", True]
+]
+
+
+# The content hash indexes made by the sixth migration in place of the 
+# unique ones, in the same form as INDEXES. They are used to find the 
+# copies of a record already in a table when a CSV file is imported, see 
+# find_new_records.
+CONTENT_HASH_INDEXES = [
+    ["Income_content_hash_idx", "Income", "content_hash", False],
+    ["Expenses_content_hash_idx", "Expenses", "content_hash", False]
+]
+
+
+# SETTINGS
+
+# When viewing more records than this the user is shown a page of this many
+# records at a time, and can move to the next or previous page or jump to a
+# date.
+RECORD_DISPLAY_LIMIT = 100
+
+
+# The number of records which are fetched from the database and written out
+# at a time when displaying a table, so that a table of any size is shown
+# without holding all of it in memory or writing each row on its own.
+DISPLAY_BLOCK_SIZE = 1000
+
+
+# The number of rows of a CSV file which are read and added to the tables
+# at a time when importing.
+IMPORT_CHUNK_SIZE = 10000
+
+
+# The settings given to every connection to the database in the form 
+# [pragma, value]. With the database in WAL mode, synchronous NORMAL only
+# syncs the file at checkpoints while still keeping it safe from a crash.
+# The cache size is in KiB when negative, so each connection caches up to
+# 64 MiB of pages and reads up to 256 MiB of the file through a memory map.
+# The temporary tables used when importing, such as ImportedRecords, are 
+# given the same cache rather than the much smaller default.
+# A connection which finds the database locked waits up to 5 seconds for
+# the lock rather than failing straight away.
+CONNECTION_PRAGMAS = [
+    ["synchronous", "NORMAL"],
+    ["cache_size", -65536],
+    ["temp.cache_size", -65536],
+    ["mmap_size", 268435456],
+    ["busy_timeout", 5000]
+]
+
+
+# The goals share out profit in units of this fraction of a penny, so the
+# shares are whole numbers which stay the same size however many intervals
+# are shared out. It is the smallest number which every whole number up to
+# 20 divides into, so profit shared between up to 20 goals, which is the 
+# usual case, is shared exactly and an amount which is used up exactly by 
+# its shares is found to be completed.
+GOAL_SHARE_SCALE = 232792560
+
+
+# The number of read only connections which are kept open for reports, so 
+# this many reports can read from the database at the same time as each 
+# other and as a write.
+READER_POOL_SIZE = 4
+
+
+# The largest body in bytes of a request to the JSON service, see 
+# run_service.
+SERVICE_MAX_BODY_SIZE = 65536
+
+
+# The file which holds the name and database file of each registered 
+# ledger, such as one for each household, in the form {name: path}. It is 
+# kept next to this file so the same ledgers are found whichever directory
+# the app is run from.
+LEDGER_REGISTRY_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "ledgers.json")
+
+
+# A snapshot file starts with these 8 bytes, followed by the length of its
+# JSON header as an 8 byte little endian integer, the header itself padded
+# to a multiple of 8 bytes and then the columns of each table as arrays of 
+# 64 bit little endian integers, whichever computer wrote them. The 
+# header holds the number of records of each table, the position of each 
+# of its columns after the header and the name of each category ID.
+SNAPSHOT_MAGIC = b"BTSNAP01"
+
+
+# The columns of each table which are kept in a snapshot, in the order of 
+# the load_ledger query.
+SNAPSHOT_COLUMNS = ["date", "amount", "category"]
+
+
+# QUERY DEFINITIONS
+
+# The columns of the Income and Expenses tables. Each record holds the ID of
+# its category in the Categories table rather than the name of the category,
+# so a category is renamed by changing one row of Categories. Every amount 
+# of money the app stores is a whole number of pence, so amounts are added
+# up exactly and are only turned into pounds when shown to the user. Every
+# date is stored as its Julian day number, see JULIAN_DAY_OFFSET. The 
+# content hash of each record is worked out by content_hash when it is 
+# added.
+INCOME_EXPENSE_COLUMNS = '''id INTEGER PRIMARY KEY, date INTEGER, 
+    amount INTEGER, category_id INTEGER NOT NULL REFERENCES Categories(id), 
+    description TEXT, content_hash BLOB'''
+
+
+# The columns of the Budget table, which holds the weekly budget in pence of
+# the categories in Expenses.
+BUDGET_COLUMNS = '''category TEXT PRIMARY KEY, budget INTEGER'''
+
+
+# The columns of the Goals table, with the amount of each goal in pence.
+GOALS_COLUMNS = '''date INTEGER, amount INTEGER, description TEXT, 
+    id INTEGER PRIMARY KEY'''
+
+
+# Dates are stored as Julian day numbers, the number of days since 24 
+# November 4714 BC, so date ranges are compared as whole numbers and the 
+# date functions of SQLite (such as date and strftime) read them directly.
+# This is the Julian day number of the day before 1 January of year 1, the 
+# first day of Python's date.toordinal.
+JULIAN_DAY_OFFSET = 1721425
+
+
+# Finds the ID of a category of a table from the name of the category, used 
+# in place of the category ID in the queries of the Income, Expenses and 
+# DailyTotals tables. The table name is filled in with format and the name 
+# of the category is the parameter.
+CATEGORY_ID_QUERY = '''(SELECT id FROM Categories 
+    WHERE table_name = '{table_name}' AND name = ?)'''
+
+
+# The queries below are the ones the app issues which don't change shape
+# with the search being made. Those with a table name in them have it 
+# filled in with format. check_query_plans checks these same queries, so
+# they must be changed here rather than copied into the functions which 
+# use them.
+
+# Finds the ID of a category from (table name, name of the category).
+CATEGORY_KEY_QUERY = '''SELECT id FROM Categories 
+    WHERE table_name = ? AND name = ?'''
+
+
+# Finds the (name, ID) of two categories of a table from (table name, name, 
+# name).
+CATEGORY_PAIR_QUERY = '''SELECT name, id FROM Categories 
+    WHERE table_name = ? AND name IN (?, ?)'''
+
+
+# Finds the (ID, name) of every category of a table from (table name).
+CATEGORY_NAMES_QUERY = '''SELECT id, name FROM Categories 
+    WHERE table_name = ?'''
+
+
+# Finds the names of the categories of a table which have any records in 
+# them, in alphabetical order, from (table name).
+CATEGORIES_QUERY = '''SELECT name FROM Categories 
+    WHERE table_name = ? AND EXISTS (SELECT 1 
+        FROM {table_name} WHERE category_id = Categories.id) 
+    ORDER BY name'''
+
+
+# Finds whether a category of a table has any records in it from (name of
+# the category).
+CATEGORY_HAS_RECORDS_QUERY = ('''SELECT EXISTS (SELECT 1 FROM {table_name} 
+    WHERE category_id = ''' + CATEGORY_ID_QUERY + ''')''')
+
+
+# Finds the record of the Income or Expenses table with an ID in the format
+# (date, amount, category, description, id) from (id).
+RECORD_BY_ID_QUERY = '''SELECT date(date), amount, Categories.name, 
+        description, {table_name}.id 
+    FROM {table_name} JOIN Categories 
+    ON Categories.id = {table_name}.category_id 
+    WHERE {table_name}.id = ?'''
+
+
+# Replaces the record of the Income or Expenses table with an ID, from 
+# (date, amount, name of the category, description, content hash, id).
+UPDATE_RECORD_QUERY = ('''UPDATE {table_name} 
+    SET date = ?, amount = ?, category_id = ''' + CATEGORY_ID_QUERY + ''', 
+        description = ?, content_hash = ? 
+    WHERE id = ?''')
+
+
+# Deletes the record of a table with an ID from (id).
+DELETE_RECORD_QUERY = '''DELETE FROM {table_name} WHERE id = ?'''
+
+
+# Moves every record of a table from one category to another from (ID of
+# the new category, ID of the original category).
+MOVE_CATEGORY_QUERY = '''UPDATE {table_name} SET category_id = ? 
+    WHERE category_id = ?'''
+
+
+# Makes the table import_csv uses to count the copies of each record in the
+# file being imported, in the form (table name, category, content hash, 
+# number of copies in the table before the import, number of copies in the
+# file so far), see find_new_records. A goal has no category so its 
+# category is empty. It is a temporary table, so it is only seen by the 
+# connection doing the import and is dropped when it is closed.
+IMPORTED_RECORDS_TABLE_QUERY = '''CREATE TEMP TABLE IF NOT EXISTS 
+    ImportedRecords(table_name TEXT, category TEXT, content_hash BLOB, 
+    no_in_table INTEGER, no_in_file INTEGER, 
+    PRIMARY KEY(table_name, category, content_hash)) WITHOUT ROWID'''
+
+
+# Makes the temporary table find_new_records fills with each record of the
+# chunk being imported, once each, in the form (category, content hash, 
+# number of copies in the chunk, date, amount, description), so that they
+# can all be counted together.
+CHUNK_RECORDS_TABLE_QUERY = '''CREATE TEMP TABLE IF NOT EXISTS 
+    ChunkRecords(category TEXT, content_hash BLOB, no_in_chunk INTEGER, 
+    date INTEGER, amount INTEGER, description TEXT)'''
+
+
+# Adds a record to the ChunkRecords table from (category, content hash, 
+# number of copies in the chunk, date, amount, description).
+SAVE_CHUNK_RECORD_QUERY = '''INSERT INTO ChunkRecords(category, 
+    content_hash, no_in_chunk, date, amount, description) 
+    VALUES (?,?,?,?,?,?)'''
+
+
+# Adds the copies of every record of the ChunkRecords table to its counts 
+# in the ImportedRecords table in one query. A record seen earlier in the 
+# file keeps the number of copies in the table it was given then, while 
+# any other record is given the number of copies in the table now, which 
+# is found with no_in_table, either CONTENT_HASH_COUNT or GOAL_COUNT. The 
+# table name and no_in_table are filled in with format.
+COUNT_IMPORTED_RECORDS_QUERY = '''INSERT OR REPLACE INTO ImportedRecords(
+        table_name, category, content_hash, no_in_table, no_in_file)
+    SELECT '{table_name}', ChunkRecords.category, ChunkRecords.content_hash,
+        COALESCE(ImportedRecords.no_in_table, {no_in_table}), 
+        COALESCE(ImportedRecords.no_in_file, 0) + ChunkRecords.no_in_chunk
+    FROM ChunkRecords LEFT JOIN ImportedRecords 
+    ON ImportedRecords.table_name = '{table_name}' 
+        AND ImportedRecords.category = ChunkRecords.category 
+        AND ImportedRecords.content_hash = ChunkRecords.content_hash'''
+
+
+# Counts the copies of a record of the ChunkRecords table in the Income or
+# Expenses table by its content hash and category, for 
+# COUNT_IMPORTED_RECORDS_QUERY.
+CONTENT_HASH_COUNT = '''(SELECT COUNT(*) FROM {table_name} 
+    WHERE content_hash = ChunkRecords.content_hash 
+    AND category_id = (SELECT id FROM Categories 
+        WHERE table_name = '{table_name}' AND name = ChunkRecords.category))'''
+
+
+# Counts the copies of a record of the ChunkRecords table in the Goals 
+# table, which doesn't keep content hashes, by its date, amount and 
+# description, for COUNT_IMPORTED_RECORDS_QUERY.
+GOAL_COUNT = '''(SELECT COUNT(*) FROM Goals 
+    WHERE date = ChunkRecords.date AND amount = ChunkRecords.amount 
+    AND description = ChunkRecords.description)'''
+
+
+# Finds the (category, content hash, number of copies to skip) of each 
+# record of the ChunkRecords table which has copies in the chunk that are
+# already in its table, from (table name), once COUNT_IMPORTED_RECORDS_QUERY
+# has counted the chunk. The copies of a record in the file up to the 
+# number in the table before the import are already in the table, so 
+# those in the chunk are skipped until the count in the file passes it.
+SKIPPED_RECORDS_QUERY = '''SELECT ChunkRecords.category, 
+        ChunkRecords.content_hash, 
+        MIN(no_in_table - no_in_file + no_in_chunk, no_in_chunk)
+    FROM ChunkRecords JOIN ImportedRecords 
+    ON ImportedRecords.table_name = ? 
+        AND ImportedRecords.category = ChunkRecords.category 
+        AND ImportedRecords.content_hash = ChunkRecords.content_hash
+    WHERE no_in_table > no_in_file - no_in_chunk'''
+
+
+# Finds the smallest or largest amount of the records of a day and category,
+# used by the triggers of the DailyTotals table. The aggregate (MIN or MAX),
+# the table name, the date and the category ID are all filled in with 
+# format, the last two being either columns of the trigger or ? for 
+# parameters.
+DAY_AMOUNT_QUERY = '''SELECT {aggregate}(amount) FROM {table_name} 
+    WHERE date = {date} AND category_id = {category_id}'''
+
+
+# Finds the weekly budget of a category from (category).
+BUDGET_QUERY = '''SELECT budget FROM Budget WHERE category = ?'''
+
+
+# Finds every budget in the order of their categories.
+BUDGETS_QUERY = '''SELECT * FROM Budget ORDER BY category'''
+
+
+# Finds every goal in date order. The goals are ordered by I.D. as well as 
+# date so that each goal has the same place in the goal checkpoint every 
+# time.
+GOALS_QUERY = '''SELECT * FROM Goals ORDER BY date, id'''
+
+
+# Finds the start date of the earliest goal, or None if there are no goals.
+FIRST_GOAL_DATE_QUERY = '''SELECT MIN(date) FROM Goals'''
+
+
+# Finds the date and state of the goal checkpoint, see 
+# create_goal_checkpoint.
+GOAL_CHECKPOINT_QUERY = '''SELECT checkpoint_date, allocation 
+    FROM GoalCheckpoint WHERE id = 1'''
+
+
+# Saves the goal checkpoint from (checkpoint date, allocation JSON).
+SAVE_GOAL_CHECKPOINT_QUERY = '''INSERT OR REPLACE INTO GoalCheckpoint(id, 
+    checkpoint_date, allocation) VALUES (1, ?, ?)'''
+
+
+# Finds the version of the layout of the database, see read_schema_version.
+SCHEMA_VERSION_QUERY = '''SELECT MAX(version) FROM schema_version'''
+
+
+# Finds the profit (income minus expenses) made in each of a list of date
+# intervals with one query. The intervals are given as a JSON list of
+# [start day number, end day number] pairs and the result is one row of
+# (interval index, profit) for every interval which has any records in it.
+# The profit is added up from the DailyTotals table so each interval only
+# reads one row per day and category, found with a search of its key.
+PROFIT_BETWEEN_DATES_QUERY = '''
+    WITH intervals(interval, start_date, end_date) AS (
+        SELECT key, json_extract(value, '$[0]'), json_extract(value, '$[1]')
+        FROM json_each(?))
+    SELECT intervals.interval, 
+        SUM(CASE WHEN DailyTotals.table_name = 'Income' 
+                   THEN DailyTotals.total ELSE -DailyTotals.total END)
+    FROM intervals JOIN DailyTotals
+    ON DailyTotals.table_name IN ('Income', 'Expenses') 
+    AND DailyTotals.date BETWEEN intervals.start_date AND intervals.end_date
+    GROUP BY intervals.interval ORDER BY intervals.interval'''
+
+
+# Compares the spending in every Expenses category between two dates with 
+# the budget of the category over the same number of days, in one query. 
+# The parameters are (start day number, end day number, number of days) 
+# and the result is one row of (category, budget, spent, budget left, 
+# percentage of the budget used) for every category which has a budget or 
+# any spending, with the amounts in pence. The budget, budget left and 
+# percentage used are None for a category without a budget. The spending is
+# added up from the DailyTotals table, found with a search of its primary 
+# key. The categories with a budget are joined to their spending and the 
+# spending of the categories without one is added after them, rather than
+# using a FULL OUTER JOIN, which older versions of SQLite (before 3.39) 
+# don't have.
+BUDGET_REPORT_QUERY = '''
+    WITH spending(category, spent) AS (
+        SELECT Categories.name, SUM(DailyTotals.total)
+        FROM DailyTotals JOIN Categories 
+        ON Categories.id = DailyTotals.category_id
+        WHERE DailyTotals.table_name = 'Expenses' 
+        AND DailyTotals.date BETWEEN ? AND ?
+        GROUP BY +DailyTotals.category_id),
+    budgets(category, budget) AS (
+        SELECT category, CAST(ROUND(budget * ? / 7.0) AS INTEGER) 
+        FROM Budget),
+    report(category, budget, spent) AS (
+        SELECT budgets.category, budgets.budget, COALESCE(spending.spent, 0)
+        FROM budgets LEFT JOIN spending 
+        ON spending.category = budgets.category
+        UNION ALL
+        SELECT category, NULL, spent FROM spending
+        WHERE NOT EXISTS (SELECT 1 FROM Budget 
+                          WHERE Budget.category = spending.category))
+    SELECT category, budget, spent, budget - spent,
+        CASE WHEN budget > 0 THEN spent * 100.0 / budget END
+    FROM report'''
+
+
+# The periods records can be grouped by when viewing them, in the form 
+# {period: bucket}. The bucket is the SQLite expression which gives the 
+# same value for every date in the same period, so the grouping is done by
+# SQLite with a GROUP BY. Each period is labelled with its bucket, which is 
+# the date of the Monday for a week. Day number 0 was a Monday, so every 
+# Monday is a whole number of weeks after it.
+PERIOD_BUCKETS = {
+    "day": "date(date)",
+    "week": "date(date - date % 7)",
+    "month": "strftime('%Y-%m', date)",
+    "year": "strftime('%Y', date)"
+}
 
 
 # FUNCTION DEFINITIONS
@@ -114,1215 +564,5912 @@ def check_yes_no(answer):
     return answer.lower()
 
 
-def budget_for_category_over_date(category, start_date, end_date):
+def pounds_to_pence(amount):
     """
-    budget_for_category over date finds the weekly budget of a category 
-    from the Budget table and then finds out what the budget would be 
-    for that catgeory between the determined start and end date.
-    
-    Parameters  :   category : str
-                        The name of the category which has the budget.
-                    start_date : datetime.date
-                        The start date of the 'Expenses' table search.
-                    end_date : datetime.date
-                        The end date of the 'Expenses' table search. 
+    pounds_to_pence converts an amount of money in pounds, as typed in by 
+    the user or read from a CSV file, to the whole number of pence it is 
+    stored as.
 
-    Returns     :   budget_over_date : float | NoneType
-                        Either how much the budget is for the category over
-                        the date range, or None if no budget has been set 
-                        for that category.     
+    Parameters  :   amount : float | str
+                        The amount in pounds.
+
+    Returns     :   pence : int
+                        The amount in pence.
+
+    Raises      :   ValueError
+                        If the amount is not a number.
     """
+    return round(float(amount) * 100)
 
-    cursor.execute('''SELECT budget FROM Budget WHERE category = ?''', 
-                   (category,))
-    budget_tuple = cursor.fetchone()
-    db.commit()
 
-    if budget_tuple != None:
-        (budget,) = budget_tuple
-        no_of_days = (end_date - start_date)
-        no_of_days = no_of_days.days
+def format_pounds(pence):
+    """
+    format_pounds writes a whole number of pence as pounds to 2 decimal 
+    places, so 123456 is written as "1234.56". Only whole numbers are used 
+    so the amount shown is never rounded.
 
-        budget_over_date = budget * (no_of_days) / 7
-        budget_over_date = round(budget_over_date,2)
-    
-    else:
-        budget_over_date = None
-    
-    return budget_over_date
+    Parameters  :   pence : int
+                        The amount in pence.
+
+    Returns     :   pounds : str
+                        The amount in pounds to 2 decimal places.
+    """
+    (pounds, pennies) = divmod(abs(pence), 100)
 
+    if pence < 0:
+        return f"-{pounds}.{pennies:02d}"
 
-def display_as_table(table_name, record_list):
+    return f"{pounds}.{pennies:02d}"
+
+
+def date_to_day_number(date):
     """
-    display_as_table displays data from record_list as a table to the user.
-    The headings of the table corresepond with the table the data represents.
-    If the record_list contains multiple records (in a list of lists format)
-    then it goes through each record and prints them. 
+    date_to_day_number converts a date to the Julian day number it is 
+    stored as in the database.
 
+    Parameters  :   date : datetime.date | str
+                        The date, or the date in the format YYYY-MM-DD.
 
-    Parameters  :   table_name : str
-                        The name of the table which the data represents.
-                    record_list : list
-                        Either a list of records or a single record which 
-                        is in the format [date, amount, category,
-                        description, id] for the 'Income' and 'Expenses' 
-                        tables, [category, budget] for the Budget table
-                        or [date, amount, description, id] for the Goals
-                        table. 
+    Returns     :   day_number : int
+                        The Julian day number of the date.
 
-    Returns     :
+    Raises      :   ValueError
+                        If the date is a str which is not a true date.
     """
-    print("\n")
+    if type(date) == str:
+        date = datetime.date.fromisoformat(date)
 
-    # Income and Expenses tables. 
-    if table_name == "Income" or table_name == "Expenses":
-        print('{:^8}|{:^14}|{:^12}|{:^16}|{:^36}'.format("I.D.","Date",
-                                    "Amount (£)", "Category","Description"))
-        print("---------------------------------------------------------"
-            + "-----------------------------")
-        
-        if type(record_list[0]) == tuple or type(record_list[0]) == list:
-            for record in record_list:
-                
-                date = str(record[0])
-                amount =  f"{record[1]:.2f}"
-                category = record[2]
-                description = record[3]
-                id_ = str(record[4])
-
-                print('{:^8}|{:^14}|{:^12}|{:^16}|{:^36}'.format(id_, date, 
-                                            amount, category,description))
-        
-        else:
-            date = str(record_list[0])
-            amount =  f"{record_list[1]:.2f}"
-            category = record_list[2]
-            description = record_list[3]
-            id_ = str(record_list[4])
+    return date.toordinal() + JULIAN_DAY_OFFSET
 
-            print('{:^8}|{:^14}|{:^12}|{:^16}|{:^36}'.format(id_, date, 
-                                            amount, category,description))
 
+def day_number_to_date(day_number):
+    """
+    day_number_to_date converts a Julian day number stored in the database 
+    back to a date.
 
-    # Budget table.
-    elif table_name == "Budget":
-        print('{:^16}|{:^16}'.format("Category","Budget (£)"))
-        print("---------------------------------")
-        
-        if type(record_list[0]) == tuple or type(record_list[0]) == list:
-            for record in record_list:
-                 
-                category = record[0]
-                budget =  f"{record[1]:.2f}"
+    Parameters  :   day_number : int
+                        The Julian day number of the date.
 
-                print('{:^16}|{:^16}'.format(category, budget))
-        
-        else:
-            category = record_list[0]
-            budget =  f"{record_list[1]:.2f}"
+    Returns     :   date : datetime.date
+                        The date.
+    """
+    return datetime.date.fromordinal(day_number - JULIAN_DAY_OFFSET)
 
-            print('{:^16}|{:^16}'.format(category, budget))
-            
-    # Goals table.
-    elif table_name == "Goals":
-        print('{:^8}|{:^12}|{:^12}|{:^36}'.format("I.D.", "Start Date", 
-                                                "Amount (£)", "Description"))
-        print("---------------------------------------------------------"
-              + "------")
-        
-        if type(record_list[0]) == tuple or type(record_list[0]) == list:
 
-            for record in record_list:
-                date = str(record[0])
-                amount =  f"{record[1]:.2f}"
-                description = record[2]
-                id_ = str(record[3])
+def content_hash(day_number, amount, description):
+    """
+    content_hash works out the content hash of an income, expense or goal, 
+    a 16 byte BLAKE2 hash of its date, amount and description. Two records
+    with the same content always have the same hash, so import_csv uses it
+    along with the category to find the records of a file which are 
+    already in a table, such as when the same CSV file is imported twice. 
+    The category is left out of the hash, as it is kept by its ID, so a 
+    category can be renamed or merged without changing the hash of any of 
+    its records. The same record can still be added more than once in any
+    other way, as two coffees of the same price on the same day are two 
+    expenses. The hash is worked out when the record is added and again 
+    when the record is updated, so it always matches the record as it is 
+    now.
+
+    Parameters  :   day_number : int
+                        The Julian day number of the date of the record.
+                    amount : int
+                        The amount of the record in pence.
+                    description : str
+                        The description of the record.
+
+    Returns     :   hash : bytes
+                        The content hash of the record.
+    """
+    content = json.dumps([day_number, amount, description])
 
-                print('{:^8}|{:^12}|{:^12}|{:^36}'.format(id_, date, amount, 
-                                                        description))
-        
-        else:
-            date = str(record_list[0])
-            amount =  f"{record_list[1]:.2f}"
-            description = record_list[2]
-            id_ = str(record_list[3])
+    return hashlib.blake2b(content.encode(), digest_size = 16).digest()
 
-            print('{:^8}|{:^12}|{:^12}|{:^36}'.format(id_, date, amount,
-                                                        description))   
-    print("\n")
-    return
-       
 
-def add_to_table(table_name, record_data, multiple):
+def validate_table_name(table_name):
     """
-    add_to_table takes the data from the record_data list and adds it to 
-    the table determined by table_name. Then the id of each new record is
-    found by selecting the largest id from the table after all the records
-    are added and then reducing and adding it to each record according to
-    when it was added to the table. It also informs the user that 
-    the record has been inserted into the table utilising the
-    display_as_table function. 
+    validate_table_name checks that a table name given in a batch command is
+    either Income or Expenses, ignoring its case.
 
     Parameters  :   table_name : str
-                        The name of the table which the record will be 
-                        added to.
-                    record_data : list
-                        A list containing a record of a Income, an Expense or
-                        a Goal or a list of multiple records, each record as 
-                        their own list. For an income or expense a record  
-                        list is formatted as [date,amount,category,
-                        description], for a budget it will be [category,budget]
-                        and for a goal it will be [date,amount,description]
-                    multiple : str
-                        Either "yes" or "no", which indicates multiple 
-                        records or a single record respectively.
+                        The table name to be checked.
+
+    Returns     :   table_name : str
+                        Either "Income" or "Expenses".
 
-    Returns     :    
+    Raises      :   ValueError
+                        If the table name is not Income or Expenses.
     """
-    # Income and Expenses tables.
-    if table_name == "Income" or table_name == "Expenses":
+    for valid_table_name in ["Income", "Expenses"]:
+        if table_name.lower() == valid_table_name.lower():
+            return valid_table_name
 
-        if multiple == "yes":
+    raise ValueError(f"\'{table_name}\' is not a table, please use Income or "
+                     + "Expenses.")
 
-            cursor.executemany(f''' INSERT INTO {table_name}(date, amount, 
-                        category, description) VALUES(?,?,?,?)''',
-                        record_data)
-            db.commit()
 
-            cursor.execute(f'''SELECT MAX(id) FROM {table_name}''')
-            (max_id,) = cursor.fetchone()
-            db.commit()
-            
-            counter = 1
+def validate_date(date):
+    """
+    validate_date checks that a date given in a batch command is a true date
+    in the format YYYY-MM-DD. The word "today" can be used for today's date.
 
-            for record in record_data:
-                record.append(max_id - (len(record_data) - counter))
-                counter += 1
-        
-        elif multiple == "no":
-            cursor.execute(f''' INSERT INTO {table_name}(date, amount, 
-                        category, description) VALUES(?,?,?,?)''',
-                        record_data)
-            db.commit()
+    Parameters  :   date : str
+                        The date to be checked.
 
-            cursor.execute(f'''SELECT MAX(id) FROM {table_name}''')
-            (max_id,) = cursor.fetchone()
-            db.commit()
+    Returns     :   date : str
+                        The date in the format YYYY-MM-DD.
 
-            record_data.append(max_id)
+    Raises      :   ValueError
+                        If the date is not a true date.
+    """
+    if date.lower() == "today":
+        return str(datetime.date.today())
 
-        # The data which will be used in display_as_table.
-        inform_user_records = record_data
+    try:
+        return str(datetime.date.fromisoformat(date))
 
+    except ValueError:
+        raise ValueError(f"\'{date}\' is not a valid date (YYYY-MM-DD).")
 
-    # Budget table.
-    elif table_name == "Budget":
-        # As we only want to allow one budget for any one category,
-        # we use the 'IGNORE' keyword here so only the first budget.
-        if multiple == "yes":
-            cursor.executemany(f''' INSERT or IGNORE INTO 
-            Budget(category, budget) VALUES(?,?)''', record_data)
-            db.commit()
-
-
-        elif multiple == "no":
-            cursor.execute(f''' INSERT or IGNORE INTO
-            Budget(category, budget) VALUES(?,?,?,?)''', record_data)
-            db.commit()      
-
-        # As we may ignore values we only want to inform the user we have
-        # added a record to the table if it is actually in the table.
-        # find all the records in the table and check them against the 
-        # records we tried to add.
-        cursor.execute('''SELECT * FROM Budget''')
-        budget_records = cursor.fetchall()
-        db.commit()
-        inform_user_records = []
 
-        for record in record_data: 
-            if tuple(record) in budget_records:
-                inform_user_records.append(record)
+def validate_date_range(start_date, end_date):
+    """
+    validate_date_range checks that the dates of a date range given in a 
+    batch command are true dates using validate_date, and that the end date
+    is not before the start date.
 
+    Parameters  :   start_date : str
+                        The earliest date of the range.
+                    end_date : str
+                        The latest date of the range.
 
-    # Goals table. 
-    elif table_name == "Goals":
+    Returns     :   date_range : list
+                        A list of the [start_date, end_date] as dates.
 
-        if multiple == "yes":
+    Raises      :   ValueError
+                        If either date is not a true date or the end date 
+                        is before the start date.
+    """
+    date_range = [datetime.date.fromisoformat(validate_date(start_date)),
+                  datetime.date.fromisoformat(validate_date(end_date))]
 
-            cursor.executemany(f''' INSERT INTO Goals(date, amount, 
-                        description) VALUES(?,?,?)''',record_data)
-            db.commit()
+    if date_range[1] < date_range[0]:
+        raise ValueError(f"The end date {date_range[1]} is before the start "
+                         + f"date {date_range[0]}.")
 
-            cursor.execute(f'''SELECT MAX(id) FROM {table_name}''')
-            (max_id,) = cursor.fetchone()
-            db.commit()
-            
-            counter = 1
+    return date_range
 
-            for record in record_data:
-                record.append(max_id - (len(record_data) - counter))
-                counter += 1
-        
-        elif multiple == "no":
-            cursor.execute(f''' INSERT INTO Goals(date, amount, 
-                        description) VALUES(?,?,?)''', record_data)
-            db.commit()
 
-            cursor.execute(f'''SELECT MAX(id) FROM {table_name}''')
-            (max_id,) = cursor.fetchone()
-            db.commit()
+def validate_amount(amount):
+    """
+    validate_amount checks that an amount given in a batch command follows 
+    the same rules as ask_for_amount_in_pounds, a number between 0 and
+    999999.99 to no more than two decimal places.
 
-            record_data.append(max_id)
-        
-        inform_user_records = record_data
+    Parameters  :   amount : str
+                        The amount to be checked.
 
-    # Display the data added to the tables to the user.
-    if len(inform_user_records) != 0:
-        print(f"\nThe following data has been added to the {table_name} "
-              + "table:")  
-        display_as_table(table_name,inform_user_records)
-    
+    Returns     :   amount_in_pence : int
+                        The amount in pence.
 
-def ask_for_amount_in_pounds():
+    Raises      :   ValueError
+                        If the amount does not follow the rules.
     """
-    ask_for_amount_in_pounds asks the user to input an monetary amount. It
-    then checks if the user has inputted a valid number which is to no more 
-    than two decimal places. If the number inputted value is not valid it 
-    will ask the user to input a valid number. Once a valid number has been 
-    inputted it will ask the user if they are happy with their input. If 
-    they aren't they will be asked to input the correct amount. Once they 
-    are happy it will return the user's chosen amount. 
+    try:
+        amount_float = float(amount)
 
+    except ValueError:
+        raise ValueError(f"\'{amount}\' is not a number.")
 
-    Parameters: 
+    if amount_float > 999999.99 or amount_float < 0:
+        raise ValueError(f"\'{amount}\' is not between 0 and 999999.99.")
+
+    if amount_float != round(amount_float, 2):
+        raise ValueError(f"\'{amount}\' is not to 2 decimal places.")
 
-    Returns: amount_float : float
-                A user chosen amount of money.     
+    return pounds_to_pence(amount_float)
+
+
+def validate_category(category):
     """
+    validate_category tidies a category name given in a batch command in 
+    the same way as ask_for_category, removing blank space and quotation 
+    marks and capitalising each word, and checks it is no longer than 15
+    characters.
 
-    amount = input("\nPlease input the amount (£): \n")
+    Parameters  :   category : str
+                        The category name to be checked.
 
-    while True: 
-        amount_float = check_number(amount, "float")
-        amount_float = check_in_range(amount, 999999.99, 0)
-        rounded_amount = round(amount_float,2)
+    Returns     :   category : str
+                        The tidied category name.
 
-        if amount_float == rounded_amount:
-            is_correct = input(f"\nIs £{amount_float:.2f} the correct"
-                               + " amount?\n")
-            is_correct = check_yes_no(is_correct)
+    Raises      :   ValueError
+                        If the category name is too long or is blank.
+    """
+    category = category.strip().strip("\'").strip("\"").title()
 
-            if is_correct == 'no': 
-                amount = input("\nPlease insert the correct amount (£):\n")
-                
-            else:
-                return amount_float
+    if len(category) > 15 or len(category) == 0:
+        raise ValueError(f"\'{category}\' must be between 1 and 15 "
+                         + "characters.")
+    
+    return category
 
-        else:
-            amount= input("Please only input an amount to 2 decimal" +
-                          " places (£):\n")
-            
 
-def ask_for_date():
+def validate_description(description):
     """
-    ask_for_date asks the user if they want to use the current date, if so 
-    it returns the current date. If the user wants to input a date, 
-    ask_for_date asks the user for a day, a month and a year. It then checks 
-    if the inputs could be an true date. ask_for_date checks with the user if
-    they have inputted the date they desired. 
+    validate_description checks a description given in a batch command is
+    within the 35 character limit used by ask_for_description.
 
-    Parameters: -
+    Parameters  :   description : str
+                        The description to be checked.
 
-    Returns: start_date : str
-                    The date the user wishes to input.     
+    Returns     :   description : str
+                        The description.
+
+    Raises      :   ValueError
+                        If the description is too long.
     """
-    while True:
+    if len(description) > 35:
+        raise ValueError(f"\'{description}\' is longer than the character "
+                         + "limit of 35.")
 
-        today_or_not = input("\nWould you like to use today's date?\n")
-        today_or_not = check_yes_no(today_or_not)
+    return description
 
-        if today_or_not == 'yes':
-            start_date = str(datetime.date.today())
-            return start_date
 
-        year = input("\nEnter the year (YYYY):\n")
-        year = check_in_range(year,2025, 2020)
+def validate_period(period):
+    """
+    validate_period checks a period is one of the periods in PERIOD_BUCKETS
+    and puts it in lower case.
 
-        month = input("\nEnter the month (MM):\n")
-        month = check_in_range(month, 12, 1)
+    Parameters  :   period : str
+                        The period to check.
 
-        day = input("\nEnter the day (DD):\n")
-        day = check_in_range(day, 31, 1)
-        
-        try: 
+    Returns     :   period : str
+                        The period in lower case.
 
-            start_date = datetime.date(year, month, day)
-            print(f"\n\n{start_date}\n")
-            is_correct = input("Is the date above the correct date "
-                               + "(YYYY-MM-DD)?\n")
+    Raises      :   ValueError
+                        If the period is not one of the PERIOD_BUCKETS.
+    """
+    if period.lower() not in PERIOD_BUCKETS:
+        raise ValueError(f"\'{period}\' is not a period, please use one of "
+                         + f"{', '.join(PERIOD_BUCKETS)}.")
 
-            if check_yes_no(is_correct) == 'yes':
-                return str(start_date)
+    return period.lower()
 
-        except ValueError: 
-            print("Unfortunately this is not a valid date. Please try "
-                  + "again.\n")
 
+# The number of transactions which have been started and not yet finished,
+# so that transaction knows whether it is inside another transaction, and 
+# the thread which started them, so that reader knows whether it is being 
+# used inside them.
+transaction_depth = 0
+transaction_thread = None
 
-def retrieve_categories(table_name, show_or_not):
-    """
-    retrieve_categories finds all the categories found in the table. If
-    the categories are to be shown, the 'Misc' category is not retrieved
-    as the 'Misc' category will be shown whether it is in the table or not.
 
-    Parameters  :   table_name : str
-                        The name of the table from which the categories 
-                        will be retrieved.
-                    show_or_not : str
-                        A show_or_not of "show" will mean the 'Misc' 
-                        category will be omitted. 
-    
-    Returns     :   categories : list
-                        A list of the categories in tuples in the table. 
+@contextlib.contextmanager
+def transaction():
+    """
+    transaction is used in a with statement to group the statements of one
+    logical operation, such as adding several records or renaming a 
+    category, so they are all committed together with one commit. If 
+    anything goes wrong inside the with statement every change made in it
+    is rolled back. 
     
+    When used inside another transaction a savepoint is used instead, so 
+    the changes are only committed along with the outer transaction but 
+    can still be rolled back on their own.
+
+    Parameters  :
+
+    Returns     :
     """
+    global transaction_depth, transaction_thread
+
+    if transaction_depth == 0:
+        # Take the write lock straight away so another connection can't 
+        # change the tables part way through the operation.
+        db.execute("BEGIN IMMEDIATE")
+        transaction_thread = threading.get_ident()
 
-    if show_or_not == "show":
-        cursor.execute(f''' SELECT DISTINCT category from {table_name}
-                        WHERE category != ? ORDER BY category''', ('Misc',))
-        categories = cursor.fetchall()
-        db.commit()
-    
     else:
-        cursor.execute(f'''SELECT DISTINCT category from {table_name}
-                        ORDER BY category''')
-        categories = cursor.fetchall()
-        db.commit()
+        db.execute(f"SAVEPOINT transaction_{transaction_depth}")
 
-    return categories
+    transaction_depth += 1
 
+    try:
+        yield
 
-def show_categories(table_name, menu_choice, delete_category = None):
-    """
-    show_categories collects all the distinct entries in the category 
-    column in the chosen table and presents them to the user. The user
-    then chooses which category they would like to select. The Misc 
-    category is presented whether there is a Misc category in the table 
-    or not. It is also either presented last or second from last if there
-    is the option to add a new category. If the user is adding a new
-    record to the table then they are given the choice to add a new 
-    category. The function then returns all the categories in a list 
-    oredered as they were presented as well as the choice of the user. 
+    except BaseException as e:
+        transaction_depth -= 1
 
-    Parameters  :   table_name
-                        The name of the table to be searched.
-                    menu_choice
-                        The menu choice from the main code which determines
-                        if the user can add a new category
-                    delete_category : str | NoneType
-                        If this function is used for deleting a category
-                        Misc will be omitted from the offering as Misc 
-                        is what deleted categories are converted to.
+        # The cached categories may have been changed to match changes which
+        # are being rolled back, so they are loaded again when next needed.
+        category_cache.clear()
 
+        if transaction_depth == 0:
+            db.rollback()
 
-    Returns     :   category_list
-                        The list of categories in the order they were 
-                        presented followed by the user's choice of category 
-                        in the form of a number : int.    
-    """
+        else:
+            db.execute(f"ROLLBACK TO transaction_{transaction_depth}")
+            db.execute(f"RELEASE transaction_{transaction_depth}")
 
-    counter = 1
-    category_list = []
+        raise e
 
-    categories = retrieve_categories(table_name, "show")
+    transaction_depth -= 1
 
-    print(f"\nPlease choose one of the following categories: ")
+    if transaction_depth == 0:
+        db.commit()
 
-    for category_tuple in categories:
-        
-        (category,) = (category_tuple)
-        if category != "Misc":
-            print(f"{counter}. {category}")
-            category_list.append(category)
-            counter += 1
+    else:
+        db.execute(f"RELEASE transaction_{transaction_depth}")
 
-    if delete_category == None:
-        print(f"{counter}. Misc")
-        category_list.append("Misc")
-    
-    if menu_choice == "1" or menu_choice == "4" or menu_choice == "9":
 
-        counter += 1
-        print(f"{counter}. Add a new category")
-        category_list.append("Add a new category")
+@contextlib.contextmanager
+def reader():
+    """
+    reader is used in a with statement to borrow a cursor of one of the 
+    read only connections in the reader pool for a report query, giving it 
+    back to the pool at the end. In WAL mode the readers aren't blocked by 
+    the writer, so reports can be run while records are being added. If 
+    every reader is in use it waits for one to be given back.
 
-    category_choice = check_in_range(input("\n"),counter,1)
+    Inside a transaction the cursor of the writer is used instead, so the
+    changes made in the transaction so far are seen. This is only done on 
+    the thread which started the transaction, so the other threads of the 
+    service keep reading from the pool while a change is being made.
 
-    category_list.append(category_choice)
+    Parameters  :
+
+    Returns     :   read_cursor : sqlite3.Cursor
+                        The cursor to run the report query with.
+    """
+    if transaction_depth != 0 and transaction_thread == threading.get_ident():
+        yield db.cursor()
+        return
 
+    read_db = reader_pool.get()
 
-    return category_list
+    try:
+        yield read_db.cursor()
+
+    finally:
+        reader_pool.put(read_db)
+
+
+def budget_for_category_over_date(category, start_date, end_date):
+    """
+    budget_for_category over date finds the weekly budget of a category 
+    from the Budget table and then finds out what the budget would be 
+    for that catgeory between the determined start and end date.
     
+    Parameters  :   category : str
+                        The name of the category which has the budget.
+                    start_date : datetime.date
+                        The start date of the 'Expenses' table search.
+                    end_date : datetime.date
+                        The end date of the 'Expenses' table search. 
 
-def ask_for_category(table_name, menu_choice, delete_category = None):
+    Returns     :   budget_over_date : int | NoneType
+                        Either how much the budget is for the category over
+                        the date range in pence, or None if no budget has 
+                        been set for that category.     
     """
-    ask_for_category uses the show_categories function to ask the user which
-    they want. If the user wishes to add a new category it asks them 
-    what they would like it to be called. It then checks if that name is
-    taken by one of the other categories. If it is, it will ask the user 
-    if they wish to use this name, in which case it does, or if they would
-    like to rename it, in which case they are asked again to name it. If 
-    the user opted for one of the pre-existing categories, that category 
-    is chosen and retuned.
 
-    Parameters :    table_name : str
-                        The name of the table the category will be used for.
-                    menu_choice : str
-                        The menu option chosen in the main code.
-                    delete_category : str | NoneType
-                        This will be filled when ask_for_category is used
-                        to delete a category so that show_category does 
-                        not show Misc as an option. 
+    with reader() as read_cursor:
+        read_cursor.execute(BUDGET_QUERY, (category,))
+        budget_tuple = read_cursor.fetchone()
+
+    if budget_tuple != None:
+        (budget,) = budget_tuple
+        no_of_days = (end_date - start_date)
+        no_of_days = no_of_days.days
+
+        budget_over_date = budget * (no_of_days) / 7
+        budget_over_date = round(budget_over_date)
     
-    Returns :       category_choice : str
-                        The category the user wishes to add.
+    else:
+        budget_over_date = None
+    
+    return budget_over_date
 
+
+def table_heading(table_name):
     """
-    if delete_category == None:
-        category_list = show_categories(table_name, menu_choice)
+    table_heading makes the heading of the table displayed by 
+    display_as_table, with the names of the columns of the table.
 
-    else:
-        category_list = show_categories(table_name, menu_choice,"delete")
+    Parameters  :   table_name : str
+                        Either 'Income', 'Expenses', 'Budget' or 'Goals'.
 
-    # The index of the chosen category = the final list value - 1. 
-    if category_list[category_list[-1] - 1] == "Add a new category" : 
-        
-        while True:
+    Returns     :   heading : str
+                        The column names and the line beneath them.
+    """
+    # Income and Expenses tables. 
+    if table_name == "Income" or table_name == "Expenses":
+        heading = ('{:^8}|{:^14}|{:^12}|{:^16}|{:^36}'.format("I.D.","Date",
+                                    "Amount (£)", "Category","Description")
+            + "\n---------------------------------------------------------"
+            + "-----------------------------")
 
-            new_category = input("\nPlease input the new category name:\n")
-            new_category = check_character_length(new_category, 15)
-            # Remove blank space, single and double quotation marks. 
-            new_category = new_category.strip().strip("\'").strip("\"").title()
+    # Budget table.
+    elif table_name == "Budget":
+        heading = ('{:^16}|{:^16}'.format("Category","Budget (£)")
+                   + "\n---------------------------------")
+
+    # Totals of each period, from retrieve_period_totals.
+    elif table_name == "Periods":
+        heading = ('{:^14}|{:^14}|{:^10}|{:^14}|{:^14}'.format("Period", 
+                        "Total (£)", "Records", "Smallest (£)", "Largest (£)")
+            + "\n---------------------------------------------------------"
+            + "------------")
+
+    # Budgets compared with spending, from retrieve_budget_report.
+    elif table_name == "BudgetReport":
+        heading = ('{:^16}|{:^14}|{:^14}|{:^14}|{:^10}'.format("Category", 
+                        "Budget (£)", "Spent (£)", "Left (£)", "Used")
+            + "\n---------------------------------------------------------"
+            + "---------------")
+
+    # Totals of each ledger, from summarise_ledgers.
+    elif table_name == "Ledgers":
+        heading = ('{:^16}|{:^14}|{:^14}|{:^14}|{:^14}'.format("Ledger", 
+                        "Income (£)", "Expenses (£)", "Profit (£)", 
+                        "To Save (£)")
+            + "\n---------------------------------------------------------"
+            + "---------------------")
 
-            if new_category not in category_list and new_category != "Misc":
-                is_correct = input(f"\nIs \'{new_category}\' correctly"+
-                                   " inputted?\n")
-                is_correct = check_yes_no(is_correct)
+    # Goals table.
+    elif table_name == "Goals":
+        heading = ('{:^8}|{:^12}|{:^12}|{:^36}'.format("I.D.", "Start Date", 
+                                                "Amount (£)", "Description")
+            + "\n---------------------------------------------------------"
+            + "------")
 
-                if is_correct == "yes":
-                    category_choice = new_category
-                    break
+    return heading
 
-                else:
-                    continue
-            
-            else: 
-                print(f"Unfortunately \'{new_category}\' is already a "+
-                      "category.")
-                use_category = input(f"\nWould you like to use {new_category}"
-                                     + "?\n")
-                use_category = check_yes_no(use_category)
 
-                # If the user wishes to use the 
-                if use_category == "yes":
-                    category_choice = new_category
-                    break
+def format_record(table_name, record):
+    """
+    format_record makes the row of the table displayed by display_as_table
+    for one record.
 
-                else:
-                    print("\nWe will now ask you to rename the category.")
+    Parameters  :   table_name : str
+                        Either 'Income', 'Expenses', 'Budget' or 'Goals'.
+                    record : list | tuple
+                        The record in the format [date, amount, category,
+                        description, id] for the 'Income' and 'Expenses' 
+                        tables, [category, budget] for the Budget table,
+                        [period, total, number of records, smallest amount,
+                        largest amount] for 'Periods', [category, budget, 
+                        spent, budget left, percentage used] for 
+                        'BudgetReport', [ledger, income, expenses, profit, 
+                        left to save] for 'Ledgers' or [date, amount, 
+                        description, id] for the Goals table. 
+
+    Returns     :   row : str
+                        The record lined up with the columns of the heading,
+                        with the amounts in pence written in pounds.
+    """
+    # Income and Expenses tables. 
+    if table_name == "Income" or table_name == "Expenses":
+        date = str(record[0])
+        amount =  format_pounds(record[1])
+        category = record[2]
+        description = record[3]
+        id_ = str(record[4])
 
-    else: 
-        category_choice = category_list[category_list[-1] - 1]
-    
-    return category_choice
+        row = '{:^8}|{:^14}|{:^12}|{:^16}|{:^36}'.format(id_, date, amount, 
+                                                        category, description)
+
+    # Budget table.
+    elif table_name == "Budget":
+        category = record[0]
+        budget =  format_pounds(record[1])
 
+        row = '{:^16}|{:^16}'.format(category, budget)
 
-def retrieve_income_expense(table_name, start_date, end_date, 
-                        category = None):
+    # Totals of each period, from retrieve_period_totals.
+    elif table_name == "Periods":
+        period = record[0]
+        total = format_pounds(record[1])
+        no_of_records = str(record[2])
+        smallest_amount = format_pounds(record[3])
+        largest_amount = format_pounds(record[4])
+
+        row = '{:^14}|{:^14}|{:^10}|{:^14}|{:^14}'.format(period, total, 
+                            no_of_records, smallest_amount, largest_amount)
+
+    # Budgets compared with spending, from retrieve_budget_report.
+    elif table_name == "BudgetReport":
+        category = record[0]
+        spent = format_pounds(record[2])
+
+        # A category without a budget has nothing to compare with.
+        if record[1] == None:
+            budget = left = used = "-"
+
+        else:
+            budget = format_pounds(record[1])
+            left = format_pounds(record[3])
+
+            if record[4] == None:
+                used = "-"
+
+            else:
+                used = f"{record[4]:.1f}%"
+
+        row = '{:^16}|{:^14}|{:^14}|{:^14}|{:^10}'.format(category, budget, 
+                                                        spent, left, used)
+
+    # Totals of each ledger, from summarise_ledgers.
+    elif table_name == "Ledgers":
+        ledger_name = record[0]
+        income = format_pounds(record[1])
+        expenses = format_pounds(record[2])
+        profit = format_pounds(record[3])
+        left_to_save = format_pounds(record[4])
+
+        row = '{:^16}|{:^14}|{:^14}|{:^14}|{:^14}'.format(ledger_name, 
+                                    income, expenses, profit, left_to_save)
+
+    # Goals table.
+    elif table_name == "Goals":
+        date = str(record[0])
+        amount =  format_pounds(record[1])
+        description = record[2]
+        id_ = str(record[3])
+
+        row = '{:^8}|{:^12}|{:^12}|{:^36}'.format(id_, date, amount, 
+                                                description)
+
+    return row
+
+
+def display_as_table(table_name, record_list):
     """
-    retrieve_income_expense fetches all the records which take place between
-    two dates and returns them. If there is a specific category, it will only
-    fetch records which have that category label.
+    display_as_table displays data from record_list as a table to the user.
+    The headings of the table corresepond with the table the data represents.
+    If the record_list contains multiple records then it goes through each 
+    record and displays them. The rows are written out DISPLAY_BLOCK_SIZE at
+    a time, so record_list can also be a generator such as the one from 
+    stream_income_expense to display any number of records without holding
+    them all in memory.
+
 
     Parameters  :   table_name : str
-                        The name of the table which the records will be 
-                        fetched from. 
-                    start_date : datetime
-                        The earliest date a fetched record can be from.
-                    end_date : datetime
-                        The lastest date a fetched record can be from.
-                    category : str
-                        The name of the category which they are searching by.
+                        The name of the table which the data represents.
+                    record_list : list | iterable
+                        Either a list of records, an iterable of records or
+                        a single record which is in the format [date, 
+                        amount, category, description, id] for the 'Income'
+                        and 'Expenses' tables, [category, budget] for the 
+                        Budget table or [date, amount, description, id] for 
+                        the Goals table. 
+
+    Returns     :
+    """
+    print("\n")
+
+    # A single record is displayed as a table with one row.
+    if ((type(record_list) == tuple or type(record_list) == list)
+        and len(record_list) != 0 
+        and type(record_list[0]) != tuple and type(record_list[0]) != list):
+        record_list = [record_list]
+
+    lines = [table_heading(table_name)]
+
+    for record in record_list:
+        lines.append(format_record(table_name, record))
+
+        if len(lines) >= DISPLAY_BLOCK_SIZE:
+            print("\n".join(lines))
+            lines = []
+
+    if len(lines) != 0:
+        print("\n".join(lines))
+
+    print("\n")
+    return
+       
+
+# The categories of the Income and Expenses tables which have records in 
+# them, in the form {table name: set of category names}. The categories of a
+# table are loaded the first time they are needed and then kept up to date
+# by the functions which change the records, so the category menus are 
+# shown without querying the database.
+category_cache = {}
+
+
+def update_category_cache(table_name, added_categories, 
+                          removed_categories = ()):
+    """
+    update_category_cache keeps category_cache up to date after records 
+    have been added to, moved between or removed from categories. Nothing
+    is done if the categories of the table haven't been loaded yet.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    added_categories : iterable
+                        The categories which have had records added to them.
+                    removed_categories : iterable
+                        The categories which have had a record taken out of 
+                        them. They are removed from the cache if they no 
+                        longer have any records.
+
+    Returns     :
+    """
+    if table_name not in category_cache:
+        return
+
+    category_cache[table_name].update(added_categories)
+
+    for category in removed_categories:
+        if category in added_categories:
+            continue
+
+        cursor.execute(CATEGORY_HAS_RECORDS_QUERY.format(
+                           table_name = table_name), (category,))
+
+        if cursor.fetchone()[0] == 0:
+            category_cache[table_name].discard(category)
+
+
+def add_categories(table_name, categories):
+    """
+    add_categories adds any of the categories of the Income or Expenses 
+    table which aren't in the Categories table yet, so that records in these
+    categories can be added using CATEGORY_ID_QUERY.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    categories : iterable
+                        The names of the categories.
+
+    Returns     :
+    """
+    cursor.executemany('''INSERT OR IGNORE INTO Categories(table_name, name)
+                       VALUES(?,?)''', 
+                       [(table_name, category) for category in categories])
+
+
+def add_to_table(table_name, record_data, multiple):
+    """
+    add_to_table takes the data from the record_data list and adds it to 
+    the table determined by table_name. The records are added one at a time
+    inside a single transaction and the id SQLite gives each new record is 
+    read from the cursor's lastrowid and added to the end of the record. As 
+    the id comes from the insert itself it is correct even if another 
+    program is adding records to the same database. A budget for a 
+    category which already has one is a duplicate and is skipped by the 
+    insert itself, while incomes and expenses are always added, even if 
+    the same record is already in the table. It also informs the user that
+    the record has been inserted into the table utilising the 
+    display_as_table function, and how many records were duplicates.
+
+    Parameters  :   table_name : str
+                        The name of the table which the record will be 
+                        added to.
+                    record_data : list
+                        A list containing a record of a Income, an Expense or
+                        a Goal or a list of multiple records, each record as 
+                        their own list. For an income or expense a record  
+                        list is formatted as [date,amount,category,
+                        description], for a budget it will be [category,budget]
+                        and for a goal it will be [date,amount,description]
+                    multiple : str
+                        Either "yes" or "no", which indicates multiple 
+                        records or a single record respectively.
+
+    Returns     :   added_counts : dict
+                        The number of records added under "Added" and the 
+                        number of duplicates skipped under "Duplicates".
+    """
+    if multiple == "yes":
+        records = record_data
+
+    elif multiple == "no":
+        records = [record_data]
+
+    # Income and Expenses tables. The content hash of each record is kept
+    # so it can be found if the record is imported again.
+    if table_name == "Income" or table_name == "Expenses":
+        insert_query = f''' INSERT INTO {table_name}(date, amount, 
+            category_id, description, content_hash) 
+            VALUES(?,?,
+                {CATEGORY_ID_QUERY.format(table_name = table_name)},?,?)'''
+
+    # Budget table.
+    elif table_name == "Budget":
+        # As we only want to allow one budget for any one category,
+        # we use the 'IGNORE' keyword here so only the first budget.
+        insert_query = ''' INSERT or IGNORE INTO 
+            Budget(category, budget) VALUES(?,?)'''
+
+    # Goals table. 
+    elif table_name == "Goals":
+        insert_query = ''' INSERT INTO Goals(date, amount, 
+                        description) VALUES(?,?,?)'''
+
+    inform_user_records = []
+    no_of_duplicates = 0
+
+    # The records are added together so either all of them are added or,
+    # if something goes wrong, none of them are.
+    with transaction():
+        if table_name == "Income" or table_name == "Expenses":
+            add_categories(table_name, {record[2] for record in records})
+
+        for record in records:
+            # Every table but Budget starts with the date, which is stored 
+            # as a day number.
+            if table_name == "Budget":
+                cursor.execute(insert_query, record)
+
+            elif table_name == "Goals":
+                cursor.execute(insert_query, 
+                               [date_to_day_number(record[0])] + record[1:])
+
+            else:
+                values = [date_to_day_number(record[0])] + record[1:]
+                hash_ = content_hash(values[0], values[1], values[3])
+                cursor.execute(insert_query, values + [hash_])
+
+            # As we may ignore duplicates we only want to inform the user we 
+            # have added a record to the table if it is actually in the 
+            # table.
+            if cursor.rowcount == 0:
+                no_of_duplicates += 1
+                continue
+
+            if table_name != "Budget":
+                record.append(cursor.lastrowid)
+
+            inform_user_records.append(record)
+
+        if table_name == "Income" or table_name == "Expenses":
+            update_category_cache(table_name, 
+                {record[2] for record in inform_user_records})
+
+    added_counts = {"Added": len(inform_user_records), 
+                    "Duplicates": no_of_duplicates}
+
+    if multiple == "no" and len(inform_user_records) != 0:
+        inform_user_records = inform_user_records[0]
+
+    # Display the data added to the tables to the user.
+    if len(inform_user_records) != 0:
+        print(f"\nThe following data has been added to the {table_name} "
+              + "table:")  
+        display_as_table(table_name,inform_user_records)
+
+    if multiple == "no" and no_of_duplicates != 0:
+        print(f"\nThis record is already in the {table_name} table so it "
+              + "has not been added again.")
+        
+    elif multiple == "yes":
+        print(f"\n{added_counts['Added']} records have been added to the "
+              + f"{table_name} table and {no_of_duplicates} were already in "
+              + "it.")
+
+    return added_counts
+    
+
+
+def find_new_records(table_name, records):
+    """
+    find_new_records finds which of a chunk of the incomes, expenses or 
+    goals being imported by import_csv are not already in their table. 
+    Incomes and expenses are found in their table by their content hash and
+    category and goals, which don't keep a hash, by their date, amount and
+    description. The copies of each record in the file so far are counted, 
+    along with the copies of it in the table before the import started, 
+    and only the copies beyond those already in the table are new. So a 
+    record which is in the file twice, such as two coffees of the same 
+    price on the same day, is added twice by the first import and not at 
+    all by the next, while an export which overlaps an earlier one only 
+    adds the records which weren't in the earlier one. The counts are kept
+    in the ImportedRecords table so they carry on from one chunk to the 
+    next without being held in memory.
+
+    Parameters  :   table_name : str
+                        The name of the table the records are being 
+                        imported into.
+                    records : list
+                        The records of the chunk, each in the format [date,
+                        amount, category, description, content hash] or 
+                        [date, amount, description, content hash] for a 
+                        goal.
+
+    Returns     :   new_records : list
+                        The records which are not already in the table, in
+                        the same order.
+    """
+    # Each record is found by its category and content hash, a goal having 
+    # no category.
+    record_keys = []
+
+    for record in records:
+        if table_name == "Goals":
+            record_keys.append(("", record[-1]))
+
+        else:
+            record_keys.append((record[2], record[-1]))
+
+    # The number of copies of each record in the chunk in the form 
+    # {(category, content hash): copies} and the first copy of each.
+    chunk_copies = {}
+    first_copies = {}
+
+    for record_key, record in zip(record_keys, records):
+        chunk_copies[record_key] = chunk_copies.get(record_key, 0) + 1
+        first_copies.setdefault(record_key, record)
+
+    # Each record of the chunk is added to the ChunkRecords table so that 
+    # all of them are counted together, rather than looking up each record
+    # in its table and in ImportedRecords on its own.
+    chunk_rows = []
+
+    for record_key, record in first_copies.items():
+        if table_name == "Goals":
+            chunk_rows.append(record_key + (chunk_copies[record_key],) 
+                              + tuple(record[:3]))
+
+        else:
+            chunk_rows.append(record_key + (chunk_copies[record_key], 
+                              record[0], record[1], record[3]))
+
+    cursor.executemany(SAVE_CHUNK_RECORD_QUERY, chunk_rows)
+
+    if table_name == "Goals":
+        no_in_table = GOAL_COUNT
+
+    else:
+        no_in_table = CONTENT_HASH_COUNT.format(table_name = table_name)
+
+    cursor.execute(COUNT_IMPORTED_RECORDS_QUERY.format(
+                       table_name = table_name, no_in_table = no_in_table))
+
+    # The number of copies of each record at the start of the chunk which 
+    # are already in the table, in the form {(category, content hash): 
+    # copies}. Every copy of any other record is new.
+    cursor.execute(SKIPPED_RECORDS_QUERY, (table_name,))
+    skipped_copies = {(category, hash_): copies 
+                      for (category, hash_, copies) in cursor.fetchall()}
+    cursor.execute('''DELETE FROM ChunkRecords''')
+
+    new_records = []
+
+    for record_key, record in zip(record_keys, records):
+        if skipped_copies.get(record_key, 0) > 0:
+            skipped_copies[record_key] -= 1
+
+        else:
+            new_records.append(record)
+
+    return new_records
+
+
+def import_csv(file_path, chunk_size = IMPORT_CHUNK_SIZE):
+    """
+    import_csv adds the records in a CSV file to the tables. Each row of the
+    file is in the format date,amount,category,description,Income for an 
+    income (or Expenses for an expense), category,budget,Budget for a budget
+    and date,amount,description,Goals for a goal. The file is read a chunk 
+    of rows at a time and each chunk is added in its own transaction, so 
+    only one chunk is held in memory however large the file is. Rows which 
+    are not in one of these formats, or whose date is not a true date in 
+    the format YYYY-MM-DD, are skipped. Incomes, expenses and goals which 
+    are already in their table, found with find_new_records, and budgets 
+    for a category which already has one are duplicates and are not added,
+    so importing the same file twice adds nothing the second time. The 
+    user is told how many records have been added, how many were 
+    duplicates and how many rows per second were imported.
+
+    Parameters  :   file_path : str
+                        The path of the CSV file to import.
+                    chunk_size : int
+                        The number of rows to read and add at a time.
+
+    Returns     :   imported_counts : dict
+                        The number of records added to each table, along 
+                        with the number of duplicates under "Duplicates" 
+                        and the number of rows skipped under "Skipped".
+    """
+    # The query used to add the records of each table and the number of
+    # columns each of its records should have.
+    import_queries = {
+        "Income" : [f'''INSERT INTO Income(date, amount, 
+            category_id, description, content_hash) 
+            VALUES(?,?,
+                {CATEGORY_ID_QUERY.format(table_name = "Income")},?,?)''', 
+            4],
+        "Expenses" : [f'''INSERT INTO Expenses(date, amount, 
+            category_id, description, content_hash) 
+            VALUES(?,?,
+                {CATEGORY_ID_QUERY.format(table_name = "Expenses")},?,?)''',
+            4],
+        # Only the first budget for any one category is kept.
+        "Budget" : ['''INSERT or IGNORE INTO Budget(category, budget) 
+                    VALUES(?,?)''', 2],
+        "Goals" : ['''INSERT INTO Goals(date, amount, description) 
+                   VALUES(?,?,?)''', 3]
+    }
+    imported_counts = {"Income": 0, "Expenses": 0, "Budget": 0, "Goals": 0,
+                       "Duplicates": 0, "Skipped": 0}
+    no_of_rows = 0
+    start_time = time.perf_counter()
+
+    # The counts of an earlier import which didn't finish are cleared.
+    cursor.execute(IMPORTED_RECORDS_TABLE_QUERY)
+    cursor.execute(CHUNK_RECORDS_TABLE_QUERY)
+    cursor.execute('''DELETE FROM ImportedRecords''')
+    cursor.execute('''DELETE FROM ChunkRecords''')
+
+    with open(file_path, 'r', newline = '') as file:
+        csvreader = csv.reader(file)
+
+        while True:
+            chunk = list(itertools.islice(csvreader, chunk_size))
+
+            if len(chunk) == 0:
+                break
+
+            chunk_records = {"Income": [], "Expenses": [], "Budget": [],
+                             "Goals": []}
+
+            for read_in_record in chunk:
+                if (len(read_in_record) == 0 
+                    or read_in_record[-1] not in chunk_records
+                    or len(read_in_record) - 1 
+                    != import_queries[read_in_record[-1]][1]):
+                    imported_counts["Skipped"] += 1
+                    continue
+
+                # For each table the second column is an amount in pounds 
+                # and so we must convert this to pence for each record. 
+                # Every table but Budget starts with a date, which we must 
+                # convert to a day number.
+                try:
+                    read_in_record[1] = pounds_to_pence(read_in_record[1])
+
+                    if read_in_record[-1] != "Budget":
+                        read_in_record[0] = date_to_day_number(
+                            read_in_record[0])
+
+                except (ValueError, OverflowError):
+                    imported_counts["Skipped"] += 1
+                    continue
+
+                record = read_in_record[:-1]
+
+                if read_in_record[-1] == "Income" \
+                    or read_in_record[-1] == "Expenses":
+                    record.append(content_hash(record[0], record[1], 
+                                               record[3]))
+
+                # A goal doesn't keep its hash, it is only used to tell its
+                # copies apart in find_new_records.
+                elif read_in_record[-1] == "Goals":
+                    record.append(content_hash(*record))
+
+                chunk_records[read_in_record[-1]].append(record)
+
+            # If something goes wrong only the chunk which failed is lost,
+            # the earlier chunks have already been committed.
+            with transaction():
+                for table_name, records in chunk_records.items():
+                    if len(records) == 0:
+                        continue
+
+                    new_records = records
+
+                    if table_name == "Income" or table_name == "Expenses":
+                        categories = {record[2] for record in records}
+                        add_categories(table_name, categories)
+                        new_records = find_new_records(table_name, records)
+
+                    # The hash of a goal is only used to find its copies.
+                    elif table_name == "Goals":
+                        new_records = [record[:3] for record 
+                                       in find_new_records(table_name, 
+                                                           records)]
+
+                    cursor.executemany(import_queries[table_name][0], 
+                                       new_records)
+
+                    # The row count only counts the records which were 
+                    # added, the rest were duplicates.
+                    imported_counts[table_name] += cursor.rowcount
+                    imported_counts["Duplicates"] += (len(records) 
+                                                      - cursor.rowcount)
+
+                    if table_name == "Income" or table_name == "Expenses":
+                        update_category_cache(table_name, categories)
+
+            no_of_rows += len(chunk)
+
+            if len(chunk) == chunk_size:
+                print(f"{no_of_rows} rows read...")
+
+    cursor.execute('''DELETE FROM ImportedRecords''')
+
+    elapsed_time = time.perf_counter() - start_time
+    rows_per_second = no_of_rows / max(elapsed_time, 1e-9)
+
+    print(f"\nImported {no_of_rows} rows from {file_path} in "
+          + f"{elapsed_time:.2f} seconds ({rows_per_second:.0f} rows per "
+          + "second).")
+    
+    for table_name, count in imported_counts.items():
+        print(f"{table_name}: {count}")
+
+    return imported_counts
+
+
+def ask_for_amount_in_pounds():
+    """
+    ask_for_amount_in_pounds asks the user to input an monetary amount. It
+    then checks if the user has inputted a valid number which is to no more 
+    than two decimal places. If the number inputted value is not valid it 
+    will ask the user to input a valid number. Once a valid number has been 
+    inputted it will ask the user if they are happy with their input. If 
+    they aren't they will be asked to input the correct amount. Once they 
+    are happy it will return the user's chosen amount in pence. 
+
+
+    Parameters: 
+
+    Returns: amount_in_pence : int
+                A user chosen amount of money in pence.     
+    """
+
+    amount = input("\nPlease input the amount (£): \n")
+
+    while True: 
+        amount_float = check_number(amount, "float")
+        amount_float = check_in_range(amount, 999999.99, 0)
+        rounded_amount = round(amount_float,2)
+
+        if amount_float == rounded_amount:
+            is_correct = input(f"\nIs £{amount_float:.2f} the correct"
+                               + " amount?\n")
+            is_correct = check_yes_no(is_correct)
+
+            if is_correct == 'no': 
+                amount = input("\nPlease insert the correct amount (£):\n")
+                
+            else:
+                return pounds_to_pence(amount_float)
+
+        else:
+            amount= input("Please only input an amount to 2 decimal" +
+                          " places (£):\n")
+            
+
+def ask_for_date():
+    """
+    ask_for_date asks the user if they want to use the current date, if so 
+    it returns the current date. If the user wants to input a date, 
+    ask_for_date asks the user for a day, a month and a year. It then checks 
+    if the inputs could be an true date. ask_for_date checks with the user if
+    they have inputted the date they desired. 
+
+    Parameters: -
+
+    Returns: start_date : str
+                    The date the user wishes to input.     
+    """
+    while True:
+
+        today_or_not = input("\nWould you like to use today's date?\n")
+        today_or_not = check_yes_no(today_or_not)
+
+        if today_or_not == 'yes':
+            start_date = str(datetime.date.today())
+            return start_date
+
+        year = input("\nEnter the year (YYYY):\n")
+        year = check_in_range(year, 9999, 1000)
+
+        month = input("\nEnter the month (MM):\n")
+        month = check_in_range(month, 12, 1)
+
+        day = input("\nEnter the day (DD):\n")
+        day = check_in_range(day, 31, 1)
+        
+        try: 
+
+            start_date = datetime.date(year, month, day)
+            print(f"\n\n{start_date}\n")
+            is_correct = input("Is the date above the correct date "
+                               + "(YYYY-MM-DD)?\n")
+
+            if check_yes_no(is_correct) == 'yes':
+                return str(start_date)
+
+        except ValueError: 
+            print("Unfortunately this is not a valid date. Please try "
+                  + "again.\n")
+
+
+def retrieve_categories(table_name, show_or_not):
+    """
+    retrieve_categories finds all the categories found in the table. If
+    the categories are to be shown, the 'Misc' category is not retrieved
+    as the 'Misc' category will be shown whether it is in the table or not.
+    The categories are loaded into category_cache from the Categories 
+    table the first time they are needed, only including a category if the
+    table has a record in it, which is checked with one search of the 
+    category and date index. After that they are read from the cache.
+
+    Parameters  :   table_name : str
+                        The name of the table from which the categories 
+                        will be retrieved.
+                    show_or_not : str
+                        A show_or_not of "show" will mean the 'Misc' 
+                        category will be omitted. 
+    
+    Returns     :   categories : list
+                        A list of the categories in tuples in the table. 
+    
+    """
+
+    if table_name not in category_cache:
+        with reader() as read_cursor:
+            read_cursor.execute(CATEGORIES_QUERY.format(
+                                table_name = table_name), (table_name,))
+            category_cache[table_name] = {name for (name,) 
+                                          in read_cursor.fetchall()}
+
+    if show_or_not == "show":
+        categories = [(category,) for category 
+                      in sorted(category_cache[table_name]) 
+                      if category != 'Misc']
+    
+    else:
+        categories = [(category,) for category 
+                      in sorted(category_cache[table_name])]
+
+    return categories
+
+
+def show_categories(table_name, menu_choice, delete_category = None):
+    """
+    show_categories collects all the distinct entries in the category 
+    column in the chosen table and presents them to the user. The user
+    then chooses which category they would like to select. The Misc 
+    category is presented whether there is a Misc category in the table 
+    or not. It is also either presented last or second from last if there
+    is the option to add a new category. If the user is adding a new
+    record to the table then they are given the choice to add a new 
+    category. The function then returns all the categories in a list 
+    oredered as they were presented as well as the choice of the user. 
+
+    Parameters  :   table_name
+                        The name of the table to be searched.
+                    menu_choice
+                        The menu choice from the main code which determines
+                        if the user can add a new category
+                    delete_category : str | NoneType
+                        If this function is used for deleting a category
+                        Misc will be omitted from the offering as Misc 
+                        is what deleted categories are converted to.
+
+
+    Returns     :   category_list
+                        The list of categories in the order they were 
+                        presented followed by the user's choice of category 
+                        in the form of a number : int.    
+    """
+
+    counter = 1
+    category_list = []
+
+    categories = retrieve_categories(table_name, "show")
+
+    print(f"\nPlease choose one of the following categories: ")
+
+    for category_tuple in categories:
+        
+        (category,) = (category_tuple)
+        if category != "Misc":
+            print(f"{counter}. {category}")
+            category_list.append(category)
+            counter += 1
+
+    if delete_category == None:
+        print(f"{counter}. Misc")
+        category_list.append("Misc")
+    
+    if menu_choice == "1" or menu_choice == "4" or menu_choice == "9":
+
+        counter += 1
+        print(f"{counter}. Add a new category")
+        category_list.append("Add a new category")
+
+    category_choice = check_in_range(input("\n"),counter,1)
+
+    category_list.append(category_choice)
+
+
+    return category_list
+    
+
+def ask_for_category(table_name, menu_choice, delete_category = None):
+    """
+    ask_for_category uses the show_categories function to ask the user which
+    they want. If the user wishes to add a new category it asks them 
+    what they would like it to be called. It then checks if that name is
+    taken by one of the other categories. If it is, it will ask the user 
+    if they wish to use this name, in which case it does, or if they would
+    like to rename it, in which case they are asked again to name it. If 
+    the user opted for one of the pre-existing categories, that category 
+    is chosen and retuned.
+
+    Parameters :    table_name : str
+                        The name of the table the category will be used for.
+                    menu_choice : str
+                        The menu option chosen in the main code.
+                    delete_category : str | NoneType
+                        This will be filled when ask_for_category is used
+                        to delete a category so that show_category does 
+                        not show Misc as an option. 
+    
+    Returns :       category_choice : str
+                        The category the user wishes to add.
+
+    """
+    if delete_category == None:
+        category_list = show_categories(table_name, menu_choice)
+
+    else:
+        category_list = show_categories(table_name, menu_choice,"delete")
+
+    # The index of the chosen category = the final list value - 1. 
+    if category_list[category_list[-1] - 1] == "Add a new category" : 
+        
+        while True:
+
+            new_category = input("\nPlease input the new category name:\n")
+            new_category = check_character_length(new_category, 15)
+            # Remove blank space, single and double quotation marks. 
+            new_category = new_category.strip().strip("\'").strip("\"").title()
+
+            if new_category not in category_list and new_category != "Misc":
+                is_correct = input(f"\nIs \'{new_category}\' correctly"+
+                                   " inputted?\n")
+                is_correct = check_yes_no(is_correct)
+
+                if is_correct == "yes":
+                    category_choice = new_category
+                    break
+
+                else:
+                    continue
+            
+            else: 
+                print(f"Unfortunately \'{new_category}\' is already a "+
+                      "category.")
+                use_category = input(f"\nWould you like to use {new_category}"
+                                     + "?\n")
+                use_category = check_yes_no(use_category)
+
+                # If the user wishes to use the 
+                if use_category == "yes":
+                    category_choice = new_category
+                    break
+
+                else:
+                    print("\nWe will now ask you to rename the category.")
+
+    else: 
+        category_choice = category_list[category_list[-1] - 1]
+    
+    return category_choice
+
+
+def income_expense_query(table_name, start_date, end_date, category = None,
+                         from_key = None, direction = "next", limit = -1):
+    """
+    income_expense_query makes the query which fetches the records of the 
+    Income or Expenses table between two dates, and only those with a 
+    category label if there is one. The records are put in the order of the
+    date and category index (or the category and date index) so they are 
+    read from the index without being sorted, and the name of each category
+    is found from its ID. The date of each record is read as a date in the
+    format YYYY-MM-DD.
+
+    A page of records carrying on from a record is found using the key of 
+    that record (its columns in the order of the index) rather than by 
+    skipping over the records before it, so every page is found with one 
+    search of the index however far through the records it is. The key is
+    made from a record by record_key.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime.date | str
+                        The earliest date a fetched record can be from.
+                    end_date : datetime.date | str
+                        The latest date a fetched record can be from.
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+                    from_key : list | NoneType
+                        The key of the record which the records carry on 
+                        from, or None to start from the start (or end) date.
+                    direction : str
+                        Either "next" to fetch the records after from_key
+                        in date order or "previous" to fetch the records 
+                        before it, latest first.
+                    limit : int
+                        The largest number of records to fetch, or -1 to 
+                        fetch all of them.
+
+    Returns     :   query : list
+                        The query in the form [query, parameters].
+    """
+    if category == None:
+        key_columns = ["date", "category_id", "amount", "description", 
+                       f"{table_name}.id"]
+        conditions = []
+        parameters = []
+
+    else:
+        key_columns = ["date", "amount", "description", f"{table_name}.id"]
+        conditions = ["category_id = " 
+                      + CATEGORY_ID_QUERY.format(table_name = table_name)]
+        parameters = [category]
+
+    if direction == "next":
+        order = ", ".join(key_columns)
+
+    else:
+        order = " DESC, ".join(key_columns) + " DESC"
+
+    start_day = date_to_day_number(start_date)
+    end_day = date_to_day_number(end_date)
+
+    if from_key == None:
+        conditions.append("date BETWEEN ? AND ?")
+        parameters += [start_day, end_day]
+
+    # The key takes the place of the start date (or the end date for the 
+    # previous records) so the index search starts exactly where the record
+    # of the key is.
+    elif direction == "next":
+        conditions.append(f"({', '.join(key_columns)}) > "
+                          + f"({', '.join(['?'] * len(key_columns))})")
+        conditions.append("date <= ?")
+        parameters += from_key + [end_day]
+
+    else:
+        conditions.append(f"({', '.join(key_columns)}) < "
+                          + f"({', '.join(['?'] * len(key_columns))})")
+        conditions.append("date >= ?")
+        parameters += from_key + [start_day]
+
+    query = f'''
+        SELECT date(date), amount, Categories.name, description, 
+            {table_name}.id 
+        FROM {table_name} CROSS JOIN Categories 
+        ON Categories.id = {table_name}.category_id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {order} LIMIT ?'''
+    parameters.append(limit)
+
+    return [query, parameters]
+
+
+def retrieve_income_expense(table_name, start_date, end_date, 
+                        category = None):
+    """
+    retrieve_income_expense fetches all the records which take place between
+    two dates and returns them. If there is a specific category, it will only
+    fetch records which have that category label.
+
+    Parameters  :   table_name : str
+                        The name of the table which the records will be 
+                        fetched from. 
+                    start_date : datetime
+                        The earliest date a fetched record can be from.
+                    end_date : datetime
+                        The lastest date a fetched record can be from.
+                    category : str
+                        The name of the category which they are searching by.
+
+
+    Returns     :   records : list
+                        A list of tuples containing the (date, amount, 
+                        category, description) from each fetched record. 
+    """
+    [query, parameters] = income_expense_query(table_name, start_date, 
+                                               end_date, category)
+
+    with reader() as read_cursor:
+        read_cursor.execute(query, parameters)
+        records = read_cursor.fetchall()
+
+    return records
+
+
+def stream_income_expense(table_name, start_date, end_date, category = None):
+    """
+    stream_income_expense is a generator which gives the same records as 
+    retrieve_income_expense one at a time. The records are fetched 
+    DISPLAY_BLOCK_SIZE at a time, so only one block of them is held in 
+    memory however many records there are.
+
+    Parameters  :   table_name : str
+                        The name of the table which the records will be 
+                        fetched from. 
+                    start_date : datetime
+                        The earliest date a fetched record can be from.
+                    end_date : datetime
+                        The lastest date a fetched record can be from.
+                    category : str
+                        The name of the category which they are searching by.
+
+    Returns     :   records : generator
+                        A generator of tuples containing the (date, amount,
+                        category, description, id) of each record.
+    """
+    [query, parameters] = income_expense_query(table_name, start_date, 
+                                               end_date, category)
+
+    with reader() as read_cursor:
+        read_cursor.execute(query, parameters)
+        records = read_cursor.fetchmany(DISPLAY_BLOCK_SIZE)
+
+        while len(records) != 0:
+            yield from records
+            records = read_cursor.fetchmany(DISPLAY_BLOCK_SIZE)
+
+
+def record_key(read_cursor, table_name, record, category = None):
+    """
+    record_key makes the key used by income_expense_query to carry on from
+    a record, which is the columns of the record in the order of the index 
+    the records are read from. The date is converted to its day number. The
+    category is left out when searching by category, and otherwise the ID 
+    of the category is found from its name so the whole key can be 
+    searched for in the index.
+
+    Parameters  :   read_cursor : sqlite3.Cursor
+                        The cursor used to find the ID of the category.
+                    table_name : str
+                        Either 'Income' or 'Expenses'.
+                    record : list | tuple
+                        The record in the format [date, amount, category, 
+                        description, id].
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+
+    Returns     :   key : list
+                        The key of the record.
+    """
+    day_number = date_to_day_number(record[0])
+
+    if category != None:
+        return [day_number, record[1], record[3], record[4]]
+
+    read_cursor.execute(CATEGORY_KEY_QUERY, (table_name, record[2]))
+    (category_id,) = read_cursor.fetchone()
+
+    return [day_number, category_id, record[1], record[3], record[4]]
+
+
+def retrieve_page(table_name, date_range, category = None, 
+                  from_record = None, direction = "next"):
+    """
+    retrieve_page fetches a page of up to RECORD_DISPLAY_LIMIT records 
+    between two dates, carrying on from a record on the page next to it.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    date_range : list
+                        The [start_date, end_date] of the records.
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+                    from_record : list | tuple | NoneType
+                        The last record of the page before when moving to 
+                        the next page, the first record of the page after 
+                        when moving to the previous page, or None for the 
+                        first page.
+                    direction : str
+                        Either "next" or "previous".
+
+    Returns     :   records : list
+                        The records on the page in date order. The list is 
+                        empty if there are no records before or after 
+                        from_record.
+    """
+    with reader() as read_cursor:
+        if from_record == None:
+            from_key = None
+
+        else:
+            from_key = record_key(read_cursor, table_name, from_record, 
+                                  category)
+
+        [query, parameters] = income_expense_query(table_name, 
+            date_range[0], date_range[1], category, from_key, direction, 
+            RECORD_DISPLAY_LIMIT)
+
+        read_cursor.execute(query, parameters)
+        records = read_cursor.fetchall()
+
+    if direction == "previous":
+        records.reverse()
+
+    return records
+
+
+def ask_for_description():
+    """
+    ask_for_description asks the user to input a description for a given 
+    record. 
+
+    Parameters  :   
+
+    Returns     :   description : str
+                        The description of record.
+    """
+    while True:
+        
+        description = input("\nPlease provide a brief description:\n")
+        description = check_character_length(description, 35)
+
+        print(f"\n\"{description}\"")
+        is_correct = input(f"Is the description above correct?\n")
+
+        is_correct = check_yes_no(is_correct)
+
+        if is_correct == "yes":
+            return description
+
+        else: 
+            continue
+
+
+def ask_for_record_data(table_name, menu_choice): 
+    """
+    ask_for_record_data uses the ask_for_date, ask_for_amount_in_pounds, 
+    ask_for_category, ask_for_description functions to get the date, amount,
+    category and description of a new record from the user. 
+
+    Parameters  :   table_name : str
+                        The name of the table the information is used for.
+                        Either 'Income' or 'Expenses'. 
+                    menu_choice : str
+                        The menu choice chosen in the main code. 
+
+    Returns     :   record_data : list
+                        A list containing the record of an income, expense
+                        or a goal. If the record is from an income or expense
+                        the list is in the format [date, amount, category, 
+                        description], if the record is for a budget the 
+                        record_data is in the format [category, amount]
+                        and if the record is for a goal the format is 
+                        [date, amount, description]
+    """
+    
+    if table_name == "Expenses" or table_name == "Income":
+        date = ask_for_date()
+        amount = ask_for_amount_in_pounds()
+        category = ask_for_category(table_name, menu_choice)
+        description = ask_for_description()
+    
+        record_data = [date, amount, category, description]
+    
+
+    elif table_name == "Budget":
+
+        print("\nWe will now ask you which category you would like to set" 
+              +  "a budget for.")
+        category = ask_for_category("Expenses", menu_choice)
+
+        print(f"\nWe will now ask you the weekly budget for \'{category}\'.")
+        budget = ask_for_amount_in_pounds()
+
+        record_data = [category, budget]
+
+
+    elif table_name == "Goals":
+        print("We will now ask you to enter the date this goal starts.")
+        date = ask_for_date()
+        print("\nNow we will ask what your goal amount is.")
+        amount = ask_for_amount_in_pounds()
+        description = ask_for_description()
+
+        record_data = [date, amount, description]
+
+    return record_data
+
+
+def ask_for_date_range ():
+    """"
+    ask_for_date_range asks the user the time range in which they
+    would like to view the records, from the earliest date to the latest 
+    date. The range can be any length, from a single day to many years.
+
+    Parameters  :
+
+    Returns     :   date_range : list
+                        A list consisting of the start_date of the search 
+                        and the end_date of the search   
+    """
+
+    print("\nWe will now ask you the earliest date you would like to start "
+          + "viewing from")
+    start_date = ask_for_date()
+    start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+
+    while True:
+        print("\nNow we will ask you the latest date you would like to view "
+              + "up to")
+        end_date = ask_for_date()
+        end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+
+        if end_date >= start_date:
+            break
+
+        print(f"\nThe latest date can not be before {start_date}.")
+
+    date_range = [start_date, end_date]
+
+    return date_range
+
+
+def totals_query(table_name, start_date, end_date, category = None, 
+                 period = None):
+    """
+    totals_query makes the query which adds up the total, number, smallest
+    and largest amount of the records of the Income or Expenses table 
+    between two dates from the DailyTotals table, either over the whole 
+    range or for each period of it. Only the records with a category label
+    are included if there is one.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime.date | str
+                        The earliest date a record can be from.
+                    end_date : datetime.date | str
+                        The latest date a record can be from.
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+                    period : str | NoneType
+                        One of the periods in PERIOD_BUCKETS to find the 
+                        totals of each period, or None for the totals of 
+                        the whole range.
+
+    Returns     :   query : list
+                        The query in the form [query, parameters].
+    """
+    conditions = ["table_name = ?"]
+    parameters = [table_name]
+
+    if category != None:
+        conditions.append("category_id = " 
+                          + CATEGORY_ID_QUERY.format(table_name = table_name))
+        parameters.append(category)
+
+    conditions.append("date BETWEEN ? AND ?")
+    parameters += [date_to_day_number(start_date), 
+                   date_to_day_number(end_date)]
+
+    if period == None:
+        query = f'''
+            SELECT COALESCE(SUM(total), 0), COALESCE(SUM(count), 0), 
+                MIN(smallest_amount), MAX(largest_amount) 
+            FROM DailyTotals 
+            WHERE {" AND ".join(conditions)}'''
+
+    else:
+        query = f'''
+            SELECT {PERIOD_BUCKETS[period]} AS period, SUM(total), 
+                SUM(count), MIN(smallest_amount), MAX(largest_amount)
+            FROM DailyTotals 
+            WHERE {" AND ".join(conditions)}
+            GROUP BY period ORDER BY period'''
+
+    return [query, parameters]
+
+
+def retrieve_totals(table_name, start_date, end_date, category = None):
+    """
+    retrieve_totals finds the total, number, smallest and largest amount of
+    the records which take place between two dates without fetching the 
+    records themselves. If there is a specific category, only the records 
+    with that category label are included. The totals are added up from
+    the DailyTotals table, so only one row is read for each day and 
+    category in the range.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime
+                        The earliest date a record can be from.
+                    end_date : datetime
+                        The latest date a record can be from.
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+
+    Returns     :   totals : list
+                        A list in the format [total, number of records, 
+                        smallest amount, largest amount] with the amounts 
+                        in pence. The smallest and largest amounts are None
+                        if there are no records.
+    """
+    [query, parameters] = totals_query(table_name, start_date, end_date,
+                                       category)
+
+    with reader() as read_cursor:
+        read_cursor.execute(query, parameters)
+        totals = list(read_cursor.fetchone())
+
+    return totals
+
+
+def retrieve_period_totals(table_name, start_date, end_date, period, 
+                           category = None):
+    """
+    retrieve_period_totals finds the total, number, smallest and largest 
+    amount of the records in each day, week, month or year between two 
+    dates. The records are grouped into periods by SQLite using the bucket
+    of the period in PERIOD_BUCKETS and added up from the DailyTotals table,
+    so a ten year range grouped by month gives 120 rows without reading any
+    of the records themselves.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime
+                        The earliest date a record can be from.
+                    end_date : datetime
+                        The latest date a record can be from.
+                    period : str
+                        One of the periods in PERIOD_BUCKETS.
+                    category : str | NoneType
+                        The name of the category which they are searching by.
+
+    Returns     :   period_totals : list
+                        A list of [period, total, number of records, 
+                        smallest amount, largest amount] for each period 
+                        which has any records, in date order.
+    """
+    [query, parameters] = totals_query(table_name, start_date, end_date,
+                                       category, period)
+
+    with reader() as read_cursor:
+        read_cursor.execute(query, parameters)
+        period_totals = read_cursor.fetchall()
+
+    return period_totals
+
+
+def retrieve_profit_between_dates(start_dates, end_date):
+    """
+    retrieve_profit_between_dates finds the profit made between each of the
+    start dates and the day before the next start date, with the final
+    start date running until the end date. Every interval is totalled in
+    the same query using PROFIT_BETWEEN_DATES_QUERY rather than fetching
+    the records of each interval.
+
+    Parameters  :   start_dates : list
+                        A list of distinct start dates as day numbers in
+                        ascending order, none of which are after end_date.
+                    end_date : int
+                        The day number of the last date of the final 
+                        interval.
+
+    Returns     :   profit_between_dates : list
+                        The profit made in each interval in pence, in the 
+                        same order as start_dates.
+    """
+    intervals = []
+
+    for i, start_date in enumerate(start_dates):
+        # The interval ends the day before the next start date as BETWEEN
+        # is inclusive.
+        if i != len(start_dates) - 1:
+            interval_end = start_dates[i + 1] - 1
+
+        else:
+            interval_end = end_date
+
+        intervals.append([start_date, interval_end])
+
+    profit_between_dates = [0] * len(intervals)
+
+    with reader() as read_cursor:
+        read_cursor.execute(PROFIT_BETWEEN_DATES_QUERY, 
+                            (json.dumps(intervals),))
+
+        for (interval, profit) in read_cursor.fetchall():
+            profit_between_dates[interval] = profit
+
+    return profit_between_dates
+
+
+def display_total(table_name, totals, date_range, category = None): 
+    """
+    display_total displays the total of all the amounts over a date range 
+    to the user, as found by retrieve_totals. If the records are expenses 
+    in a category with a budget, the user is told how the total compares
+    with the budget.
+    
+    Parameters  :   table_name : str
+                        The name of the table the totals were found from. 
+                    totals : list
+                        A list in the format [total, number of records, 
+                        smallest amount, largest amount].
+                    date_range : list
+                        A list containing the start and end dates which the 
+                        records take place over. 
+                    category : str | NoneType
+                        The category the totals are for, if any.
+
+    Returns     :   
+    """
+    [total, no_of_records, smallest_amount, largest_amount] = totals
+
+    if table_name == "Income":
+        print(f"\nBetween {date_range[0]} and {date_range[1]} you have earned"
+            + f" a total of £{format_pounds(total)}")
+        
+        if category != None:
+            print (f"in the \'{category}\' category.")
+        
+        
+    elif table_name == "Expenses":
+        print(f"Between {date_range[0]} and {date_range[1]} you have spent"
+              + f" a total of £{format_pounds(total)}.")
+        
+        if category != None: 
+            budget = budget_for_category_over_date(category,date_range[0],
+                                                   date_range[1])
+            if budget != None and budget > total:
+                print(f"Well done! This is under the \'{category}\' budget"
+                    + f" between {date_range[0]} \nand {date_range[1]}"
+                    + f" of £{format_pounds(budget)}.")
+            
+            elif budget != None and budget <= total:
+                print("Unfortunately the budget over this time for " 
+                      + f"\'{category}\' is £{format_pounds(budget)}."
+                      + "\nWe must try and spend less!")
+
+    if no_of_records != 0:
+        print(f"This is made up of {no_of_records} record(s) ranging from "
+              + f"£{format_pounds(smallest_amount)} to "
+              + f"£{format_pounds(largest_amount)}.")
+        
+
+def retrieve_budget_report(start_date, end_date):
+    """
+    retrieve_budget_report compares the spending in every Expenses category
+    between two dates with the budget of the category over that time, 
+    worked out in the same way as budget_for_category_over_date, using 
+    BUDGET_REPORT_QUERY.
+
+    Parameters  :   start_date : datetime.date
+                        The earliest date of the spending.
+                    end_date : datetime.date
+                        The latest date of the spending.
+
+    Returns     :   budget_report : list
+                        A list of [category, budget, spent, budget left, 
+                        percentage used] for every category which has a 
+                        budget or any spending, in category order, with the
+                        amounts in pence. The budget, budget left and 
+                        percentage used are None for a category without a 
+                        budget.
+
+    Raises      :   ValueError
+                        If the end date is before the start date, which 
+                        would make every budget negative.
+    """
+    if end_date < start_date:
+        raise ValueError(f"The end date {end_date} is before the start date "
+                         + f"{start_date}.")
+
+    no_of_days = (end_date - start_date).days
+
+    with reader() as read_cursor:
+        read_cursor.execute(BUDGET_REPORT_QUERY, 
+                            (date_to_day_number(start_date), 
+                             date_to_day_number(end_date), no_of_days))
+        budget_report = sorted(read_cursor.fetchall())
+
+    return budget_report
+
+
+def display_budget_report(budget_report, date_range):
+    """
+    display_budget_report shows the budget of every category next to how 
+    much has been spent, how much of the budget is left and the percentage 
+    of the budget which has been used, then tells the user how many of the
+    budgets they have gone over.
+
+    Parameters  :   budget_report : list
+                        The report from retrieve_budget_report.
+                    date_range : list
+                        The [start_date, end_date] of the report.
+
+    Returns     :
+    """
+    if len(budget_report) == 0:
+        print(f"\nUnfortunately, there are no budgets or spending between "
+              + f"{date_range[0]} and {date_range[1]}.")
+        return
+
+    print(f"\nHere is your spending between {date_range[0]} and "
+          + f"{date_range[1]} compared with your budgets.")
+    display_as_table("BudgetReport", budget_report)
+
+    budgeted_categories = [record for record in budget_report 
+                           if record[1] != None]
+    over_budget_categories = [record[0] for record in budgeted_categories
+                              if record[2] >= record[1]]
+
+    if len(over_budget_categories) == 0:
+        print(f"Well done! You are under budget in all "
+              + f"{len(budgeted_categories)} of your budgeted categories.")
+
+    else:
+        print(f"You are over budget in {len(over_budget_categories)} of "
+              + f"your {len(budgeted_categories)} budgeted categories: "
+              + f"{', '.join(over_budget_categories)}.\nWe must try and "
+              + "spend less!")
+
+
+def view_records (table_name, menu_choice):
+    """
+    view_records asks the user to provide a period of time which they like
+    to view the records of, using the ask_for_date_range function. If the 
+    user has chosent to view by category they wll be asked which category 
+    they would like to view. Then all the relevant records are fetched using 
+    the retrieve_income_expense function and displayed using the 
+    display_as_table function. 
+
+    Parameters  :   table_name : str
+                        The name of the table the user has selected to view.
+                    menu_choice : str
+                        The menu choice of the user in the main code.
+    
+    Returns     :   
+    """
+    date_range = ask_for_date_range()
+
+    # The category is necessary when viewing by category or viewing the budget. 
+    if menu_choice == "3" or menu_choice == "6" :
+    
+        category = ask_for_category(table_name,menu_choice)
+    
+    else :
+        category = None
+    
+    # The totals are found first so that the records are only fetched 
+    # if there are some to show and the user wants to see them, or the 
+    # totals of each period if they would rather see those.
+    totals = retrieve_totals(table_name, date_range[0], date_range[1], 
+                             category)
+    
+    if totals[1] == 0:
+        print(f"Unfortunately, there are no records between {date_range[0]}"
+              + f" and {date_range[1]}")
+        return
+    
+    period = ask_for_period()
+
+    if period != None:
+        period_totals = retrieve_period_totals(table_name, date_range[0], 
+            date_range[1], period, category)
+        display_as_table("Periods", period_totals)
+
+    elif totals[1] > RECORD_DISPLAY_LIMIT:
+        page_through_records(table_name, date_range, category, totals[1])
+
+    else:
+        records = retrieve_income_expense(table_name, date_range[0],
+                                          date_range[1], category)
+        display_as_table(table_name, records)
+
+    display_total(table_name, totals, date_range, category)
+    return
+
+
+def ask_for_period():
+    """
+    ask_for_period asks the user whether they would like to see every 
+    record or the totals of each day, week, month or year.
+
+    Parameters  :
+
+    Returns     :   period : str | NoneType
+                        One of the periods in PERIOD_BUCKETS, or None if the
+                        user would like to see every record.
+    """
+    periods = list(PERIOD_BUCKETS)
+
+    print("\nPlease choose how you would like to view the records:")
+    print("1. Every record")
+
+    for counter, period in enumerate(periods, start = 2):
+        print(f"{counter}. The totals of each {period}")
+
+    period_choice = check_in_range(input("\n"), len(periods) + 1, 1)
+
+    if period_choice == 1:
+        return None
+
+    return periods[period_choice - 2]
+
+
+def page_through_records(table_name, date_range, category, no_of_records):
+    """
+    page_through_records shows the records between two dates a page of 
+    RECORD_DISPLAY_LIMIT records at a time using retrieve_page. After each 
+    page the user can choose to see the next or previous page, jump to the
+    page starting at a date or stop viewing the records.
+
+    Parameters  :   table_name : str
+                        The name of the table the user has selected to view.
+                    date_range : list
+                        The [start_date, end_date] of the records.
+                    category : str | NoneType
+                        The name of the category the user is viewing, or 
+                        None to view every category.
+                    no_of_records : int
+                        The number of records between the dates.
+
+    Returns     :
+    """
+    print(f"\nThere are {no_of_records} records between {date_range[0]} and"
+          + f" {date_range[1]} so they will be shown {RECORD_DISPLAY_LIMIT} "
+          + "at a time.")
+
+    records = retrieve_page(table_name, date_range, category)
+    display_as_table(table_name, records)
+
+    while True:
+
+        page_choice = input("""\nPlease choose whether you would like to:
+1. See the next page
+2. See the previous page
+3. Jump to a date
+4. Stop viewing the records\n\n""")
+
+        if page_choice == "1":
+            new_records = retrieve_page(table_name, date_range, category, 
+                                        records[-1], "next")
+
+        elif page_choice == "2":
+            new_records = retrieve_page(table_name, date_range, category, 
+                                        records[0], "previous")
+
+        elif page_choice == "3":
+            jump_date = datetime.date.fromisoformat(ask_for_date())
+
+            if jump_date < date_range[0] or jump_date > date_range[1]:
+                print(f"\n{jump_date} is not between {date_range[0]} and "
+                      + f"{date_range[1]}.")
+                continue
+
+            new_records = retrieve_page(table_name, 
+                                        [jump_date, date_range[1]], category)
+
+        elif page_choice == "4":
+            return
+
+        else:
+            print("Please only input \"1\", \"2\", \"3\" or \"4\"")
+            continue
+
+        if len(new_records) == 0:
+            print("\nThere are no more records in that direction.")
+
+        else:
+            records = new_records
+            display_as_table(table_name, records)
+
+
+def retrieve_by_id(table_name, id_):
+    """
+    retrieve_by_id searches a table for a record with a certain ID and 
+    returns the record if one is found. 
+    
+    Parameter:  id_ : int 
+                    The ID number of the book to be searched for
+
+
+    Returns:    id_record : list / NoneType
+                    The record of the book with the ID provided or 
+                    None if there is no record with the ID 
+    """
+
+    cursor.execute(RECORD_BY_ID_QUERY.format(table_name = table_name), 
+                   (id_,))
+    id_record = cursor.fetchone()
+
+    return id_record 
+
+
+def ask_for_id(table_name):
+        """
+        ask_for_id asks the user to provide the I.D. of a record they wish
+        to edit. The record will be searched for with the retrieve_by_id 
+        function If they provide an I.D. of a record which is not in the 
+        the table, they will be asked if they want to submit another I.D.. 
+        If a record is found with the user inputted I.D., the record
+        will be displayed to them using the display_as_table function and 
+        they will be asked if this is the record they wish to edit. If the
+        user wishes to edit the found record, that record is returned, if 
+        they don't wish to edit a record None will be returned. 
+
+        Parameters  :   table_name : str
+                            The name of the table in which the record is to
+                            be searched for. 
+        
+        Returns     :   id_record : list
+                            A list containing a record which the user wishes
+                            to edit
+                        None
+                            It returns None if the user does not wish to 
+                            edit a record. 
+        """
+        while True:
+            id_ =  input("\nPlease input the I.D\n")
+            id_ = check_number(id_, "int")
+            id_record = retrieve_by_id(table_name, id_)
+
+            if id_record == None:
+                print("\nUnfortunately there is no record with this I.D.")
+                try_again = input("\nWould you like to try a different I.D.?"
+                                  +"\n")
+                try_again = check_yes_no(try_again)
+
+            else:
+                display_as_table(table_name, id_record)
+
+                correct_record = input("\nIs the record above, the record"
+                                       + " you wish to edit?\n")
+                correct_record = check_yes_no(correct_record)
+
+                if correct_record == "no":
+                    try_again = input("Would you like to try a different"
+                                      +" I.D.?\n")
+                    try_again = check_yes_no(try_again)
+
+                elif correct_record == "yes": 
+                    return id_record 
+            
+            if try_again == "yes":
+                continue
+
+            elif try_again == "no" :
+                print("\nNo information has been altered.\n")
+                return None
+
+
+def update_category(table_name, original_category, new_category):
+    """
+    update_category moves all the records in one category of a table into
+    another category. If the new category isn't already in the table the 
+    category is simply renamed in the Categories table. Otherwise the 
+    records are moved into the existing category, merging the two 
+    categories. Only the Categories table or the category IDs of the 
+    records change, the content hash of a record doesn't hold its category.
+
+    Parameters  :   table_name : str
+                        The name of the table in which the category will be
+                        changed.
+                    original_category : str
+                        The category the records are currently in.
+                    new_category : str
+                        The category the records will be moved to.
+
+    Returns     :   is_updated : bool
+                        True if there was a category with the original name
+                        in the table.
+    """
+    with transaction():
+        cursor.execute(CATEGORY_PAIR_QUERY, 
+                       (table_name, original_category, new_category))
+        category_ids = dict(cursor.fetchall())
+
+        if original_category not in category_ids:
+            return False
+
+        if new_category not in category_ids:
+            cursor.execute('''UPDATE Categories SET name = ? WHERE id = ?''',
+                           (new_category, category_ids[original_category]))
+
+        elif new_category != original_category:
+            cursor.execute(MOVE_CATEGORY_QUERY.format(
+                               table_name = table_name), 
+                           (category_ids[new_category], 
+                            category_ids[original_category]))
+            cursor.execute('''DELETE FROM Categories WHERE id = ?''', 
+                           (category_ids[original_category],))
+
+        # Every record of the original category is now in the new category.
+        if (table_name in category_cache 
+            and original_category in category_cache[table_name]):
+            category_cache[table_name].discard(original_category)
+            category_cache[table_name].add(new_category)
+
+    return True
+
+def delete_record_by_id(table_name, id_):
+    """
+    delete_record_by_id deletes the record with a certain ID from a table.
+
+    Parameters  :   table_name : str
+                        The name of the table the record will be deleted 
+                        from.
+                    id_ : int
+                        The ID of the record to be deleted.
+
+    Returns     :   is_deleted : bool
+                        True if there was a record with the ID to delete.
+    """
+    with transaction():
+        original_record = retrieve_by_id(table_name, id_)
+        cursor.execute(DELETE_RECORD_QUERY.format(table_name = table_name),
+                       (id_,))
+        is_deleted = cursor.rowcount == 1
+
+        if is_deleted:
+            update_category_cache(table_name, [], [original_record[2]])
+
+    return is_deleted
+
+
+def update_record_by_id(table_name, new_record):
+    """
+    update_record_by_id replaces the date, amount, category and description
+    of the record with a certain ID in the Income or Expenses table, along
+    with its content hash.
+
+    Parameters  :   table_name : str
+                        The name of the table where the record resides. 
+                    new_record : list
+                        The new record in the format [date, amount, category,
+                        description, id].
+
+    Returns     :   is_updated : bool
+                        True if there was a record with the ID to update.
+    """
+    with transaction():
+        original_record = retrieve_by_id(table_name, new_record[-1])
+        add_categories(table_name, [new_record[2]])
+        values = [date_to_day_number(new_record[0])] + new_record[1:4]
+        hash_ = content_hash(values[0], values[1], values[3])
+        cursor.execute(UPDATE_RECORD_QUERY.format(table_name = table_name),
+                       values + [hash_, new_record[4]])
+        is_updated = cursor.rowcount == 1
+
+        if is_updated:
+            update_category_cache(table_name, [new_record[2]], 
+                                  [original_record[2]])
+
+    return is_updated
+
+
+def set_budget(category, budget):
+    """
+    set_budget sets the weekly budget of a category. If the category already
+    has a budget it is replaced, otherwise a new budget is added.
+
+    Parameters  :   category : str
+                        The category the budget is for.
+                    budget : int
+                        The weekly budget of the category in pence.
+
+    Returns     :
+    """
+    with transaction():
+        cursor.execute('''INSERT INTO Budget(category, budget) VALUES (?,?)
+                       ON CONFLICT(category) DO UPDATE SET budget = ?''', 
+                       (category, budget, budget))
+
+
+def rename_delete_category(table_name, rename_or_delete):
+    """
+    rename_delete_category asks the user to chose the category name they 
+    wish to change and then updates the table so that all the records 
+    within that category are within the new category. If the user has 
+    chosen to rename the category they can choose the category's new name
+    but if they have chosen to delete a category then the category will
+    default to "Misc". 
+
+    Parameters  :   table_name  
+                        The name of the table in which the chosen category
+                        will be changed.
+                    rename_or_delete
+                        Either "rename" or "delete". The choice whether 
+                        the user will rename or delete the category. 
+
+    Returns     :
+    """
+
+    print("\nWe will now ask you to choose which category you wish to"
+          +" update.")
+    # Here we have chosen to set the function ask_for_category 's menu_choice
+    # as "2" so that the user can not make a new category up.
+
+    if rename_or_delete == "rename":
+        original_category = ask_for_category(table_name, "2")
+
+        print("\nNow we will ask you for what you would like to change the"
+            + " category to?")
+        # Here we have set the function ask_for_category's menu_choice as "4"
+        # so that the user has the option to make up a new category name.
+        new_category = ask_for_category(table_name, "4")
+
+    elif rename_or_delete == "delete":
+        original_category = ask_for_category(table_name, "2", "delete")
+
+        new_category = "Misc"
+
+    update_category(table_name, original_category, new_category)
+
+    print(f"\nAll records in the \'{original_category}\' are now in the \'"
+          + f"{new_category}\' category.\n")
+
+
+def delete_record (table_name):
+    """
+    delete_record finds the record which the user wants to delete and then
+    deletes it from the corresponding table. It then informs the user that
+    the record has been deleted. 
+
+    Parameters  :   table_name
+                        The name of the table the user wishes to delete a 
+                        record from. 
+
+    Returns     :       
+    """
+    original_record = ask_for_id(table_name)
+
+    if original_record != None:
+
+        id_ = original_record[-1]
+
+        delete_record_by_id(table_name, id_)
+
+        print(f"The following record has been deleted from the {table_name}"
+              + " table:")
+        print("")
+        display_as_table(table_name, original_record)
+
+
+def update_record (table_name):
+    """
+    update_record asks the user for a record to change by using the as_for_id
+    function. Once the record is found the user is then asked to update 
+    each column. With the new column data, the record is updated and the
+    user is informed of this and displayed the change using the 
+    display_as_table function. 
+
+    Parameters  :   table_name : str
+                        The name of the table where the record resides. 
+
+    Returns     :       
+    """
+    original_record = ask_for_id(table_name)
+
+    if original_record != None:
+
+        id_ = original_record[-1]
+
+        print("\nWe will now ask you to put in the correct information.")
+
+        if table_name == "Expenses" or table_name == "Income":
+
+            # The menu_choice for ask_for_record_data is chosen to be "4" to 
+            # allow the user to add a new category if they wish to. 
+            new_record = ask_for_record_data(table_name, "4")
+            new_record.append(id_)
+
+            # The record shown to the user is read back in the same 
+            # transaction as the update.
+            with transaction():
+                update_record_by_id(table_name, new_record)
+                new_record = list(retrieve_by_id(table_name, id_))
+            
+            print("This record has now been changed to:")
+            display_as_table(table_name, new_record)
+
+        elif table_name == "Goals":
+            ""
+    return
+
+
+def edit_table(table_name):
+    """
+    edit_table asks the user if they wish to update a record, delete a 
+    record, rename a category, delete a category or carry on without 
+    doing any of them. The functions update_record, delete_record and 
+    rename_delete_category are used to fulfil the users choice. 
+
+    Parameters  :   table_name
+                        The name of the table which the user's choice will
+                        be used on. 
+
+    Returns     :
+    """
+
+    while True:
+
+        edit_choice = input("""\nPlease choose whether you would like to:
+1. Update a record
+2. Delete a record
+3. Rename a category
+4. Delete a category 
+5. None of the above.\n\n""")
+        
+        if edit_choice == "1" :
+            update_record(table_name)
+            return
+
+        elif edit_choice == "2":
+            delete_record(table_name)
+            return
+            
+        elif edit_choice == "3":
+            rename_delete_category(table_name, "rename")
+            return
+
+        elif edit_choice == "4":
+            print("\nWhen we delete a category, the records within that"
+                  + " category move to the Misc category. ")
+            rename_delete_category(table_name, "delete")
+            return
+
+        elif edit_choice == "5":
+            return
+        else: 
+            print("Please only input \"1\", \"2\", \"3\" or \"4\"")
+
+
+def allocate_goal_progress(goal_records, profit_between_dates):
+    """
+    allocate_goal_progress shares the profit made between the goal start 
+    dates out between the goals and returns how much of each goal is left
+    to save. The profit of each interval is shared equally between the 
+    goals which have started and are unfinished. Goals are dealt with from
+    the smallest amount left to the largest, and when a goal needs less than
+    its share it is completed and the rest of its share is split between 
+    the goals after it. 
+
+    Rather than sorting and going through every goal for each interval, the
+    unfinished goals are kept in a heap ordered by the amount left. As every
+    unfinished goal is reduced by the same share, the total share given out
+    so far is kept as a single offset and each goal stores its amount plus
+    the offset from when it started, so only the goals which are completed
+    are ever visited.
+    This takes O((G + D) log G) time for G goals and D intervals. The 
+    amounts and profits are whole numbers of pence, and the shares and the
+    offset are whole numbers of 1/GOAL_SHARE_SCALE of a penny, so they 
+    never grow more precise (and slower to work with) as more intervals 
+    are shared out. A share which doesn't divide exactly is rounded down, 
+    so even after ten years of intervals the amounts are out by far less 
+    than a penny. The amount left of each goal is only rounded to the 
+    nearest penny at the end.
+
+    Parameters  :   goal_records : list
+                        A list of the goal records in the format [date, 
+                        amount, description, id] in date order, with the
+                        dates as day numbers and the amounts in pence.
+                    profit_between_dates : list
+                        The profit made in pence in the interval which 
+                        starts at each distinct goal date, in date 
+                        order. Goals with a date after the last interval
+                        have not started and keep their full amount.
+
+    Returns     :   current_progress_records : list
+                        A list containing the records of the goals in the 
+                        same order as goal_records with the amount of each
+                        being the amount left to save.
+    """
+    allocation = new_goal_allocation(goal_records)
+    continue_goal_allocation(allocation, goal_records, profit_between_dates)
+
+    current_progress_records = goal_amounts_left(allocation, goal_records)
+
+    return current_progress_records
+
+
+def new_goal_allocation(goal_records):
+    """
+    new_goal_allocation starts the sharing out of profit between goals done
+    by allocate_goal_progress, before the profit of any interval has been 
+    shared out.
+
+    Parameters  :   goal_records : list
+                        The goal records in the format [date, amount, 
+                        description, id] in date order, with the dates as 
+                        day numbers and the amounts in pence.
+
+    Returns     :   allocation : dict
+                        The state of the sharing out, which is carried on 
+                        with continue_goal_allocation.
+    """
+    allocation = {
+        "no_of_goals": len(goal_records),
+        "no_of_intervals": 0,
+        "current_amounts": [record[1] for record in goal_records],
+        # The amount of each goal in units of GOAL_SHARE_SCALE plus the 
+        # share offset at the time it started, so the amount left is this 
+        # less the current share offset.
+        "offset_amounts": [None] * len(goal_records),
+        # Heap entries are in the form (offset amount, goal index) so goals
+        # with the same amount left keep their original order.
+        "unfinished_goals": [],
+        "share_offset": 0,
+        # A checkpoint of the sharing out is only carried on from with the 
+        # same scale.
+        "share_scale": GOAL_SHARE_SCALE,
+        # The counts which mirror the number of goals sharing the profit. 
+        # The number of goals sharing an interval's profit is the number of
+        # goals started up to that date, less the goals completed during 
+        # the previous interval, less every completed goal which has 
+        # started.
+        "no_of_started_goals": 0,
+        "no_of_completed_goals": 0,
+        "previous_no_of_records": 0,
+        "previous_no_sharing": 0,
+        # The index of the first goal which hasn't started yet.
+        "goal_index": 0
+    }
+
+    return allocation
+
+
+def continue_goal_allocation(allocation, goal_records, profit_between_dates):
+    """
+    continue_goal_allocation shares out the profit of the next intervals 
+    between the goals in the way described in allocate_goal_progress, 
+    carrying on from the state of allocation, which is updated. Sharing out
+    the intervals a few at a time gives exactly the same amounts as sharing
+    them out all at once.
+
+    Parameters  :   allocation : dict
+                        The state of the sharing out from 
+                        new_goal_allocation, after the intervals shared out
+                        so far.
+                    goal_records : list
+                        The goal records in the format [date, amount, 
+                        description, id] in date order, with the dates as 
+                        day numbers and the amounts in pence.
+                    profit_between_dates : list
+                        The profit made in pence in each of the next 
+                        intervals, in date order.
+
+    Returns     :
+    """
+    current_amounts = allocation["current_amounts"]
+    offset_amounts = allocation["offset_amounts"]
+    unfinished_goals = allocation["unfinished_goals"]
+    share_offset = allocation["share_offset"]
+    no_of_started_goals = allocation["no_of_started_goals"]
+    no_of_completed_goals = allocation["no_of_completed_goals"]
+    previous_no_of_records = allocation["previous_no_of_records"]
+    previous_no_sharing = allocation["previous_no_sharing"]
+    goal_index = allocation["goal_index"]
+
+    for entry, profit in enumerate(profit_between_dates, 
+                                   start = allocation["no_of_intervals"]):
+        date = goal_records[goal_index][0]
+
+        # Start the goals which begin on this date.
+        while (goal_index < len(goal_records) 
+               and goal_records[goal_index][0] == date):
+            amount = goal_records[goal_index][1]
+            no_of_started_goals += 1
+
+            if amount == 0:
+                no_of_completed_goals += 1
+
+            else:
+                offset_amounts[goal_index] = (amount * GOAL_SHARE_SCALE 
+                                              + share_offset)
+                heapq.heappush(unfinished_goals, 
+                               (offset_amounts[goal_index], goal_index))
+            goal_index += 1
+
+        if entry == 0:
+            no_of_records = no_of_started_goals
+
+        else:
+            no_of_records = (no_of_started_goals - (previous_no_of_records 
+                             - previous_no_sharing))
+
+        no_sharing = no_of_records - no_of_completed_goals
+
+        if no_sharing == 0:
+            share_of_profit = 0
+
+        else:
+            share_of_profit = profit * GOAL_SHARE_SCALE // no_sharing
+
+        # Complete the goals with the smallest amounts left while their 
+        # amount is within the share. Once one goal is not completed the 
+        # share no longer changes, so no larger goal can be completed.
+        while len(unfinished_goals) != 0:
+            (_, i) = unfinished_goals[0]
+            amount_left = offset_amounts[i] - share_offset
+
+            if amount_left > share_of_profit:
+                break
+
+            heapq.heappop(unfinished_goals)
+
+            # share = ((n-1)share_old + difference) / (n-1) 
+            if no_sharing != 1:
+                n = no_sharing
+                difference = share_of_profit - amount_left
+                profit_left = (n-1) * share_of_profit + difference
+
+                share_of_profit = profit_left // (n-1)
+
+            current_amounts[i] = 0
+            no_sharing -= 1
+            no_of_completed_goals += 1
+
+        # Every goal still unfinished is reduced by the share.
+        share_offset += share_of_profit
+
+        previous_no_of_records = no_of_records
+        previous_no_sharing = no_sharing
+
+    allocation["no_of_intervals"] += len(profit_between_dates)
+    allocation["share_offset"] = share_offset
+    allocation["no_of_started_goals"] = no_of_started_goals
+    allocation["no_of_completed_goals"] = no_of_completed_goals
+    allocation["previous_no_of_records"] = previous_no_of_records
+    allocation["previous_no_sharing"] = previous_no_sharing
+    allocation["goal_index"] = goal_index
+
+
+def goal_amounts_left(allocation, goal_records):
+    """
+    goal_amounts_left finds the amount left to save of each goal from the
+    state of the sharing out of profit, rounded to the nearest penny. The 
+    state itself is not changed, so more intervals can still be shared out.
+
+    Parameters  :   allocation : dict
+                        The state of the sharing out.
+                    goal_records : list
+                        The goal records in the format [date, amount, 
+                        description, id] in date order.
+
+    Returns     :   current_progress_records : list
+                        A list containing the records of the goals in the 
+                        same order as goal_records with the amount of each
+                        being the amount left to save.
+    """
+    current_amounts = list(allocation["current_amounts"])
+
+    for (_, i) in allocation["unfinished_goals"]:
+        current_amounts[i] = round(Fraction(
+            allocation["offset_amounts"][i] - allocation["share_offset"], 
+            GOAL_SHARE_SCALE))
+
+    current_progress_records = []
+
+    for i, record in enumerate(goal_records):
+        current_progress_records.append([record[0], current_amounts[i], 
+                                         record[2], record[3]])
+
+    return current_progress_records
+
+
+def goal_allocation_to_json(allocation):
+    """
+    goal_allocation_to_json writes the state of the sharing out of profit 
+    between goals as JSON so it can be kept in the GoalCheckpoint table. 
+    Every amount in it is a whole number, so it is kept exactly.
+
+    Parameters  :   allocation : dict
+                        The state of the sharing out.
+
+    Returns     :   allocation_json : str
+                        The state as JSON.
+    """
+    return json.dumps(allocation)
+
+
+def goal_allocation_from_json(allocation_json):
+    """
+    goal_allocation_from_json reads the state of the sharing out of profit
+    between goals written by goal_allocation_to_json.
+
+    Parameters  :   allocation_json : str
+                        The state as JSON.
+
+    Returns     :   allocation : dict
+                        The state of the sharing out.
+    """
+    allocation = json.loads(allocation_json)
+
+    # The heap entries are compared with the tuples added to the heap, so 
+    # they must be tuples rather than JSON lists.
+    allocation["unfinished_goals"] = [tuple(entry) for entry 
+                                      in allocation["unfinished_goals"]]
+
+    return allocation
+
+
+def benchmark_goal_allocation(no_of_goals):
+    """
+    benchmark_goal_allocation times allocate_goal_progress on randomly 
+    generated goals spread over ten years of start dates with a random 
+    profit for each interval, and prints how long it took.
+
+    Parameters  :   no_of_goals : int
+                        The number of goals to share the profits between.
+
+    Returns     :   elapsed_time : float
+                        The time in seconds allocate_goal_progress took.
+    """
+    first_day = date_to_day_number(datetime.date(2015, 1, 1))
+    goal_records = []
+
+    for id_ in range(1, no_of_goals + 1):
+        date = first_day + random.randint(0, 3652)
+        amount = random.randint(100, 1000000)
+        goal_records.append([date, amount, f"Goal {id_}", id_])
+
+    goal_records.sort(key = lambda record: record[0])
+
+    no_of_dates = len(set(record[0] for record in goal_records))
+    profit_between_dates = []
+
+    for i in range(no_of_dates):
+        profit_between_dates.append(random.randint(-50000, 200000))
+
+    start_time = time.perf_counter()
+    allocate_goal_progress(goal_records, profit_between_dates)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"Shared the profit of {no_of_dates} intervals between "
+          + f"{no_of_goals} goals in {elapsed_time:.3f} seconds.")
+    
+    return elapsed_time
+
+
+def goal_allocation_until(goal_records, checkpoint, end_date):
+    """
+    goal_allocation_until shares out the profit made between each of the 
+    goal start dates up to the end of end_date between the goals, carrying
+    on from a checkpoint of the GoalCheckpoint table if it can be. Only the
+    profit made after the checkpoint date is found, with 
+    retrieve_profit_between_dates, and only the intervals which have 
+    started since are shared out with continue_goal_allocation. The 
+    interval which is still going at the end of end_date is not shared 
+    out, its profit so far is kept under "open_profit" instead, so the 
+    state can be saved as the checkpoint of end_date.
+
+    Parameters  :   goal_records : list
+                        The goal records in the format [date, amount, 
+                        description, id] in date order, with the dates as 
+                        day numbers and the amounts in pence.
+                    checkpoint : tuple | NoneType
+                        The (checkpoint date, allocation JSON) of the 
+                        checkpoint, or None if there isn't one.
+                    end_date : int
+                        The day number of the last day to share out.
+
+    Returns     :   goal_allocation : list
+                        A list in the format [allocation, 
+                        started_goal_dates] where allocation is the state 
+                        of the sharing out and started_goal_dates are the 
+                        distinct start dates of the goals which had started
+                        by end_date.
+    """
+    # The distinct start dates of the goals which have started.
+    started_goal_dates = []
+
+    for record in goal_records:
+        if (record[0] <= end_date 
+            and (len(started_goal_dates) == 0 
+                 or started_goal_dates[-1] != record[0])):
+            started_goal_dates.append(record[0])
+
+    allocation = None
+
+    # A checkpoint from after end_date, such as one of today when only the
+    # days up to yesterday are wanted, can't be carried on from.
+    if checkpoint != None and checkpoint[0] <= end_date:
+        checkpoint_date = checkpoint[0]
+        allocation = goal_allocation_from_json(checkpoint[1])
+
+    # A checkpoint of different goals, or saved with a different 
+    # GOAL_SHARE_SCALE, is shared out again from the start.
+    if (allocation == None 
+        or allocation.get("share_scale") != GOAL_SHARE_SCALE
+        or allocation["no_of_goals"] != len(goal_records)):
+        allocation = new_goal_allocation(goal_records)
+        allocation["open_profit"] = 0
+
+        if len(started_goal_dates) != 0:
+            checkpoint_date = started_goal_dates[0] - 1
+
+    if len(started_goal_dates) != 0:
+        # Each goal date which has started begins an interval which runs 
+        # until the day before the next goal date or until end_date. The 
+        # interval which was still going at the checkpoint carries on from
+        # its profit so far, and the later goal dates begin the intervals 
+        # which have started since.
+        later_goal_dates = started_goal_dates[
+            allocation["no_of_intervals"] + 1:]
+        profit_between_dates = [allocation["open_profit"]]
+
+        # The profit after the checkpoint of every interval is found with 
+        # one query.
+        if checkpoint_date == end_date:
+            new_profits = []
+
+        elif (len(later_goal_dates) != 0 
+              and later_goal_dates[0] == checkpoint_date + 1):
+            new_profits = [0] + retrieve_profit_between_dates(
+                later_goal_dates, end_date)
+
+        else:
+            new_profits = retrieve_profit_between_dates(
+                [checkpoint_date + 1] + later_goal_dates, end_date)
+
+        for i, profit in enumerate(new_profits):
+            if i == 0:
+                profit_between_dates[0] += profit
+
+            else:
+                profit_between_dates.append(profit)
+
+        # Every interval but the last has ended, so they are shared out.
+        continue_goal_allocation(allocation, goal_records, 
+                                 profit_between_dates[:-1])
+        allocation["open_profit"] = profit_between_dates[-1]
+
+    goal_allocation = [allocation, started_goal_dates]
+
+    return goal_allocation
+
+
+def move_goal_checkpoint():
+    """
+    move_goal_checkpoint moves the checkpoint in the GoalCheckpoint table on
+    to the end of yesterday with goal_allocation_until, in a transaction so
+    no change can be made to the records between reading the checkpoint 
+    and saving it again. Only days which have ended are kept in the 
+    checkpoint, so adding, changing or deleting a record dated today, as 
+    most records are, doesn't delete it.
+
+    Nothing is written if the checkpoint is already of yesterday or no goal
+    had started by then, so the write lock is only taken about once a day 
+    or after the checkpoint has been deleted. The lock isn't waited for 
+    either: if another program is changing the database the checkpoint is 
+    left as it is, to be moved on next time.
+
+    Parameters  :
+
+    Returns     :   is_moved : bool
+                        True if the checkpoint was moved on.
+    """
+    yesterday = date_to_day_number(datetime.date.today()) - 1
+
+    with reader() as read_cursor:
+        read_cursor.execute(GOAL_CHECKPOINT_QUERY)
+        checkpoint = read_cursor.fetchone()
+
+        read_cursor.execute(FIRST_GOAL_DATE_QUERY)
+        first_goal_date = read_cursor.fetchone()[0]
+
+    if ((checkpoint != None and checkpoint[0] == yesterday)
+        or first_goal_date == None or first_goal_date > yesterday):
+        return False
+
+    busy_timeout = db.execute('''PRAGMA busy_timeout''').fetchone()[0]
+    db.execute('''PRAGMA busy_timeout = 0''')
+
+    try:
+        with transaction():
+            with reader() as read_cursor:
+                read_cursor.execute(GOALS_QUERY)
+                goal_records = read_cursor.fetchall()
+
+                read_cursor.execute(GOAL_CHECKPOINT_QUERY)
+                checkpoint = read_cursor.fetchone()
+
+            [allocation, started_goal_dates] = goal_allocation_until(
+                goal_records, checkpoint, yesterday)
+
+            cursor.execute(SAVE_GOAL_CHECKPOINT_QUERY, 
+                           (yesterday, goal_allocation_to_json(allocation)))
+
+    # The database is locked by another program, or can't be changed.
+    except sqlite3.OperationalError:
+        return False
+
+    finally:
+        db.execute(f'''PRAGMA busy_timeout = {busy_timeout}''')
+
+    return True
+
+
+def calculate_goal_progress(move_checkpoint = True):
+    """
+    calculate_goal_progress fetches the goals from the Goals table, finds 
+    the profit made between each of the goal start dates up to today using
+    retrieve_profit_between_dates and shares it out between the goals using
+    continue_goal_allocation.
+
+    Rather than sharing out the whole history every time, it carries on 
+    from the checkpoint in the GoalCheckpoint table with 
+    goal_allocation_until, which holds the state of the sharing out up to
+    the end of yesterday, so only today's profit is found. The checkpoint 
+    is first moved on with move_goal_checkpoint if it is behind. The 
+    progress itself is only read, with reader(), so it can be viewed while
+    another program is changing the database. The triggers made by 
+    create_goal_checkpoint delete the checkpoint whenever a record dated on
+    or before it, or a goal, is added, changed or deleted, in which case 
+    the whole history is shared out again.
+
+    Parameters  :   move_checkpoint : bool
+                        If True the checkpoint is moved on first. The JSON 
+                        service moves it on its writer thread instead.
+
+    Returns     :   goal_progress : list
+                        A list in the format [original_goal_records, 
+                        current_progress_records] where both are lists of
+                        goal records in the format [date, amount, 
+                        description, id] in date order. The amounts of the
+                        current_progress_records are the amounts left to 
+                        save. 
+    """
+    # The goals are shared out using the day numbers of their dates, which
+    # are only converted back to dates for the records shown to the user.
+    today = date_to_day_number(datetime.date.today())
+
+    if move_checkpoint:
+        move_goal_checkpoint()
+
+    # The goals are read before the checkpoint, so a goal added in between
+    # has already deleted the checkpoint.
+    with reader() as read_cursor:
+        read_cursor.execute(GOALS_QUERY)
+        goal_records = read_cursor.fetchall()
+
+        read_cursor.execute(GOAL_CHECKPOINT_QUERY)
+        checkpoint = read_cursor.fetchone()
+
+    goal_records_original = []
+
+    for record in goal_records:
+        goal_records_original.append([day_number_to_date(record[0]), 
+                                      record[1], record[2], record[3]])
+
+    [allocation, started_goal_dates] = goal_allocation_until(
+        goal_records, checkpoint, today)
+
+    # The interval which is still going today is only shared out for this
+    # view.
+    if len(started_goal_dates) != 0:
+        continue_goal_allocation(allocation, goal_records, 
+                                 [allocation["open_profit"]])
+
+    current_progress_records = goal_amounts_left(allocation, goal_records)
+
+    goal_progress = [goal_records_original, current_progress_records]
+
+    return goal_progress
+
+
+def display_goal_progress(original_goal_records, current_progress_records):
+    """
+    display_goal_progress calculates how far the user has gotten in achieving
+    their goals. It takes the current progress and compares it to the original
+    goal. Depending on the progress, the function gives a message to the user
+    detailing their progress.
+
+    Parameters  :   original_goal_records : list
+                        A list containing all the original records of the 
+                        goals. The records are in the format [date, amount,
+                        description, id].
+                    current_progress_records : list
+                        A list containing all the progress of the goals to
+                        today. The records are in the format [date, amount,
+                        description, id].
+
+    Returns     :
+    """    
+    # The current amount of each goal by its I.D.
+    current_amounts = {}
+    
+    for record in current_progress_records:
+        current_amounts[record[3]] = record[1]
+
+    for i in range(len(original_goal_records)):
+        original_id = original_goal_records[i][3]
+
+        date_ = original_goal_records[i][0]
+        original_amount = original_goal_records[i][1]
+        description = original_goal_records[i][2]
+
+        current_amount = current_amounts[original_id]
+
+        # Find the amount 
+        amount_difference = abs(original_amount - current_amount)
+        difference_percentage = (amount_difference/original_amount) * 100
+        difference_percentage = round(difference_percentage,1)
+
+        # Convert the amounts in pence to pounds to 2 decimal places. 
+        original_amount_str =  format_pounds(original_amount)
+        current_amount_str = format_pounds(current_amount)
+        amount_difference_str = format_pounds(amount_difference)
+            
+
+
+        print("\n\nGoal Description:\n-----------------\n")
+        print("\'" + description + "\'\n")
+        
+        # Inform the user how their goal is going
+        if original_amount < current_amount:
+
+            print("Unfortunately it seems as though you have been spending"
+                + f" too much!\nThis goal was set on {date_} with a goal"
+                + f" of £{original_amount_str} but today the \ngoal is now £"
+                + f"{current_amount_str}. Don't worry, you can \nget back on"
+                + "track!")
+            
+        elif difference_percentage == 0:
+
+            print("We are just getting started!\nLet\'s get to saving!\n"
+                + f"This goal was set on {date_} to save £"
+                + f"{original_amount_str}.\nWe haven't saved any yet, but I "
+                + "believe in you!") 
+
+
+        elif difference_percentage < 50:
+
+            print("We are off to a really strong start!\nThis goals was set "
+                + f"on {date_} and you have already \nmanaged to "
+                + f"save £{amount_difference_str} of £{original_amount_str}."
+                + f"\nThat\'s {difference_percentage}% of the way there!\n")
+            
+        elif difference_percentage >= 50 and difference_percentage < 100: 
+            print("Incredible!\nWe are almost there!\nThis goal was set on"
+                  + f"{date_} and you have managed \nto save a whopping "
+                  + f"{difference_percentage}%.\nThat's right you have saved"
+                  + f"£{amount_difference_str} of £{original_amount_str}."
+                  + "\nThe end is in sight!")
+            
+        elif difference_percentage == 100:
+            print("Holy Moly!!!!!\nYou\'ve only gone and done it!\nYou have"
+                + f"saved the full £{original_amount_str}.\nI bet that feels"
+                + "good!")
+    
+
+        
+
+
+def check_argument_count(words, no_of_arguments, usage):
+    """
+    check_argument_count checks that a batch command has been given the 
+    right number of arguments.
+
+    Parameters  :   words : list
+                        The command followed by its arguments.
+                    no_of_arguments : list
+                        The numbers of arguments the command can take.
+                    usage : str
+                        How the command should be written, shown to the user
+                        if the number of arguments is wrong.
+
+    Returns     :
+
+    Raises      :   ValueError
+                        If the command has the wrong number of arguments.
+    """
+    if len(words) - 1 not in no_of_arguments:
+        raise ValueError(f"Usage: {usage}")
+
+
+def check_id(id_):
+    """
+    check_id checks that an I.D. given in a batch command is an integer.
+
+    Parameters  :   id_ : str
+                        The I.D. to be checked.
+
+    Returns     :   id_ : int
+                        The I.D. as an integer.
+
+    Raises      :   ValueError
+                        If the I.D. is not an integer.
+    """
+    try:
+        return int(id_)
+    
+    except ValueError:
+        raise ValueError(f"\'{id_}\' is not an I.D.")
+
+
+def run_command(words):
+    """
+    run_command carries out a single batch command without asking the user
+    for any input or confirmation. The arguments are checked with the same
+    rules used when asking the user for them. The commands are:
+
+        add TABLE DATE AMOUNT CATEGORY DESCRIPTION
+        view TABLE START_DATE END_DATE [CATEGORY]
+        totals TABLE START_DATE END_DATE [CATEGORY]
+        summary TABLE START_DATE END_DATE PERIOD [CATEGORY]
+        update TABLE ID DATE AMOUNT CATEGORY DESCRIPTION
+        delete TABLE ID
+        rename-category TABLE CATEGORY NEW_CATEGORY
+        delete-category TABLE CATEGORY
+        budget set CATEGORY AMOUNT
+        budget view
+        budget report START_DATE END_DATE
+        goal add DATE AMOUNT DESCRIPTION
+        goal progress
+
+    where TABLE is Income or Expenses and PERIOD is day, week, month or 
+    year.
+
+    Parameters  :   words : list
+                        The command followed by its arguments.
+
+    Returns     :
+
+    Raises      :   ValueError
+                        If the command or any of its arguments are not valid.
+    """
+    if len(words) == 0:
+        raise ValueError("No command was given.")
+
+    command = words[0].lower()
+
+    if command == "add":
+        check_argument_count(words, [5], "add TABLE DATE AMOUNT CATEGORY "
+                             + "DESCRIPTION")
+        table_name = validate_table_name(words[1])
+        record_data = [validate_date(words[2]), validate_amount(words[3]),
+                       validate_category(words[4]), 
+                       validate_description(words[5])]
+
+        add_to_table(table_name, record_data, "no")
+
+    elif command == "view" or command == "totals":
+        check_argument_count(words, [3, 4], f"{command} TABLE START_DATE "
+                             + "END_DATE [CATEGORY]")
+        table_name = validate_table_name(words[1])
+        date_range = validate_date_range(words[2], words[3])
+        
+        if len(words) == 5:
+            category = validate_category(words[4])
+
+        else:
+            category = None
+
+        totals = retrieve_totals(table_name, date_range[0], date_range[1],
+                                 category)
+
+        if command == "view" and totals[1] != 0:
+            records = stream_income_expense(table_name, date_range[0],
+                                            date_range[1], category)
+            display_as_table(table_name, records)
+
+        display_total(table_name, totals, date_range, category)
+
+    elif command == "summary":
+        check_argument_count(words, [4, 5], "summary TABLE START_DATE "
+                             + "END_DATE PERIOD [CATEGORY]")
+        table_name = validate_table_name(words[1])
+        date_range = validate_date_range(words[2], words[3])
+        period = validate_period(words[4])
+
+        if len(words) == 6:
+            category = validate_category(words[5])
+
+        else:
+            category = None
+
+        totals = retrieve_totals(table_name, date_range[0], date_range[1],
+                                 category)
+
+        if totals[1] != 0:
+            period_totals = retrieve_period_totals(table_name, 
+                date_range[0], date_range[1], period, category)
+            display_as_table("Periods", period_totals)
+
+        display_total(table_name, totals, date_range, category)
+
+    elif command == "update":
+        check_argument_count(words, [6], "update TABLE ID DATE AMOUNT "
+                             + "CATEGORY DESCRIPTION")
+        table_name = validate_table_name(words[1])
+        new_record = [validate_date(words[3]), validate_amount(words[4]),
+                      validate_category(words[5]), 
+                      validate_description(words[6]), check_id(words[2])]
+
+        if not update_record_by_id(table_name, new_record):
+            raise ValueError(f"There is no record with the I.D. {words[2]}.")
+        
+        print("This record has now been changed to:")
+        display_as_table(table_name, new_record)
+
+    elif command == "delete":
+        check_argument_count(words, [2], "delete TABLE ID")
+        table_name = validate_table_name(words[1])
+
+        if not delete_record_by_id(table_name, check_id(words[2])):
+            raise ValueError(f"There is no record with the I.D. {words[2]}.")
+        
+        print(f"Record {words[2]} has been deleted from the {table_name} "
+              + "table.")
+
+    elif command == "rename-category" or command == "delete-category":
+        if command == "rename-category":
+            check_argument_count(words, [3], "rename-category TABLE "
+                                 + "CATEGORY NEW_CATEGORY")
+            new_category = validate_category(words[3])
+            
+        else:
+            check_argument_count(words, [2], "delete-category TABLE "
+                                 + "CATEGORY")
+            new_category = "Misc"
+
+        table_name = validate_table_name(words[1])
+        original_category = validate_category(words[2])
+
+        update_category(table_name, original_category, new_category)
+
+        print(f"All records in the \'{original_category}\' are now in the \'"
+              + f"{new_category}\' category.")
+
+    elif command == "budget":
+        if len(words) > 1 and words[1].lower() == "set":
+            check_argument_count(words, [3], "budget set CATEGORY AMOUNT")
+            category = validate_category(words[2])
+            budget = validate_amount(words[3])
+
+            set_budget(category, budget)
+
+            print(f"\'{category}\' now has a weekly budget of £"
+                  + f"{format_pounds(budget)}.")
+
+        elif len(words) > 1 and words[1].lower() == "view":
+            check_argument_count(words, [1], "budget view")
+
+            cursor.execute(BUDGETS_QUERY)
+            budget_records = cursor.fetchall()
+
+            if len(budget_records) != 0:
+                display_as_table("Budget", budget_records)
+
+        elif len(words) > 1 and words[1].lower() == "report":
+            check_argument_count(words, [3], "budget report START_DATE "
+                                 + "END_DATE")
+            date_range = validate_date_range(words[2], words[3])
+
+            budget_report = retrieve_budget_report(date_range[0], 
+                                                   date_range[1])
+            display_budget_report(budget_report, date_range)
+
+        else:
+            raise ValueError("Usage: budget set CATEGORY AMOUNT | budget view"
+                             + " | budget report START_DATE END_DATE")
+
+    elif command == "goal":
+        if len(words) > 1 and words[1].lower() == "add":
+            check_argument_count(words, [4], "goal add DATE AMOUNT "
+                                 + "DESCRIPTION")
+            goal_record_data = [validate_date(words[2]), 
+                                validate_amount(words[3]),
+                                validate_description(words[4])]
+            
+            add_to_table("Goals", goal_record_data, "no")
+
+        elif len(words) > 1 and words[1].lower() == "progress":
+            check_argument_count(words, [1], "goal progress")
+
+            [goal_records_original, goal_records] = calculate_goal_progress()
+
+            display_goal_progress(goal_records_original, goal_records)
+
+        else:
+            raise ValueError("Usage: goal add DATE AMOUNT DESCRIPTION | goal"
+                             + " progress")
+
+    else:
+        raise ValueError(f"\'{words[0]}\' is not a recognised command.")
+
+
+def run_commands(command_lines):
+    """
+    run_commands carries out a batch command from each line using 
+    run_command. The arguments on each line are split up in the same way as
+    a shell would, so arguments with spaces in them can be put in quotation
+    marks. Blank lines and lines starting with # are skipped. If a command 
+    is not valid, or the database can't be changed (such as when another 
+    program has kept it locked for too long), the user is told why and the
+    remaining commands are still carried out.
+
+    Parameters  :   command_lines : iterable
+                        The lines of commands, such as the lines of a file.
+
+    Returns     :   no_of_failed : int
+                        The number of commands which were not valid or 
+                        could not be carried out.
+    """
+    no_of_failed = 0
+
+    # Each command makes its changes in its own transaction, which is 
+    # committed as soon as the command is done. No transaction is left open
+    # while the next line is read, so a slow source of commands (such as a 
+    # pipe) never keeps the database locked, and a command which fails 
+    # can't undo the commands before it which have been carried out.
+    for line_number, line in enumerate(command_lines, start = 1):
+        try:
+            words = shlex.split(line, comments = True)
+
+            if len(words) != 0:
+                run_command(words)
+
+        except ValueError as e:
+            print(f"Line {line_number}: {e}")
+            no_of_failed += 1
+
+        except sqlite3.Error as e:
+            print(f"Line {line_number}: The database could not be used, {e}.")
+            no_of_failed += 1
+
+    return no_of_failed
+
+
+def create_daily_totals():
+    """
+    create_daily_totals creates the DailyTotals table if it doesn't exist 
+    along with the triggers which keep it up to date. DailyTotals holds the
+    total, number, smallest and largest amount of the records of each day 
+    and category in the Income and Expenses tables, so reports over a date
+    range only need to read one row per day and category. 
+
+    The triggers keep it correct whenever a record is added, updated or 
+    deleted, including when a category is merged or deleted. When a record
+    is removed from a day and category which had it as its smallest or 
+    largest amount, the new smallest and largest amounts are found using 
+    the date and category index.
+
+    Parameters  :
+
+    Returns     :   is_new : bool
+                        True if the DailyTotals table has just been created,
+                        in which case it needs to be filled using 
+                        rebuild_daily_totals.
+    """
+    cursor.execute('''SELECT name FROM sqlite_master 
+                   WHERE type = ? AND name = ?''', ("table", "DailyTotals"))
+    is_new = cursor.fetchone() == None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS
+        DailyTotals( table_name TEXT, date INTEGER, category_id INTEGER, 
+            total INTEGER, count INTEGER, smallest_amount INTEGER, 
+            largest_amount INTEGER,
+            PRIMARY KEY(table_name, date, category_id)) WITHOUT ROWID
+    ''')
+
+    for table_name in ["Income", "Expenses"]:
+        # Adds the NEW record to the totals of its day and category.
+        add_new_record = f'''
+            INSERT INTO DailyTotals(table_name, date, category_id, total, 
+                count, smallest_amount, largest_amount)
+            VALUES('{table_name}', NEW.date, NEW.category_id, NEW.amount, 1, 
+                NEW.amount, NEW.amount)
+            ON CONFLICT(table_name, date, category_id) DO UPDATE SET 
+                total = total + excluded.total, count = count + 1,
+                smallest_amount = MIN(smallest_amount, 
+                    excluded.smallest_amount),
+                largest_amount = MAX(largest_amount, 
+                    excluded.largest_amount);'''
+
+        # The smallest and largest amounts left on the day and category of
+        # the OLD record.
+        smallest_amount = DAY_AMOUNT_QUERY.format(aggregate = "MIN", 
+            table_name = table_name, date = "OLD.date", 
+            category_id = "OLD.category_id")
+        largest_amount = DAY_AMOUNT_QUERY.format(aggregate = "MAX", 
+            table_name = table_name, date = "OLD.date", 
+            category_id = "OLD.category_id")
+
+        # Takes the OLD record away from the totals of its day and category.
+        remove_old_record = f'''
+            UPDATE DailyTotals SET total = total - OLD.amount, 
+                count = count - 1
+            WHERE table_name = '{table_name}' AND date = OLD.date 
+                AND category_id = OLD.category_id;
+            DELETE FROM DailyTotals 
+            WHERE table_name = '{table_name}' AND date = OLD.date 
+                AND category_id = OLD.category_id AND count = 0;
+            UPDATE DailyTotals SET 
+                smallest_amount = ({smallest_amount}),
+                largest_amount = ({largest_amount})
+            WHERE table_name = '{table_name}' AND date = OLD.date 
+                AND category_id = OLD.category_id 
+                AND (OLD.amount <= smallest_amount 
+                     OR OLD.amount >= largest_amount);'''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_insert_daily_totals
+            AFTER INSERT ON {table_name}
+            BEGIN {add_new_record} END''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_delete_daily_totals
+            AFTER DELETE ON {table_name}
+            BEGIN {remove_old_record} END''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_update_daily_totals
+            AFTER UPDATE OF date, amount, category_id ON {table_name}
+            BEGIN {remove_old_record} {add_new_record} END''')
+
+    return is_new
+
+
+def rebuild_daily_totals():
+    """
+    rebuild_daily_totals empties the DailyTotals table and adds up the 
+    totals of each day and category again from the Income and Expenses 
+    tables. This fills the table when it is first created and corrects it 
+    if it has ever drifted from the records.
+
+    Parameters  :
+
+    Returns     :
+    """
+    # The table is emptied and filled in one transaction so the totals are
+    # never seen part way through being rebuilt.
+    with transaction():
+        cursor.execute('''DELETE FROM DailyTotals''')
+
+        for table_name in ["Income", "Expenses"]:
+            cursor.execute(f'''
+                INSERT INTO DailyTotals(table_name, date, category_id, 
+                    total, count, smallest_amount, largest_amount)
+                SELECT '{table_name}', date, category_id, SUM(amount), 
+                    COUNT(*), MIN(amount), MAX(amount)
+                FROM {table_name} GROUP BY date, category_id''')
+
+
+def create_indexes(indexes):
+    """
+    create_indexes makes sure every index in a list of indexes exists in 
+    the database with the columns it is defined with. If an index is 
+    missing it is created and if an index with the same name was created 
+    with different columns or uniqueness by an earlier migration it is 
+    dropped and created again. A unique index can only be created once the
+    table has no two records with the same values in its columns.
+
+    Parameters  :   indexes : list
+                        The indexes in the form [index name, table name, 
+                        columns, is unique], such as INDEXES.
+
+    Returns     :   changed_indexes : list
+                        The names of the indexes which have been created
+                        or recreated.
+    """
+    changed_indexes = []
+
+    for [index_name, table_name, columns, is_unique] in indexes:
+        if is_unique:
+            index_sql = (f"CREATE UNIQUE INDEX {index_name} "
+                         + f"ON {table_name}({columns})")
+            
+        else:
+            index_sql = f"CREATE INDEX {index_name} ON {table_name}({columns})"
+
+        cursor.execute('''SELECT sql FROM sqlite_master 
+                       WHERE type = 'index' AND name = ?''', (index_name,))
+        existing_index = cursor.fetchone()
+
+        if existing_index != None and existing_index[0] == index_sql:
+            continue
+
+        if existing_index != None:
+            cursor.execute(f'''DROP INDEX {index_name}''')
+
+        cursor.execute(index_sql)
+        changed_indexes.append(index_name)
+
+    return changed_indexes
+
+
+def check_query_plans():
+    """
+    check_query_plans asks SQLite how it would run each of the queries the
+    app issues using EXPLAIN QUERY PLAN. Any query which would scan a whole
+    table or sort its results without an index is collected and returned.
+
+    Parameters  :
+
+    Returns     :   unindexed_queries : list
+                        A list of [query, plan detail] for every query which
+                        does not use an index. The list is empty if every
+                        query uses an index.
+    """
+    # Each query is in the form [query, example parameters]. The queries 
+    # are made with the same constants and functions the app uses, so the
+    # queries checked are always the ones the app issues.
+    queries = []
+
+    for table_name in ["Income", "Expenses"]:
+        # The range searches and pages of retrieve_income_expense and 
+        # retrieve_page and the totals of retrieve_totals and 
+        # retrieve_period_totals, with and without a category.
+        example_keys = {None: [2460325, 1, 1000, "Example", 1],
+                        "Misc": [2460325, 1000, "Example", 1]}
+
+        for category, example_key in example_keys.items():
+            queries += [
+                income_expense_query(table_name, "2024-01-01", "2024-01-31", 
+                                     category),
+                income_expense_query(table_name, "2024-01-01", "2024-01-31", 
+                    category, example_key, "next", RECORD_DISPLAY_LIMIT),
+                income_expense_query(table_name, "2024-01-01", "2024-01-31", 
+                    category, example_key, "previous", RECORD_DISPLAY_LIMIT),
+                totals_query(table_name, "2024-01-01", "2024-01-31", category)
+            ]
+
+            for period in PERIOD_BUCKETS:
+                queries.append(totals_query(table_name, "2024-01-01", 
+                                            "2024-01-31", category, period))
+
+        queries += [
+            ledger_columns_query(table_name, "2024-01-01", "2024-01-31"),
+            ledger_columns_query(table_name),
+            [CATEGORIES_QUERY.format(table_name = table_name), 
+             (table_name,)],
+            [CATEGORY_HAS_RECORDS_QUERY.format(table_name = table_name), 
+             ("Misc",)],
+            [CATEGORY_KEY_QUERY, (table_name, "Misc")],
+            [CATEGORY_PAIR_QUERY, (table_name, "Misc", "Misc")],
+            [CATEGORY_NAMES_QUERY, (table_name,)],
+            [RECORD_BY_ID_QUERY.format(table_name = table_name), (1,)],
+            [UPDATE_RECORD_QUERY.format(table_name = table_name), 
+             (2460311, 1000, "Misc", "Example", bytes(16), 1)],
+            [DELETE_RECORD_QUERY.format(table_name = table_name), (1,)],
+            [MOVE_CATEGORY_QUERY.format(table_name = table_name), (1, 2)],
+            [COUNT_IMPORTED_RECORDS_QUERY.format(table_name = table_name,
+                no_in_table = CONTENT_HASH_COUNT.format(
+                    table_name = table_name)), ()],
+            [DAY_AMOUNT_QUERY.format(aggregate = "MIN", 
+                table_name = table_name, date = "?", category_id = "?"), 
+             (2460311, 1)]
+        ]
+
+    queries += [
+        [BUDGET_QUERY, ("Misc",)],
+        [BUDGETS_QUERY, ()],
+        [GOALS_QUERY, ()],
+        [COUNT_IMPORTED_RECORDS_QUERY.format(table_name = "Goals", 
+                                             no_in_table = GOAL_COUNT), ()],
+        [SKIPPED_RECORDS_QUERY, ("Income",)],
+        [FIRST_GOAL_DATE_QUERY, ()],
+        [GOAL_CHECKPOINT_QUERY, ()],
+        [PROFIT_BETWEEN_DATES_QUERY, ('[[2460311, 2460341]]',)],
+        [BUDGET_REPORT_QUERY, (2460311, 2460341, 30)],
+        [SCHEMA_VERSION_QUERY, ()]
+    ]
+
+    # The tables used by import_csv are only made when they are first 
+    # needed.
+    cursor.execute(IMPORTED_RECORDS_TABLE_QUERY)
+    cursor.execute(CHUNK_RECORDS_TABLE_QUERY)
+    cursor.execute('''SELECT name FROM sqlite_master WHERE type = ?''', 
+                   ("table",))
+    table_names = [name for (name,) in cursor.fetchall()]
+
+    unindexed_queries = []
+
+    for [query, parameters] in queries:
+        cursor.execute("EXPLAIN QUERY PLAN " + query, parameters)
+
+        for plan_row in cursor.fetchall():
+            detail = plan_row[-1]
+
+            # A SCAN of a table without USING reads every row of the table
+            # and a TEMP B-TREE FOR ORDER BY means the results are sorted
+            # after being read. Scans of the intermediate results of a 
+            # query (such as the intervals of PROFIT_BETWEEN_DATES_QUERY)
+            # are not reading a table so are allowed, as are scans of the 
+            # Budget table which only has one row for each category and is 
+            # read in full by BUDGET_REPORT_QUERY.
+            if ((detail.startswith("SCAN") and "USING" not in detail
+                 and detail.split()[1] in table_names
+                 and detail.split()[1] != "Budget")
+                or "USE TEMP B-TREE FOR ORDER BY" in detail):
+                unindexed_queries.append([" ".join(query.split()), detail])
+
+    return unindexed_queries
+
+
+def migrate_categories():
+    """
+    migrate_categories moves the categories of the Income and Expenses 
+    tables of a database made by an older version of the app, where each 
+    record held the name of its category, into the Categories table. Each
+    table is made again with the ID of the category in place of its name,
+    keeping the I.D. of every record. These databases also held amounts in
+    pounds and dates as text, so the amounts are converted to pence and the
+    dates to day numbers at the same time. The 
+    DailyTotals table, which was also kept by category name, is dropped so 
+    that it is made and filled again.
+
+    Parameters  :
+
+    Returns     :   is_migrated : bool
+                        True if either table has been migrated.
+    """
+    is_migrated = False
+
+    for table_name in ["Income", "Expenses"]:
+        cursor.execute('''SELECT name FROM pragma_table_info(?)''', 
+                       (table_name,))
+        column_names = [name for (name,) in cursor.fetchall()]
+
+        if "category" not in column_names:
+            continue
+
+        cursor.execute(f'''INSERT OR IGNORE INTO Categories(table_name, name)
+                       SELECT DISTINCT '{table_name}', category 
+                       FROM {table_name}''')
+
+        cursor.execute(f'''CREATE TABLE {table_name}_migrated(
+                       {INCOME_EXPENSE_COLUMNS})''')
+        cursor.execute(f'''
+            INSERT INTO {table_name}_migrated(id, date, amount, category_id, 
+                description)
+            SELECT {table_name}.id, CAST(julianday(date) + 0.5 AS INTEGER), 
+                CAST(ROUND(amount * 100) AS INTEGER), Categories.id, 
+                description 
+            FROM {table_name} JOIN Categories 
+            ON Categories.table_name = '{table_name}' 
+            AND Categories.name = {table_name}.category''')
+
+        # Dropping the old table also drops its indexes and triggers, which
+        # are made again for the new table.
+        cursor.execute(f'''DROP TABLE {table_name}''')
+        cursor.execute(f'''ALTER TABLE {table_name}_migrated 
+                       RENAME TO {table_name}''')
+        is_migrated = True
+
+    if is_migrated:
+        cursor.execute('''DROP TABLE IF EXISTS DailyTotals''')
+
+    return is_migrated
+
+
+def migrate_columns():
+    """
+    migrate_columns converts the columns of a database made by an older 
+    version of the app, where amounts were held in pounds in REAL columns 
+    and dates as text in DATE columns, to whole numbers of pence and day 
+    numbers. Each table with any of these columns is made again once with 
+    all of them converted, keeping the I.D. of every record. The 
+    DailyTotals table is dropped so that it is made and filled again from 
+    the converted records.
+
+    Parameters  :
+
+    Returns     :   is_migrated : bool
+                        True if any table has been migrated.
+    """
+    table_columns = {"Income": INCOME_EXPENSE_COLUMNS,
+                     "Expenses": INCOME_EXPENSE_COLUMNS,
+                     "Budget": BUDGET_COLUMNS,
+                     "Goals": GOALS_COLUMNS}
+    # How each column is converted in the form 
+    # {(column name, old type): conversion}.
+    conversions = {
+        ("amount", "REAL"): "CAST(ROUND(amount * 100) AS INTEGER)",
+        ("budget", "REAL"): "CAST(ROUND(budget * 100) AS INTEGER)",
+        ("date", "DATE"): "CAST(julianday(date) + 0.5 AS INTEGER)"
+    }
+    is_migrated = False
+
+    for table_name, columns in table_columns.items():
+        cursor.execute('''SELECT name, type FROM pragma_table_info(?)''', 
+                       (table_name,))
+        column_types = cursor.fetchall()
+
+        if not any(column in conversions for column in column_types):
+            continue
+
+        column_names = ", ".join(name for (name, _) in column_types)
+        selected_columns = ", ".join(conversions.get((name, type_), name)
+                                     for (name, type_) in column_types)
+
+        cursor.execute(f'''CREATE TABLE {table_name}_migrated({columns})''')
+        cursor.execute(f'''
+            INSERT INTO {table_name}_migrated({column_names})
+            SELECT {selected_columns} FROM {table_name}''')
+
+        # Dropping the old table also drops its indexes and triggers, which
+        # are made again for the new table.
+        cursor.execute(f'''DROP TABLE {table_name}''')
+        cursor.execute(f'''ALTER TABLE {table_name}_migrated 
+                       RENAME TO {table_name}''')
+        is_migrated = True
+
+    if is_migrated:
+        cursor.execute('''DROP TABLE IF EXISTS DailyTotals''')
+
+    return is_migrated
+
+
+def create_tables():
+    """
+    create_tables creates each of the app's tables if they don't exist. It
+    is the first migration of MIGRATIONS, so it also brings a database made
+    before schema versions were kept up to date: the categories of an older
+    database are moved into the Categories table with migrate_categories 
+    and amounts held in pounds and dates held as text are converted to 
+    pence and day numbers with migrate_columns.
+
+    Parameters  :
+
+    Returns     :
+    """
+    # Create a table called 'Categories' if it doesn't exist. It holds
+    # the name of each category of the Income and Expenses tables.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS
+        Categories( id INTEGER PRIMARY KEY, table_name TEXT NOT NULL, 
+            name TEXT NOT NULL, UNIQUE(table_name, name))
+                ''')
+
+    # Create a table called 'Income' if it doesn't exist.
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS 
+        Income( {INCOME_EXPENSE_COLUMNS})
+                ''')
+
+    # Create  a table called 'Expenses' if it doesn't exist.
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS
+        Expenses( {INCOME_EXPENSE_COLUMNS})
+                   ''')
+
+    # Move the categories of a database made before the Categories 
+    # table existed into it.
+    migrate_categories()
+
+    # Create a table called 'Budget" if it doesn't exist
+    # The Budget table will hold the weekly budget for the categories in 
+    # Expenses. 
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS
+        Budget( {BUDGET_COLUMNS})
+''')
+
+    # Create a table called "Goals" if it doesn't exist
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS
+        Goals( {GOALS_COLUMNS})
+''')
+
+    # Convert the amounts and dates of a database made when amounts were
+    # held in pounds and dates as text to pence and day numbers.
+    migrate_columns()
+
+
+def add_daily_totals():
+    """
+    add_daily_totals is the migration which creates the DailyTotals table 
+    and its triggers with create_daily_totals, filling the table from the 
+    records with rebuild_daily_totals if it is new.
+
+    Parameters  :
+
+    Returns     :
+    """
+    if create_daily_totals():
+        rebuild_daily_totals()
+
+
+def create_goal_checkpoint():
+    """
+    create_goal_checkpoint is the migration which creates the 
+    GoalCheckpoint table used by calculate_goal_progress, along with the 
+    triggers which delete the checkpoint when it is no longer right. The 
+    checkpoint is deleted when an income or expense dated on or before the
+    checkpoint date is added or deleted, or has its date or amount changed
+    to or from such a date, and whenever a goal is added, changed or 
+    deleted. Records dated after the checkpoint don't affect it, which 
+    includes every record dated today as the checkpoint is only ever of 
+    the days up to yesterday, see move_goal_checkpoint.
+
+    Parameters  :
+
+    Returns     :
+    """
+    # The table only ever holds the one checkpoint, with the I.D. 1.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS
+        GoalCheckpoint( id INTEGER PRIMARY KEY CHECK (id = 1), 
+            checkpoint_date INTEGER NOT NULL, allocation TEXT NOT NULL)
+    ''')
+
+    checkpoint_date = '''(SELECT checkpoint_date FROM GoalCheckpoint 
+        WHERE id = 1)'''
+
+    for table_name in ["Income", "Expenses"]:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_insert_goal_checkpoint
+            AFTER INSERT ON {table_name}
+            WHEN NEW.date <= {checkpoint_date}
+            BEGIN DELETE FROM GoalCheckpoint; END''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_delete_goal_checkpoint
+            AFTER DELETE ON {table_name}
+            WHEN OLD.date <= {checkpoint_date}
+            BEGIN DELETE FROM GoalCheckpoint; END''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_update_goal_checkpoint
+            AFTER UPDATE OF date, amount ON {table_name}
+            WHEN OLD.date <= {checkpoint_date} 
+            OR NEW.date <= {checkpoint_date}
+            BEGIN DELETE FROM GoalCheckpoint; END''')
+
+    for action in ["INSERT", "DELETE", "UPDATE"]:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS Goals_{action.lower()}_goal_checkpoint
+            AFTER {action} ON Goals
+            BEGIN DELETE FROM GoalCheckpoint; END''')
+
+
+def add_indexes():
+    """
+    add_indexes is the migration which creates the indexes in INDEXES with
+    create_indexes.
+
+    Parameters  :
+
+    Returns     :
+    """
+    create_indexes(INDEXES)
+
+
+def add_content_hashes():
+    """
+    add_content_hashes is the migration which adds the content_hash column
+    to the Income and Expenses tables, if they don't have it already, and 
+    works out the content hash of each record which doesn't have one. The 
+    unique indexes of UNIQUE_CONTENT_HASH_INDEXES are then created with 
+    create_indexes. Records which were added more than once before the 
+    hashes were kept are not deleted, only the first of them, by I.D., is
+    given the hash and the others are left without one. The hash is worked
+    out here as content_hash did when this migration was released, from 
+    the date, amount, category name and description, so the migration 
+    always does the same thing; allow_repeated_records then works out 
+    every hash again.
+
+    Parameters  :
+
+    Returns     :
+    """
+    for table_name in ["Income", "Expenses"]:
+        cursor.execute('''SELECT name FROM pragma_table_info(?)''', 
+                       (table_name,))
+        column_names = [name for (name,) in cursor.fetchall()]
+
+        if "content_hash" not in column_names:
+            cursor.execute(f'''ALTER TABLE {table_name} 
+                           ADD COLUMN content_hash BLOB''')
+
+        cursor.execute(f'''SELECT content_hash FROM {table_name} 
+                       WHERE content_hash IS NOT NULL''')
+        hashes = {hash_ for (hash_,) in cursor}
+
+        cursor.execute(f'''
+            SELECT {table_name}.id, date, amount, Categories.name, 
+                description
+            FROM {table_name} JOIN Categories 
+            ON Categories.id = {table_name}.category_id
+            WHERE content_hash IS NULL ORDER BY {table_name}.id''')
+        new_hashes = []
+
+        for (id_, *record) in cursor.fetchall():
+            content = json.dumps(record).encode()
+            hash_ = hashlib.blake2b(content, digest_size = 16).digest()
+
+            if hash_ in hashes:
+                continue
+
+            hashes.add(hash_)
+            new_hashes.append((hash_, id_))
+
+        cursor.executemany(f'''UPDATE {table_name} SET content_hash = ? 
+                           WHERE id = ?''', new_hashes)
+
+    create_indexes(UNIQUE_CONTENT_HASH_INDEXES)
+
+
+def allow_repeated_records():
+    """
+    allow_repeated_records is the migration which lets the same income or 
+    expense be added more than once, such as two coffees of the same price
+    on the same day, by making the content hash indexes again without 
+    UNIQUE from CONTENT_HASH_INDEXES with create_indexes. The content hash
+    of every record is then worked out again with content_hash, including 
+    the copies add_content_hashes left without one, so every record is 
+    found if it is imported again.
+
+    Parameters  :
+
+    Returns     :
+    """
+    create_indexes(CONTENT_HASH_INDEXES)
+
+    for table_name in ["Income", "Expenses"]:
+        cursor.execute(f'''SELECT id, date, amount, description 
+                       FROM {table_name}''')
+        new_hashes = [(content_hash(*record), id_) 
+                      for (id_, *record) in cursor.fetchall()]
+
+        cursor.executemany(f'''UPDATE {table_name} SET content_hash = ? 
+                           WHERE id = ?''', new_hashes)
+
+
+# The changes made to the layout of the database, in the order they are 
+# applied, in the form [version, description, migration]. Each migration is
+# a function which makes its change using the global cursor and is applied
+# once to each database by migrate_database. To change the layout, such as 
+# adding or changing an index, a column or changing the type of a column, 
+# add a new migration to the end with the next version rather than changing
+# the ones before it or the indexes they make. A migration which makes a 
+# table again must also make its triggers and indexes again.
+MIGRATIONS = [
+    [1, "Create the tables and convert older databases", create_tables],
+    [2, "Add the DailyTotals table and its triggers", add_daily_totals],
+    [3, "Add the indexes in INDEXES", add_indexes],
+    [4, "Add content hashes to Income and Expenses", add_content_hashes],
+    [5, "Add the GoalCheckpoint table and its triggers", 
+     create_goal_checkpoint],
+    [6, "Allow the same income or expense to be added more than once", 
+     allow_repeated_records]
+]
+
+
+def read_schema_version():
+    """
+    read_schema_version finds the version of the layout of the database, 
+    which is the highest version in its schema_version table. A database 
+    without a schema_version table, either new or made before versions 
+    were kept, is at version 0.
+
+    Parameters  :
+
+    Returns     :   version : int
+                        The version of the database.
+    """
+    cursor.execute('''SELECT name FROM sqlite_master 
+                   WHERE type = ? AND name = ?''', ("table", "schema_version"))
+
+    if cursor.fetchone() == None:
+        return 0
+
+    cursor.execute(SCHEMA_VERSION_QUERY)
+    (version,) = cursor.fetchone()
+
+    if version == None:
+        return 0
+
+    return version
+
+
+def migrate_database():
+    """
+    migrate_database brings the database up to the latest version in 
+    MIGRATIONS. If the database is already at the latest version nothing 
+    else is done, so opening a database which is up to date, however large,
+    only needs two small reads. Otherwise the migrations after the version 
+    of the database are applied in order in one transaction, with each 
+    version recorded in the schema_version table as it is applied, so a 
+    database is either fully migrated or left as it was.
+
+    Parameters  :
+
+    Returns     :   applied_versions : list
+                        The versions of the migrations which have been 
+                        applied.
+    """
+    applied_versions = []
+
+    if read_schema_version() >= MIGRATIONS[-1][0]:
+        return applied_versions
+
+    with transaction():
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS
+            schema_version( version INTEGER PRIMARY KEY, description TEXT,
+                applied_at TEXT)
+        ''')
+
+        # The version is read again inside the transaction in case another
+        # program has migrated the database since it was first read.
+        version = read_schema_version()
+
+        for [migration_version, description, migration] in MIGRATIONS:
+            if migration_version <= version:
+                continue
+
+            migration()
+
+            cursor.execute('''INSERT INTO schema_version(version, 
+                           description, applied_at) VALUES (?,?,?)''', 
+                           (migration_version, description, 
+                            str(datetime.datetime.now())))
+            applied_versions.append(migration_version)
+
+    return applied_versions
+
+
+def open_connection(db_path, read_only = False):
+    """
+    open_connection opens a connection to a SQLite3 database file with the
+    settings in CONNECTION_PRAGMAS. Transactions are started by transaction
+    rather than by the sqlite3 module, so reads on their own never start or
+    commit a transaction.
+
+    Parameters  :   db_path : str
+                        The path of the database file.
+                    read_only : bool
+                        If True the connection can only read from the 
+                        database, which must already exist. Otherwise the
+                        connection can make changes, but must only be used
+                        by one thread at a time. Either can be used from 
+                        any thread.
+
+    Returns     :   connection : sqlite3.Connection
+                        The opened connection.
+    """
+    if read_only:
+        connection = sqlite3.connect(
+            pathlib.Path(db_path).absolute().as_uri() + "?mode=ro", 
+            uri = True, isolation_level = None, check_same_thread = False)
+
+    else:
+        connection = sqlite3.connect(db_path, isolation_level = None, 
+                                     check_same_thread = False)
+
+    for [pragma, value] in CONNECTION_PRAGMAS:
+        connection.execute(f"PRAGMA {pragma} = {value}")
+
+    return connection
+
+
+def connect_to_database(db_path):
+    """
+    connect_to_database creates or opens a SQLite3 database file and makes 
+    it the database used by the rest of the app, bringing its tables up to
+    date with migrate_database. The database is put into WAL mode and 
+    opened with one connection which makes every change and a pool of 
+    READER_POOL_SIZE read only connections for reports, used through 
+    reader.
+
+    Parameters  :   db_path : str
+                        The path of the database file.
+
+    Returns     :
+    """
+    global db, cursor, transaction_depth, reader_pool
+
+    db = open_connection(db_path)
+    cursor = db.cursor()
+    transaction_depth = 0
+    category_cache.clear()
+
+    # WAL mode is saved in the database file so it only needs to be set 
+    # once, but setting it again does no harm.
+    db.execute("PRAGMA journal_mode = WAL")
+
+    migrate_database()
+
+    # The readers are opened once the tables exist, as a read only 
+    # connection can't create the database.
+    reader_pool = queue.Queue()
+
+    for i in range(READER_POOL_SIZE):
+        reader_pool.put(open_connection(db_path, read_only = True))
+
+
+def close_database():
+    """
+    close_database closes the connection used to make changes and every 
+    connection in the reader pool.
+
+    Parameters  :
+
+    Returns     :
+    """
+    while not reader_pool.empty():
+        reader_pool.get().close()
+
+    db.close()
+
+
+def generate_ledger(no_of_rows, seed = 0):
+    """
+    generate_ledger fills the tables with a synthetic ledger of the same 
+    shape as Income_expense_goals.csv. The records are spread over ten 
+    years, with roughly one income for every four expenses, and a budget 
+    for each expense category. One goal is added for every thousand records,
+    with at least ten goals. The records are added in chunks of 
+    IMPORT_CHUNK_SIZE in their own transactions.
+
+    Parameters  :   no_of_rows : int
+                        The number of Income and Expenses records to add.
+                    seed : int
+                        The seed of the random numbers so the same ledger is
+                        generated every time.
+
+    Returns     :
+    """
+    generator = random.Random(seed)
+    first_day = date_to_day_number(datetime.date(2015, 1, 1))
+
+    income_categories = ["Salary", "Freelance", "Gifts", "Interest", "Misc"]
+    expense_categories = ["Bills", "Groceries", "Entertainment", "Transport",
+                          "Shopping", "Health & Beauty", "Home & Garden",
+                          "Misc"]
+
+    for chunk_start in range(0, no_of_rows, IMPORT_CHUNK_SIZE):
+        income_records = []
+        expense_records = []
+
+        for row in range(chunk_start, 
+                         min(chunk_start + IMPORT_CHUNK_SIZE, no_of_rows)):
+            date = first_day + generator.randint(0, 3652)
+
+            if generator.random() < 0.2:
+                record = [date, generator.randint(1000, 300000),
+                          generator.choice(income_categories), 
+                          f"Income {row}"]
+                income_records.append(record + [content_hash(record[0], 
+                    record[1], record[3])])
+
+            else:
+                record = [date, generator.randint(100, 50000),
+                          generator.choice(expense_categories), 
+                          f"Expense {row}"]
+                expense_records.append(record + [content_hash(record[0], 
+                    record[1], record[3])])
+
+        with transaction():
+            add_categories("Income", income_categories)
+            add_categories("Expenses", expense_categories)
+            cursor.executemany(f'''INSERT INTO Income(date, 
+                amount, category_id, description, content_hash) 
+                VALUES(?,?,
+                {CATEGORY_ID_QUERY.format(table_name = "Income")},?,?)''',
+                income_records)
+            cursor.executemany(f'''INSERT INTO Expenses(date, 
+                amount, category_id, description, content_hash) 
+                VALUES(?,?,
+                {CATEGORY_ID_QUERY.format(table_name = "Expenses")},?,?)''',
+                expense_records)
+            update_category_cache("Income", 
+                {record[2] for record in income_records})
+            update_category_cache("Expenses", 
+                {record[2] for record in expense_records})
+
+    budget_records = []
+
+    for category in expense_categories:
+        budget_records.append([category, 
+                               generator.randint(20, 300) * 100])
+
+    goal_records = []
+
+    for goal in range(max(10, no_of_rows // 1000)):
+        date = first_day + generator.randint(0, 3652)
+        goal_records.append([date, generator.randint(10000, 500000),
+                             f"Goal {goal}"])
+
+    with transaction():
+        cursor.executemany('''INSERT INTO Budget(category, budget) 
+                           VALUES(?,?)''', budget_records)
+        cursor.executemany('''INSERT INTO Goals(date, amount, description) 
+                           VALUES(?,?,?)''', goal_records)
+
+
+def time_operation(operation, repeats):
+    """
+    time_operation runs an operation a number of times and times each run.
+    Anything the operation prints is hidden so only the time is measured.
+
+    Parameters  :   operation : function
+                        The operation to be timed, taking no arguments.
+                    repeats : int
+                        The number of times to run the operation.
+
+    Returns     :   timing : dict
+                        The fastest and median time of a run in seconds
+                        along with the number of runs.
+    """
+    run_times = []
+
+    for repeat in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            operation()
+            run_times.append(time.perf_counter() - start_time)
+
+    run_times.sort()
+
+    timing = {"min_seconds": run_times[0], 
+              "median_seconds": run_times[len(run_times) // 2],
+              "repeats": repeats}
+    
+    return timing
+
+
+def run_benchmarks(scale_factors):
+    """
+    run_benchmarks times the core operations of the app on a synthetic 
+    ledger made by generate_ledger for each scale factor. Each ledger is 
+    made in a temporary database which is deleted afterwards. The timed 
+    operations are the range searches of retrieve_income_expense, the range
+    totals of retrieve_totals, single and bulk inserts with add_to_table, 
+    renaming a category, checking the budget of every category and working
+    out the progress of the goals as in menu option 10.
+
+    Parameters  :   scale_factors : list
+                        The numbers of Income and Expenses records to time 
+                        the operations with, such as 10000 to 10000000.
+
+    Returns     :   results : dict
+                        The results in a form which can be saved as JSON, 
+                        with the timings of each operation for each scale 
+                        factor.
+    """
+    results = {"sqlite_version": sqlite3.sqlite_version,
+               "python_version": platform.python_version(),
+               "date": str(datetime.datetime.now()),
+               "scale_factors": []}
+    
+    month_range = [datetime.date(2020, 6, 1), datetime.date(2020, 6, 30)]
+    year_range = [datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)]
+
+    for no_of_rows in scale_factors:
+        with tempfile.TemporaryDirectory() as directory:
+            connect_to_database(os.path.join(directory, "benchmark_db"))
+
+            start_time = time.perf_counter()
+            generate_ledger(no_of_rows)
+            generate_seconds = time.perf_counter() - start_time
+
+            expense_categories = [category for (category,) 
+                                  in retrieve_categories("Expenses", "not")]
+            
+            # The records added by the insert operations. Each is given its
+            # own description so that none of them are skipped as 
+            # duplicates.
+            insert_numbers = itertools.count()
+            bulk_size = 1000
+
+            def new_record():
+                return ["2020-06-15", 1250, "Groceries", 
+                        f"Insert {next(insert_numbers)}"]
+
+            def check_every_budget():
+                for category in expense_categories:
+                    budget_for_category_over_date(category, month_range[0],
+                                                  month_range[1])
+                    retrieve_totals("Expenses", month_range[0], 
+                                    month_range[1], category)
+
+            def rename_category():
+                update_category("Expenses", "Groceries", "Food")
+                update_category("Expenses", "Food", "Groceries")
+
+            timings = {
+                "retrieve_income_expense_month": time_operation(
+                    lambda: retrieve_income_expense("Expenses", 
+                        month_range[0], month_range[1]), 5),
+                "retrieve_income_expense_month_category": time_operation(
+                    lambda: retrieve_income_expense("Expenses", 
+                        month_range[0], month_range[1], "Groceries"), 5),
+                "retrieve_income_expense_year": time_operation(
+                    lambda: retrieve_income_expense("Expenses", 
+                        year_range[0], year_range[1]), 3),
+                "retrieve_totals_year": time_operation(
+                    lambda: retrieve_totals("Expenses", year_range[0], 
+                                            year_range[1]), 5),
+                "add_to_table_single": time_operation(
+                    lambda: add_to_table("Expenses", new_record(), "no"), 20),
+                "add_to_table_bulk_1000": time_operation(
+                    lambda: add_to_table("Expenses", 
+                        [new_record() for i in range(bulk_size)], "yes"), 3),
+                "rename_category_and_back": time_operation(
+                    rename_category, 3),
+                "check_every_budget_month": time_operation(
+                    check_every_budget, 5),
+                "goal_progress": time_operation(calculate_goal_progress, 3)
+            }
+
+            # The analytics are only timed when NumPy is installed.
+            if numpy != None:
+                timings["analytics_load_ledger"] = time_operation(
+                    lambda: load_ledger("Expenses"), 3)
+                expenses_ledger = load_ledger("Expenses")
+                timings["analytics_year"] = time_operation(
+                    lambda: [rolling_sums(expenses_ledger, year_range[0], 
+                                          year_range[1]),
+                             category_totals(expenses_ledger, year_range[0],
+                                             year_range[1])], 5)
+
+            close_database()
+
+        results["scale_factors"].append({"no_of_rows": no_of_rows, 
+            "generate_seconds": generate_seconds, "timings": timings})
+        
+    return results
+
+
+def check_numpy():
+    """
+    check_numpy checks that NumPy, which the analytics need, is installed.
+
+    Parameters  :
+
+    Returns     :
+
+    Raises      :   ImportError
+                        If NumPy is not installed.
+    """
+    if numpy == None:
+        raise ImportError("The analytics need NumPy, which can be installed"
+                          + " with: pip install numpy")
+
+
+def ledger_columns_query(table_name, start_date = None, end_date = None):
+    """
+    ledger_columns_query makes the query which reads the date, amount and
+    category ID of the records of the Income or Expenses table in date 
+    order, from the date and category index, for load_ledger and 
+    write_snapshot.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime.date | NoneType
+                        The earliest date a record can be from, or None for
+                        the earliest record.
+                    end_date : datetime.date | NoneType
+                        The latest date a record can be from, or None for 
+                        the latest record.
+
+    Returns     :   query : list
+                        The query in the form [query, parameters].
+    """
+    conditions = []
+    parameters = []
+
+    if start_date != None:
+        conditions.append("date >= ?")
+        parameters.append(date_to_day_number(start_date))
+
+    if end_date != None:
+        conditions.append("date <= ?")
+        parameters.append(date_to_day_number(end_date))
+
+    # SQLite only reads the records from the index in date order when there
+    # is a WHERE clause.
+    if len(conditions) == 0:
+        conditions.append("1")
+
+    query = f'''SELECT date, amount, category_id FROM {table_name} 
+        WHERE {" AND ".join(conditions)} ORDER BY date'''
+
+    return [query, parameters]
+
+
+def load_ledger(table_name, start_date = None, end_date = None):
+    """
+    load_ledger reads the date, amount and category of the records of the
+    Income or Expenses table into NumPy arrays with one query, so they can
+    be analysed with vectorised operations rather than one record at a 
+    time. The rows are read in date order from the date and category index 
+    straight into an array, without making a list of them first.
+
+    Parameters  :   table_name : str
+                        Either 'Income' or 'Expenses'.
+                    start_date : datetime.date | NoneType
+                        The earliest date a record can be from, or None for
+                        the earliest record.
+                    end_date : datetime.date | NoneType
+                        The latest date a record can be from, or None for 
+                        the latest record.
+
+    Returns     :   ledger : dict
+                        The records in the form {"date": day numbers, 
+                        "amount": amounts in pence, "category": category 
+                        IDs, "categories": {category ID: category name}}, 
+                        where the first three are NumPy arrays of 64 bit 
+                        integers in date order.
+
+    Raises      :   ImportError
+                        If NumPy is not installed.
+    """
+    check_numpy()
+
+    [query, parameters] = ledger_columns_query(table_name, start_date, 
+                                               end_date)
+
+    with reader() as read_cursor:
+        read_cursor.execute(CATEGORY_NAMES_QUERY, (table_name,))
+        categories = dict(read_cursor.fetchall())
+
+        read_cursor.execute(query, parameters)
+        columns = numpy.fromiter(itertools.chain.from_iterable(read_cursor),
+                                 dtype = numpy.int64)
+
+    # The rows are read one after another, so every third value is from the
+    # same column.
+    columns = columns.reshape(-1, 3).T.copy()
+
+    ledger = {"date": columns[0], "amount": columns[1], 
+              "category": columns[2], "categories": categories}
+
+    return ledger
+
+
+def totals_up_to(ledger, day_numbers):
+    """
+    totals_up_to finds the total of the amounts of a ledger on or before 
+    each of a number of days. As the records are in date order, this is a
+    running total of the amounts read at the position of the last record 
+    of each day, found with a binary search, so the totals are exact and 
+    each is found without going through the records.
+
+    Parameters  :   ledger : dict
+                        A ledger from load_ledger.
+                    day_numbers : numpy.ndarray
+                        The day numbers to find the totals up to.
+
+    Returns     :   totals : numpy.ndarray
+                        The total in pence of every record on or before 
+                        each day.
+    """
+    running_totals = numpy.concatenate(
+        (numpy.zeros(1, dtype = numpy.int64), numpy.cumsum(ledger["amount"])))
+    positions = numpy.searchsorted(ledger["date"], day_numbers, 
+                                   side = "right")
+
+    return running_totals[positions]
+
+
+def rolling_sums(ledger, start_date, end_date, no_of_days = 30):
+    """
+    rolling_sums finds the total of the amounts of a ledger over the 
+    no_of_days days up to and including each day between two dates, such
+    as the spending over the last 30 days on each day.
+
+    Parameters  :   ledger : dict
+                        A ledger from load_ledger, which should hold the 
+                        records from no_of_days before start_date onwards.
+                    start_date : datetime.date
+                        The first day to find the rolling sum of.
+                    end_date : datetime.date
+                        The last day to find the rolling sum of.
+                    no_of_days : int
+                        The number of days each sum is over.
+
+    Returns     :   rolling : list
+                        A list in the format [day numbers, sums] where both
+                        are NumPy arrays with one value for each day from 
+                        start_date to end_date, the sums being in pence.
+    """
+    day_numbers = numpy.arange(date_to_day_number(start_date), 
+                               date_to_day_number(end_date) + 1)
+    sums = (totals_up_to(ledger, day_numbers) 
+            - totals_up_to(ledger, day_numbers - no_of_days))
+
+    return [day_numbers, sums]
+
+
+def category_totals(ledger, start_date, end_date):
+    """
+    category_totals finds the total of the amounts of each category of a 
+    ledger between two dates.
+
+    Parameters  :   ledger : dict
+                        A ledger from load_ledger.
+                    start_date : datetime.date
+                        The earliest date a record can be from.
+                    end_date : datetime.date
+                        The latest date a record can be from.
+
+    Returns     :   totals : dict
+                        The total in pence of every category with records 
+                        between the dates in the form {category: total}, 
+                        in category order.
+    """
+    # The records between the dates are found with a binary search as the
+    # ledger is in date order.
+    first = numpy.searchsorted(ledger["date"], 
+                               date_to_day_number(start_date), side = "left")
+    last = numpy.searchsorted(ledger["date"], 
+                              date_to_day_number(end_date), side = "right")
+    category_ids = ledger["category"][first:last]
+
+    if len(category_ids) == 0:
+        return {}
+
+    # Category IDs are small whole numbers, so the total of each is kept in
+    # the position of its ID.
+    totals_by_id = numpy.zeros(category_ids.max() + 1, dtype = numpy.int64)
+    numpy.add.at(totals_by_id, category_ids, ledger["amount"][first:last])
+    counts_by_id = numpy.bincount(category_ids)
+
+    totals = {}
+
+    for category_id in numpy.flatnonzero(counts_by_id):
+        totals[ledger["categories"][category_id]] = int(
+            totals_by_id[category_id])
+
+    return dict(sorted(totals.items()))
+
+
+def cumulative_cash_flow(income_ledger, expenses_ledger, start_date, 
+                         end_date):
+    """
+    cumulative_cash_flow finds the profit (income minus expenses) made from
+    the start date up to and including each day until the end date.
+
+    Parameters  :   income_ledger : dict
+                        The Income ledger from load_ledger.
+                    expenses_ledger : dict
+                        The Expenses ledger from load_ledger.
+                    start_date : datetime.date
+                        The first day of the cash flow.
+                    end_date : datetime.date
+                        The last day of the cash flow.
+
+    Returns     :   cash_flow : list
+                        A list in the format [day numbers, profits] where 
+                        both are NumPy arrays with one value for each day 
+                        from start_date to end_date, the profits being in 
+                        pence.
+    """
+    first_day = date_to_day_number(start_date)
+    day_numbers = numpy.arange(first_day, date_to_day_number(end_date) + 1)
+
+    profits = ((totals_up_to(income_ledger, day_numbers) 
+                - totals_up_to(income_ledger, first_day - 1))
+               - (totals_up_to(expenses_ledger, day_numbers) 
+                  - totals_up_to(expenses_ledger, first_day - 1)))
+
+    return [day_numbers, profits]
+
+
+def display_analytics(start_date, end_date, no_of_days = 30, 
+                      ledgers = None):
+    """
+    display_analytics loads the Income and Expenses ledgers with load_ledger
+    (unless they are given, such as from open_snapshot) and shows the user 
+    the spending and income of each category, their highest spending over 
+    no_of_days days and their cash flow between two dates, along with how 
+    long the analysis took.
+
+    Parameters  :   start_date : datetime.date
+                        The first day of the analysis.
+                    end_date : datetime.date
+                        The last day of the analysis.
+                    no_of_days : int
+                        The number of days the rolling spending is over.
+                    ledgers : dict | NoneType
+                        The ledgers in the form {table name: ledger}, or 
+                        None to load them from the database.
+
+    Returns     :
+
+    Raises      :   ImportError
+                        If NumPy is not installed.
+                    ValueError
+                        If the end date is before the start date.
+    """
+    check_numpy()
+
+    if end_date < start_date:
+        raise ValueError(f"The end date {end_date} is before the start date "
+                         + f"{start_date}.")
+
+    start_time = time.perf_counter()
+
+    if ledgers != None:
+        expenses_ledger = ledgers["Expenses"]
+        income_ledger = ledgers["Income"]
+
+    else:
+        # The rolling spending of the first day needs the records of the 
+        # days before it.
+        expenses_ledger = load_ledger("Expenses", start_date 
+                            - datetime.timedelta(days = no_of_days - 1),
+                            end_date)
+        income_ledger = load_ledger("Income", start_date, end_date)
+
+    load_seconds = time.perf_counter() - start_time
+
+    [day_numbers, spending] = rolling_sums(expenses_ledger, start_date, 
+                                           end_date, no_of_days)
+    totals = {"Expenses": category_totals(expenses_ledger, start_date, 
+                                          end_date),
+              "Income": category_totals(income_ledger, start_date, end_date)}
+    [_, profits] = cumulative_cash_flow(income_ledger, expenses_ledger, 
+                                        start_date, end_date)
+    analysis_seconds = time.perf_counter() - start_time - load_seconds
+
+    for table_name, verb in [["Expenses", "spent"], ["Income", "earned"]]:
+        print(f"\nBetween {start_date} and {end_date} you have {verb}:")
+
+        for category, total in totals[table_name].items():
+            print(f"  £{format_pounds(total)} in \'{category}\'")
+
+        if len(totals[table_name]) == 0:
+            print("  Nothing.")
+
+    # With no records between the dates there is no spending or cash flow
+    # to show.
+    if len(totals["Expenses"]) == 0 and len(totals["Income"]) == 0:
+        print(f"\nThere are no records between {start_date} and {end_date} "
+              + "to analyse.")
+        return
+
+    highest = int(numpy.argmax(spending))
+    lowest = int(numpy.argmin(profits))
+
+    print(f"\nYour highest spending over {no_of_days} days was "
+          + f"£{format_pounds(int(spending[highest]))} in the {no_of_days} "
+          + f"days up to {day_number_to_date(int(day_numbers[highest]))}.")
+    print(f"Your profit over the whole time was "
+          + f"£{format_pounds(int(profits[-1]))}, at its lowest it was "
+          + f"£{format_pounds(int(profits[lowest]))} on "
+          + f"{day_number_to_date(int(day_numbers[lowest]))}.")
+    print(f"\nRead {len(expenses_ledger['date']) + len(income_ledger['date'])}"
+          + f" records in {load_seconds * 1000:.1f} ms and analysed them in "
+          + f"{analysis_seconds * 1000:.1f} ms.")
+
+
+def write_snapshot(file_path):
+    """
+    write_snapshot writes the date, amount and category of every record of
+    the Income and Expenses tables to a snapshot file in the format 
+    described by SNAPSHOT_MAGIC, so that analytics and reports can read 
+    them with open_snapshot without any SQL. Both tables are read in one 
+    read transaction so the snapshot is of a single moment, even while 
+    records are being added. The snapshot is written to a temporary file 
+    which then replaces file_path, so a snapshot which is being read is 
+    never seen half written. NumPy is not needed to write a snapshot.
+
+    Parameters  :   file_path : str
+                        The path of the snapshot file.
+
+    Returns     :   header : dict
+                        The header of the snapshot.
+    """
+    start_time = time.perf_counter()
+    # The categories and columns of each table, in the form 
+    # {table name: [categories, dates, amounts, category IDs]}.
+    table_columns = {}
+
+    with reader() as read_cursor:
+        is_own_transaction = not read_cursor.connection.in_transaction
+
+        if is_own_transaction:
+            read_cursor.execute('''BEGIN''')
+
+        try:
+            for table_name in ["Income", "Expenses"]:
+                read_cursor.execute(CATEGORY_NAMES_QUERY, (table_name,))
+                categories = read_cursor.fetchall()
+
+                columns = [array.array("q") for column in SNAPSHOT_COLUMNS]
+                [query, parameters] = ledger_columns_query(table_name)
+                read_cursor.execute(query, parameters)
+
+                for row in read_cursor:
+                    for column, value in zip(columns, row):
+                        column.append(value)
+
+                # The columns are always written little endian so a 
+                # snapshot can be read on any computer.
+                if sys.byteorder == "big":
+                    for column in columns:
+                        column.byteswap()
+
+                table_columns[table_name] = [categories] + columns
+
+        finally:
+            if is_own_transaction:
+                read_cursor.execute('''COMMIT''')
+
+    header = {"created": str(datetime.datetime.now()), 
+              "byteorder": "little", "tables": {}}
+    # The position of the next column after the header.
+    position = 0
+
+    for table_name, [categories, *columns] in table_columns.items():
+        table_header = {"no_of_records": len(columns[0]),
+                        "categories": dict(categories)}
+
+        for column_name, column in zip(SNAPSHOT_COLUMNS, columns):
+            table_header[column_name] = position
+            position += len(column) * column.itemsize
+
+        header["tables"][table_name] = table_header
+
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b" " * (-len(header_bytes) % 8)
+
+    with open(file_path + ".tmp", "wb") as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(len(header_bytes).to_bytes(8, "little"))
+        file.write(header_bytes)
+
+        for [categories, *columns] in table_columns.values():
+            for column in columns:
+                column.tofile(file)
+
+    os.replace(file_path + ".tmp", file_path)
+
+    elapsed_time = time.perf_counter() - start_time
+    no_of_records = sum(table_header["no_of_records"] 
+                        for table_header in header["tables"].values())
+
+    print(f"Wrote {no_of_records} records to {file_path} "
+          + f"({os.path.getsize(file_path) / 1048576:.1f} MiB) in "
+          + f"{elapsed_time:.2f} seconds.")
+
+    return header
+
+
+def open_snapshot(file_path):
+    """
+    open_snapshot opens a snapshot written by write_snapshot with mmap and 
+    gives the ledgers in it in the same form as load_ledger. The columns are
+    read straight from the memory map without being copied, so a snapshot 
+    of any size is ready to use at once and only the parts of it which are
+    used are ever read from the disk. The columns are NumPy arrays if NumPy
+    is installed, otherwise they are memoryviews of 64 bit integers. 
+    Without NumPy the columns of a snapshot whose byte order is not the 
+    same as this computer's are copied and swapped round instead.
+
+    Parameters  :   file_path : str
+                        The path of the snapshot file.
+
+    Returns     :   ledgers : dict
+                        The ledgers in the form {table name: ledger} along
+                        with the time the snapshot was made under 
+                        "created".
+
+    Raises      :   ValueError
+                        If the file is not a snapshot.
+                    FileNotFoundError
+                        If the file does not exist.
+    """
+    with open(file_path, "rb") as file:
+        if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{file_path} is not a snapshot.")
+
+        # The memory map stays open after the file is closed for as long as 
+        # the columns read from it are used.
+        snapshot_map = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    header_start = len(SNAPSHOT_MAGIC) + 8
+    header_length = int.from_bytes(snapshot_map[len(SNAPSHOT_MAGIC)
+                                                :header_start], "little")
+    header = json.loads(snapshot_map[header_start
+                                     :header_start + header_length])
+
+    # Snapshots written by older versions of the app are in the byte order
+    # of the computer which wrote them, which the header records.
+    if header["byteorder"] == "big":
+        column_dtype = ">i8"
+
+    else:
+        column_dtype = "<i8"
+
+    columns_start = header_start + header_length
+    ledgers = {"created": header["created"]}
+
+    for table_name, table_header in header["tables"].items():
+        no_of_records = table_header["no_of_records"]
+        # JSON keys are always strings, so the category IDs are converted 
+        # back to integers.
+        ledger = {"categories": {int(category_id): name for category_id, name
+                                 in table_header["categories"].items()}}
+
+        for column_name in SNAPSHOT_COLUMNS:
+            start = columns_start + table_header[column_name]
+
+            if numpy != None:
+                ledger[column_name] = numpy.frombuffer(snapshot_map, 
+                    dtype = column_dtype, count = no_of_records, 
+                    offset = start)
+
+            elif header["byteorder"] == sys.byteorder:
+                ledger[column_name] = memoryview(snapshot_map)[
+                    start:start + no_of_records * 8].cast("q")
+
+            else:
+                column = array.array("q", 
+                                     snapshot_map[start:start 
+                                                  + no_of_records * 8])
+                column.byteswap()
+                ledger[column_name] = memoryview(column)
+
+        ledgers[table_name] = ledger
+
+    return ledgers
+
+
+def api_parameter(parameters, name, required = True, is_number = False):
+    """
+    api_parameter finds a parameter of a request to the JSON service, 
+    given either in the query string or in the JSON body of the request. 
+    Every parameter must be given as a string, apart from numbers such as 
+    the amount, which may also be given as a JSON number. A parameter given
+    as null is the same as one which is not given.
+
+    Parameters  :   parameters : dict
+                        The parameters of the request in the form 
+                        {name: value}.
+                    name : str
+                        The name of the parameter.
+                    required : bool
+                        If True the request must have the parameter.
+                    is_number : bool
+                        If True the parameter may be a JSON number as well
+                        as a string.
+
+    Returns     :   value : str | NoneType
+                        The value of the parameter as a str, or None if it
+                        is not required and was not given.
+
+    Raises      :   ValueError
+                        If the parameter is required and was not given, or
+                        is not a string (or a number if is_number is True).
+    """
+    value = parameters.get(name)
+
+    if value == None:
+        if required:
+            raise ValueError(f"The \'{name}\' parameter is missing.")
+
+        return None
+
+    # True and false are ints in Python, but are not numbers in JSON.
+    if is_number and type(value) in [int, float]:
+        return str(value)
+
+    if type(value) != str and is_number:
+        raise ValueError(f"The \'{name}\' parameter must be a string or a "
+                         + "number.")
+
+    elif type(value) != str:
+        raise ValueError(f"The \'{name}\' parameter must be a string.")
+
+    return value
+
+
+def api_date_range(parameters):
+    """
+    api_date_range finds the date range of a request to the JSON service 
+    from its start and end parameters, checked with validate_date_range.
+
+    Parameters  :   parameters : dict
+                        The parameters of the request.
+
+    Returns     :   date_range : list
+                        A list of the [start_date, end_date] as dates.
+
+    Raises      :   ValueError
+                        If either date is missing or not a true date, or 
+                        the end date is before the start date.
+    """
+    date_range = validate_date_range(api_parameter(parameters, "start"), 
+                                     api_parameter(parameters, "end"))
+
+    return date_range
+
+
+def api_pounds(pence):
+    """
+    api_pounds writes an amount in pence for a response of the JSON 
+    service, as a str of pounds to 2 decimal places in the same way as 
+    format_pounds, so no amount is ever rounded.
+
+    Parameters  :   pence : int | NoneType
+                        The amount in pence.
+
+    Returns     :   pounds : str | NoneType
+                        The amount in pounds, or None if there is no 
+                        amount.
+    """
+    if pence == None:
+        return None
+
+    return format_pounds(pence)
+
+
+def handle_api_request(method, path, parameters):
+    """
+    handle_api_request carries out one request to the JSON service using 
+    the same functions and checks as the batch commands. It is run on a 
+    thread of the service rather than the event loop, as each request waits
+    for SQLite. The requests are:
+
+        POST /records           table, date, amount, category, description
+        GET  /records           table, start, end, [category]
+        GET  /totals            table, start, end, [category]
+        GET  /budget            category, start, end
+        GET  /budget-report     start, end
+        GET  /goals
+
+    where table is Income or Expenses, the dates are in the format 
+    YYYY-MM-DD and amounts are in pounds. The parameters of a POST are 
+    given as a JSON object and the others in the query string.
+
+    Parameters  :   method : str
+                        The HTTP method of the request.
+                    path : str
+                        The path of the request.
+                    parameters : dict
+                        The parameters of the request.
+
+    Returns     :   api_response : list
+                        A list in the format [status, response], where 
+                        status is the HTTP status code and response is a
+                        dict which can be written as JSON.
+
+    Raises      :   ValueError
+                        If any of the parameters are not valid.
+    """
+    paths = ["/records", "/totals", "/budget", "/budget-report", "/goals"]
+
+    if path not in paths:
+        return [404, {"error": f"\'{path}\' is not a recognised path."}]
+
+    if method == "POST" and path == "/records":
+        table_name = validate_table_name(api_parameter(parameters, "table"))
+        record_data = [
+            validate_date(api_parameter(parameters, "date")), 
+            validate_amount(api_parameter(parameters, "amount", 
+                                          is_number = True)),
+            validate_category(api_parameter(parameters, "category")), 
+            validate_description(api_parameter(parameters, "description"))]
+
+        # add_to_table shows the record it has added, which isn't needed 
+        # here.
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_to_table(table_name, record_data, "no")
+
+        # add_to_table adds the I.D. of the new record to the end of it.
+        return [201, {"id": record_data[4]}]
+
+    if method != "GET":
+        return [405, {"error": f"{method} can not be used with {path}."}]
+
+    if path == "/records" or path == "/totals":
+        table_name = validate_table_name(api_parameter(parameters, "table"))
+        date_range = api_date_range(parameters)
+        category = api_parameter(parameters, "category", required = False)
+
+        if category != None:
+            category = validate_category(category)
+
+        if path == "/records":
+            records = retrieve_income_expense(table_name, date_range[0], 
+                                              date_range[1], category)
+            response = {"records": [
+                {"id": id_, "date": date, "amount": api_pounds(amount), 
+                 "category": record_category, "description": description}
+                for (date, amount, record_category, description, id_) 
+                in records]}
+
+        else:
+            [total, no_of_records, smallest_amount, 
+             largest_amount] = retrieve_totals(table_name, date_range[0],
+                                               date_range[1], category)
+            response = {"total": api_pounds(total), 
+                        "no_of_records": no_of_records,
+                        "smallest_amount": api_pounds(smallest_amount),
+                        "largest_amount": api_pounds(largest_amount)}
+
+    elif path == "/budget":
+        category = validate_category(api_parameter(parameters, "category"))
+        date_range = api_date_range(parameters)
+
+        budget = budget_for_category_over_date(category, date_range[0],
+                                               date_range[1])
+        [spent, *_] = retrieve_totals("Expenses", date_range[0], 
+                                      date_range[1], category)
+        response = {"category": category, "budget": api_pounds(budget),
+                    "spent": api_pounds(spent)}
+
+    elif path == "/budget-report":
+        date_range = api_date_range(parameters)
+
+        budget_report = retrieve_budget_report(date_range[0], date_range[1])
+        response = {"report": [
+            {"category": category, "budget": api_pounds(budget), 
+             "spent": api_pounds(spent), "left": api_pounds(budget_left),
+             "percentage_used": percentage_used}
+            for (category, budget, spent, budget_left, percentage_used) 
+            in budget_report]}
+
+    elif path == "/goals":
+        # The checkpoint is moved on by handle_api_connection on the writer
+        # thread.
+        [goal_records_original, goal_records] = calculate_goal_progress(
+            move_checkpoint = False)
+
+        # The amount left to save of each goal by its I.D.
+        amounts_left = {record[3]: record[1] for record in goal_records}
+        response = {"goals": [
+            {"id": id_, "date": str(date), "description": description,
+             "amount": api_pounds(amount), 
+             "left_to_save": api_pounds(amounts_left[id_])}
+            for (date, amount, description, id_) in goal_records_original]}
+
+    return [200, response]
+
+
+async def read_api_request(stream_reader):
+    """
+    read_api_request reads the next HTTP request sent on a connection to 
+    the JSON service.
+
+    Parameters  :   stream_reader : asyncio.StreamReader
+                        The connection to read from.
+
+    Returns     :   request : list | NoneType
+                        A list in the format [method, target, version, 
+                        headers, body] where headers is a dict with the 
+                        names of the headers in lower case, or None if the 
+                        connection has been closed.
+
+    Raises      :   ValueError
+                        If the request is not a valid HTTP request or its 
+                        body is larger than SERVICE_MAX_BODY_SIZE.
+    """
+    request_line = await stream_reader.readline()
+
+    if len(request_line) == 0:
+        return None
+
+    headers = {}
+
+    while True:
+        header_line = await stream_reader.readline()
+
+        if header_line.strip() == b"":
+            break
+
+        (name, _, value) = header_line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    request_words = request_line.decode("latin-1").split()
+
+    if len(request_words) != 3:
+        raise ValueError("The request is not a valid HTTP request.")
+
+    content_length = int(headers.get("content-length", "0"))
+
+    if content_length > SERVICE_MAX_BODY_SIZE:
+        raise ValueError("The body of the request is larger than "
+                         + f"{SERVICE_MAX_BODY_SIZE} bytes.")
+
+    body = await stream_reader.readexactly(content_length)
+
+    return request_words + [headers, body]
+
+
+# The move of the goal checkpoint which handle_api_connection has started 
+# on the writer thread and which hasn't finished yet, or None. Only one 
+# move is started at a time, so requests for the progress of the goals 
+# don't queue up moves behind each other.
+goal_checkpoint_move = None
+
+
+def finish_goal_checkpoint_move(future):
+    """
+    finish_goal_checkpoint_move is called on the event loop when a move of
+    the goal checkpoint started by handle_api_connection has finished. The
+    move is forgotten, so the next request for the goals can start another,
+    and as no request waits for the move any error it raised is written to 
+    standard error.
+
+    Parameters  :   future : asyncio.Future
+                        The move which has finished.
+
+    Returns     :
+    """
+    global goal_checkpoint_move
+
+    goal_checkpoint_move = None
+
+    if future.cancelled():
+        return
+
+    error = future.exception()
 
+    if error != None:
+        print(f"The goal checkpoint could not be moved on: {error!r}", 
+              file = sys.stderr, flush = True)
 
-    Returns     :   records : list
-                        A list of tuples containing the (date, amount, 
-                        category, description) from each fetched record. 
+
+async def handle_api_connection(stream_reader, stream_writer, 
+                                read_executor, write_executor):
     """
-    if category == None:
-        cursor.execute(f'''
-        SELECT date, amount, category, description, id FROM {table_name}
-        WHERE date BETWEEN ? and ? 
-        ORDER BY date, category''', (start_date, end_date))
-        records = cursor.fetchall()
-        db.commit()
+    handle_api_connection answers each request sent on a connection to the
+    JSON service until the connection is closed. Each request is carried 
+    out by handle_api_request on a thread, so the event loop carries on 
+    reading other requests while SQLite is working. Requests which make a 
+    change are run on write_executor, which has a single thread as there is
+    one connection to make changes with, and the others on read_executor. 
+    A request for the goals also starts moving the goal checkpoint on with 
+    move_goal_checkpoint on the writer thread, unless a move is already 
+    running, without waiting for it. Each response is a JSON object, with 
+    an "error" if the request could not be carried out.
+
+    Parameters  :   stream_reader : asyncio.StreamReader
+                        The connection to read the requests from.
+                    stream_writer : asyncio.StreamWriter
+                        The connection to write the responses to.
+                    read_executor : concurrent.futures.ThreadPoolExecutor
+                        The threads which carry out the reads.
+                    write_executor : concurrent.futures.ThreadPoolExecutor
+                        The thread which carries out the changes.
 
-    else: 
-        cursor.execute(f'''
-        SELECT date, amount, category, description, id FROM {table_name}
-        WHERE category = ?  AND date BETWEEN ? AND ?
-        ORDER BY date, category''',
-        (category, start_date, end_date))
-        records = cursor.fetchall()
-        db.commit()
+    Returns     :
+    """
+    global goal_checkpoint_move
 
-    return records
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            try:
+                request = await read_api_request(stream_reader)
 
+            except (ValueError, EOFError) as e:
+                request = None
+                [status, response] = [400, {"error": str(e)}]
+                keep_alive = False
 
-def ask_for_description():
-    """
-    ask_for_description asks the user to input a description for a given 
-    record. 
+            else:
+                if request == None:
+                    break
 
-    Parameters  :   
+                [method, target, version, headers, body] = request
+                keep_alive = (version == "HTTP/1.1" and 
+                              headers.get("connection", "").lower() 
+                              != "close")
+                (path, _, query) = target.partition("?")
+
+                try:
+                    if method == "POST":
+                        parameters = json.loads(body or b"{}")
+                        executor = write_executor
+
+                        if type(parameters) != dict:
+                            raise ValueError("The body of the request must"
+                                             + " be a JSON object.")
+
+                    else:
+                        parameters = dict(urllib.parse.parse_qsl(query))
+                        executor = read_executor
+
+                    # The goal checkpoint is moved on by the writer, 
+                    # without waiting for it, while the progress is read.
+                    if path == "/goals" and goal_checkpoint_move == None:
+                        goal_checkpoint_move = loop.run_in_executor(
+                            write_executor, move_goal_checkpoint)
+                        goal_checkpoint_move.add_done_callback(
+                            finish_goal_checkpoint_move)
+
+                    [status, response] = await loop.run_in_executor(
+                        executor, handle_api_request, method, 
+                        urllib.parse.unquote(path), parameters)
+
+                except ValueError as e:
+                    [status, response] = [400, {"error": str(e)}]
+
+                except sqlite3.Error as e:
+                    [status, response] = [500, {"error": str(e)}]
+
+            response_body = json.dumps(response).encode()
+            response_head = (f"HTTP/1.1 {status} "
+                             + f"{http.HTTPStatus(status).phrase}\r\n"
+                             + "Content-Type: application/json\r\n"
+                             + f"Content-Length: {len(response_body)}\r\n")
+
+            if not keep_alive:
+                response_head += "Connection: close\r\n"
+
+            stream_writer.write(response_head.encode("latin-1") + b"\r\n" 
+                                + response_body)
+            await stream_writer.drain()
+
+            if not keep_alive:
+                break
 
-    Returns     :   description : str
-                        The description of record.
+    except ConnectionError:
+        pass
+
+    finally:
+        stream_writer.close()
+
+
+async def run_service(host, port):
     """
-    while True:
-        
-        description = input("\nPlease provide a brief description:\n")
-        description = check_character_length(description, 35)
+    run_service serves the JSON service described in handle_api_request on
+    a host and port until it is stopped with Ctrl+C. Connections are 
+    handled by asyncio so many clients can be connected at once, while 
+    the requests are carried out on a bounded pool of threads, 
+    READER_POOL_SIZE threads for reads (one for each reader) and a single 
+    thread for changes. Requests beyond this wait for a thread rather than
+    opening more connections to the database.
+
+    Parameters  :   host : str
+                        The host name or address to serve on, such as 
+                        127.0.0.1 so only this computer can connect.
+                    port : int
+                        The port to serve on, or 0 for any free port.
 
-        print(f"\n\"{description}\"")
-        is_correct = input(f"Is the description above correct?\n")
+    Returns     :
+    """
+    read_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers = READER_POOL_SIZE, thread_name_prefix = "reader")
+    write_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers = 1, thread_name_prefix = "writer")
 
-        is_correct = check_yes_no(is_correct)
+    try:
+        server = await asyncio.start_server(
+            functools.partial(handle_api_connection, 
+                              read_executor = read_executor, 
+                              write_executor = write_executor), 
+            host, port)
 
-        if is_correct == "yes":
-            return description
+        (host, port) = server.sockets[0].getsockname()[:2]
+        print(f"Serving the JSON service on http://{host}:{port}, press "
+              + "Ctrl+C to stop.", flush = True)
 
-        else: 
-            continue
+        async with server:
+            await server.serve_forever()
 
+    finally:
+        read_executor.shutdown()
+        write_executor.shutdown()
 
-def ask_for_record_data(table_name, menu_choice): 
+
+def read_ledger_registry():
     """
-    ask_for_record_data uses the ask_for_date, ask_for_amount_in_pounds, 
-    ask_for_category, ask_for_description functions to get the date, amount,
-    category and description of a new record from the user. 
+    read_ledger_registry reads the registered ledgers from 
+    LEDGER_REGISTRY_FILE.
 
-    Parameters  :   table_name : str
-                        The name of the table the information is used for.
-                        Either 'Income' or 'Expenses'. 
-                    menu_choice : str
-                        The menu choice chosen in the main code. 
+    Parameters  :
 
-    Returns     :   record_data : list
-                        A list containing the record of an income, expense
-                        or a goal. If the record is from an income or expense
-                        the list is in the format [date, amount, category, 
-                        description], if the record is for a budget the 
-                        record_data is in the format [category, amount]
-                        and if the record is for a goal the format is 
-                        [date, amount, description]
+    Returns     :   ledgers : dict
+                        The database file of each ledger in the form 
+                        {name: path}, which is empty if no ledgers have been
+                        registered.
     """
-    
-    if table_name == "Expenses" or table_name == "Income":
-        date = ask_for_date()
-        amount = ask_for_amount_in_pounds()
-        category = ask_for_category(table_name, menu_choice)
-        description = ask_for_description()
-    
-        record_data = [date, amount, category, description]
-    
+    try:
+        with open(LEDGER_REGISTRY_FILE, 'r') as file:
+            ledgers = json.load(file)
 
-    elif table_name == "Budget":
+    except FileNotFoundError:
+        ledgers = {}
 
-        print("\nWe will now ask you which category you would like to set" 
-              +  "a budget for.")
-        category = ask_for_category("Expenses", menu_choice)
+    return ledgers
 
-        print(f"\nWe will now ask you the weekly budget for \'{category}\'.")
-        budget = ask_for_amount_in_pounds()
 
-        record_data = [category, budget]
+def write_ledger_registry(ledgers):
+    """
+    write_ledger_registry saves the registered ledgers to 
+    LEDGER_REGISTRY_FILE. The ledgers are written to a temporary file which
+    then takes the place of the registry, so the registry is never left 
+    half written.
 
+    Parameters  :   ledgers : dict
+                        The database file of each ledger in the form 
+                        {name: path}.
 
-    elif table_name == "Goals":
-        print("We will now ask you to enter the date this goal starts.")
-        date = ask_for_date()
-        print("\nNow we will ask what your goal amount is.")
-        amount = ask_for_amount_in_pounds()
-        description = ask_for_description()
+    Returns     :
+    """
+    with open(LEDGER_REGISTRY_FILE + ".tmp", 'w') as file:
+        json.dump(ledgers, file, indent = 2, sort_keys = True)
 
-        record_data = [date, amount, description]
+    os.replace(LEDGER_REGISTRY_FILE + ".tmp", LEDGER_REGISTRY_FILE)
 
-    return record_data
 
+def register_ledger(ledger_name, db_path):
+    """
+    register_ledger adds a ledger to the registry, or changes the database
+    file of a ledger which is already registered. The full path of the file
+    is kept so the ledger can be used from any directory. The database is 
+    made the first time the ledger is used if it doesn't exist yet.
 
-def ask_for_date_range ():
-    """"
-    ask_for_date_range asks the user the time range in which they
-    would like to view the records and starting from what date. 
+    Parameters  :   ledger_name : str
+                        The name of the ledger.
+                    db_path : str
+                        The path of the database file of the ledger.
 
-    Parameters  :
+    Returns     :
+    """
+    ledgers = read_ledger_registry()
+    ledgers[ledger_name] = os.path.abspath(db_path)
+    write_ledger_registry(ledgers)
 
-    Returns     :   date_range : list
-                        A list consisting of the start_date of the search 
-                        and the end_date of the search   
+
+def remove_ledger(ledger_name):
     """
+    remove_ledger takes a ledger out of the registry. Its database file is 
+    kept.
 
-    print("\nWe will now ask you the earliest date you would like to start "
-          + "viewing from")
-    start_date = ask_for_date()
-    start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-   
+    Parameters  :   ledger_name : str
+                        The name of the ledger.
 
+    Returns     :
 
-    no_of_days = input("""\nPlease input the number of days in which you would
-like to look over. Please pick a number of days between 1 and 30.\n""")
-        
-    no_of_days = check_in_range(no_of_days,30,1)   
-    
-    # We take 1 away as we will use the BETWEEN operator which is inclusive.
-    end_date = start_date + datetime.timedelta(days = no_of_days -1)
+    Raises      :   ValueError
+                        If there is no ledger with the name.
+    """
+    ledgers = read_ledger_registry()
 
-    date_range = [start_date, end_date]
+    if ledger_name not in ledgers:
+        raise ValueError(f"\'{ledger_name}\' is not a registered ledger.")
 
-    return date_range
+    del ledgers[ledger_name]
+    write_ledger_registry(ledgers)
 
 
-def calculate_total(record_list):
+def find_ledger(ledger_name):
     """
-    calculate_total calculates the total amount in a list of records
-    where the amount of each record is at index 1. 
+    find_ledger finds the database file of a registered ledger.
 
-    Parameters  :   record_list : list
-                        A list of records where each record has their amount 
-                        at index 1
-    
-    Returns     :   total : float
-                        The amounts of each recored summed together.   
+    Parameters  :   ledger_name : str
+                        The name of the ledger.
+
+    Returns     :   db_path : str
+                        The path of the database file of the ledger.
+
+    Raises      :   ValueError
+                        If there is no ledger with the name.
     """
+    ledgers = read_ledger_registry()
 
-    total = 0 
+    if ledger_name not in ledgers:
+        raise ValueError(f"\'{ledger_name}\' is not a registered ledger, "
+                         + "use --add-ledger to register it.")
 
-    for record in record_list:
-        total += record[1]
-    
-    return total
+    return ledgers[ledger_name]
 
 
-def display_total(table_name, record_list, date_range, category = None): 
+def summarise_ledger(db_path, start_date, end_date):
     """
-    display_total finds the total of all the amounts in a collected list of 
-    records and displays the result to the user. 
-    
-    Parameters  :   table_name : str
-                        The name of the table the data was fetched from. 
-                    record_list : list
-                        A list containing records with each record being 
-                        in the format [date, amount, category, description].
-                    date_range : list
-                        A list containing the start and end dates which the 
-                        records take place over. 
+    summarise_ledger finds the partial aggregates of one ledger which are 
+    merged into a consolidated report by merge_ledger_summaries: the totals
+    of its Income and Expenses between two dates, its budget report and 
+    the progress of its goals. It is run in its own process by 
+    summarise_ledgers, so it opens the database of the ledger with 
+    connect_to_database and closes it again at the end.
+
+    Parameters  :   db_path : str
+                        The path of the database file of the ledger.
+                    start_date : datetime.date
+                        The earliest date of the records.
+                    end_date : datetime.date
+                        The latest date of the records.
 
-    Returns     :   
+    Returns     :   summary : dict
+                        The totals from retrieve_totals under "Income" and
+                        "Expenses", the report from retrieve_budget_report 
+                        under "BudgetReport" and a list of [number of goals,
+                        total of the goals, total left to save] in pence 
+                        under "Goals".
+
+    Raises      :   FileNotFoundError
+                        If the database file does not exist.
     """
-    total = calculate_total(record_list)
+    # connect_to_database would make a new database if there wasn't one.
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Unfortunately {db_path} could not be "
+                                + "found.")
 
-    if table_name == "Income":
-        print(f"\nBetween {date_range[0]} and {date_range[1]} you have earned"
-            + f" a total of £{total:.2f}")
-        
-        if category != None:
-            print (f"in the \'{category}\' category.")
-        
-        
-    elif table_name == "Expenses":
-        print(f"Between {date_range[0]} and {date_range[1]} you have spent"
-              + f" a total of £{total:.2f}.")
-        
-        if category != None: 
-            budget = budget_for_category_over_date(category,date_range[0],
-                                                   date_range[1])
-            if budget != None and budget > total:
-                print(f"Well done! This is under the \'{category}\' budget"
-                    + f" between {date_range[0]} \nand {date_range[1]}"
-                    + f" of £{budget:.2f}.")
-            
-            elif budget != None and budget <= total:
-                print("Unfortunately the budget over this time for " 
-                      + f"\'{category}\' is £{budget:.2f}."
-                      + "\nWe must try and spend less!")
+    connect_to_database(db_path)
+
+    try:
+        summary = {
+            "Income": retrieve_totals("Income", start_date, end_date),
+            "Expenses": retrieve_totals("Expenses", start_date, end_date),
+            "BudgetReport": retrieve_budget_report(start_date, end_date)}
         
+        [goal_records_original, goal_records] = calculate_goal_progress()
+        summary["Goals"] = [len(goal_records_original), 
+                            sum(record[1] for record in goal_records_original),
+                            sum(record[1] for record in goal_records)]
 
-def view_records (table_name, menu_choice):
-    """
-    view_records asks the user to provide a period of time which they like
-    to view the records of, using the ask_for_date_range function. If the 
-    user has chosent to view by category they wll be asked which category 
-    they would like to view. Then all the relevant records are fetched using 
-    the retrieve_income_expense function and displayed using the 
-    display_as_table function. 
+    finally:
+        close_database()
 
-    Parameters  :   table_name : str
-                        The name of the table the user has selected to view.
-                    menu_choice : str
-                        The menu choice of the user in the main code.
-    
-    Returns     :   
+    return summary
+
+
+def merge_ledger_summaries(summaries):
     """
-    date_range = ask_for_date_range()
+    merge_ledger_summaries merges the summaries of several ledgers made by 
+    summarise_ledger into one summary of the same form. The totals, 
+    numbers of records and goals are added up and the smallest and largest
+    amounts are the smallest and largest of any ledger. In the budget 
+    report the budgets and spending of each category are added up across 
+    the ledgers before the budget left and percentage used are worked out, 
+    so a category is compared with the budgets of the ledgers which have 
+    one.
+
+    Parameters  :   summaries : list
+                        The summary of each ledger.
+
+    Returns     :   consolidated_summary : dict
+                        The merged summary.
+    """
+    consolidated_summary = {}
 
-    # The category is necessary when viewing by category or viewing the budget. 
-    if menu_choice == "3" or menu_choice == "6" :
-    
-        category = ask_for_category(table_name,menu_choice)
-    
-    else :
-        category = None
-    
-    records = retrieve_income_expense(table_name, date_range[0],
-                                       date_range[1], category)
-    
-    if len(records) == 0:
-        print(f"Unfortunately, there are no records between {date_range[0]}"
-              + f" and {date_range[1]}")
-        return
-    
-    display_as_table(table_name, records)
+    for table_name in ["Income", "Expenses"]:
+        totals = [summary[table_name] for summary in summaries]
+        smallest_amounts = [total[2] for total in totals if total[2] != None]
+        largest_amounts = [total[3] for total in totals if total[3] != None]
 
-    display_total(table_name,records,date_range, category)
-    return
+        consolidated_summary[table_name] = [
+            sum(total[0] for total in totals), 
+            sum(total[1] for total in totals),
+            min(smallest_amounts, default = None),
+            max(largest_amounts, default = None)]
 
+    # The budget and spending of each category in the form 
+    # {category: [budget, spent]}, with the budget None until a ledger 
+    # with a budget for the category is found.
+    categories = {}
 
-def retrieve_by_id(table_name, id_):
-    """
-    retrieve_by_id searches a table for a record with a certain ID and 
-    returns the record if one is found. 
-    
-    Parameter:  id_ : int 
-                    The ID number of the book to be searched for
+    for summary in summaries:
+        for (category, budget, spent, _, _) in summary["BudgetReport"]:
+            category_totals = categories.setdefault(category, [None, 0])
 
+            if budget != None:
+                category_totals[0] = (category_totals[0] or 0) + budget
 
-    Returns:    id_record : list / NoneType
-                    The record of the book with the ID provided or 
-                    None if there is no record with the ID 
-    """
+            category_totals[1] += spent
 
-    cursor.execute(f'''SELECT date, amount, category, description, id
-                   FROM {table_name} WHERE id = (?) ''', (id_,))
-    id_record = cursor.fetchone()
-    db.commit()
+    budget_report = []
 
-    return id_record 
+    for category, [budget, spent] in sorted(categories.items()):
+        if budget == None:
+            budget_report.append([category, None, spent, None, None])
 
+        elif budget > 0:
+            budget_report.append([category, budget, spent, budget - spent,
+                                  spent * 100 / budget])
 
-def ask_for_id(table_name):
-        """
-        ask_for_id asks the user to provide the I.D. of a record they wish
-        to edit. The record will be searched for with the retrieve_by_id 
-        function If they provide an I.D. of a record which is not in the 
-        the table, they will be asked if they want to submit another I.D.. 
-        If a record is found with the user inputted I.D., the record
-        will be displayed to them using the display_as_table function and 
-        they will be asked if this is the record they wish to edit. If the
-        user wishes to edit the found record, that record is returned, if 
-        they don't wish to edit a record None will be returned. 
+        else:
+            budget_report.append([category, budget, spent, budget - spent,
+                                  None])
 
-        Parameters  :   table_name : str
-                            The name of the table in which the record is to
-                            be searched for. 
-        
-        Returns     :   id_record : list
-                            A list containing a record which the user wishes
-                            to edit
-                        None
-                            It returns None if the user does not wish to 
-                            edit a record. 
-        """
-        while True:
-            id_ =  input("\nPlease input the I.D\n")
-            id_ = check_number(id_, "int")
-            id_record = retrieve_by_id(table_name, id_)
+    consolidated_summary["BudgetReport"] = budget_report
+    consolidated_summary["Goals"] = [
+        sum(summary["Goals"][i] for summary in summaries) for i in range(3)]
 
-            if id_record == None:
-                print("\nUnfortunately there is no record with this I.D.")
-                try_again = input("\nWould you like to try a different I.D.?"
-                                  +"\n")
-                try_again = check_yes_no(try_again)
+    return consolidated_summary
 
-            else:
-                display_as_table(table_name, id_record)
 
-                correct_record = input("\nIs the record above, the record"
-                                       + " you wish to edit?\n")
-                correct_record = check_yes_no(correct_record)
+def summarise_ledgers(db_paths, start_date, end_date):
+    """
+    summarise_ledgers finds the summary of each ledger with 
+    summarise_ledger, with the ledgers summarised at the same time as each 
+    other in a pool of processes, one for each ledger up to the number of 
+    CPUs. The processes are forked from this one so that they don't load
+    this file again, which would start the app. Where processes can't be 
+    forked, such as on Windows, the ledgers are summarised one at a time. 
+    A ledger which can't be read, such as one whose database is missing, 
+    locked by another program or damaged, doesn't stop the others being 
+    summarised.
+
+    Parameters  :   db_paths : list
+                        The paths of the database files of the ledgers.
+                    start_date : datetime.date
+                        The earliest date of the records.
+                    end_date : datetime.date
+                        The latest date of the records.
 
-                if correct_record == "no":
-                    try_again = input("Would you like to try a different"
-                                      +" I.D.?\n")
-                    try_again = check_yes_no(try_again)
+    Returns     :   summaries : list
+                        The summary of each ledger, in the same order as 
+                        db_paths. The summary of a ledger which couldn't be
+                        read is replaced with the reason why under "Error".
+    """
+    summaries = []
 
-                elif correct_record == "yes": 
-                    return id_record 
-            
-            if try_again == "yes":
-                continue
+    if "fork" not in multiprocessing.get_all_start_methods():
+        for db_path in db_paths:
+            try:
+                summaries.append(summarise_ledger(db_path, start_date, 
+                                                  end_date))
 
-            elif try_again == "no" :
-                print("\nNo information has been altered.\n")
-                return None
+            except (sqlite3.Error, FileNotFoundError) as e:
+                summaries.append({"Error": str(e)})
+
+        return summaries
+
+    no_of_processes = max(1, min(len(db_paths), os.cpu_count() or 1))
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers = no_of_processes, 
+        mp_context = multiprocessing.get_context("fork")) as executor:
+        futures = [executor.submit(summarise_ledger, db_path, start_date, 
+                                   end_date) for db_path in db_paths]
+
+        for future in futures:
+            try:
+                summaries.append(future.result())
+
+            except (sqlite3.Error, FileNotFoundError) as e:
+                summaries.append({"Error": str(e)})
+
+    return summaries
 
 
-def rename_delete_category(table_name, rename_or_delete):
+def display_consolidated_report(ledgers, summaries, date_range):
     """
-    rename_delete_category asks the user to chose the category name they 
-    wish to change and then updates the table so that all the records 
-    within that category are within the new category. If the user has 
-    chosen to rename the category they can choose the category's new name
-    but if they have chosen to delete a category then the category will
-    default to "Misc". 
-
-    Parameters  :   table_name  
-                        The name of the table in which the chosen category
-                        will be changed.
-                    rename_or_delete
-                        Either "rename" or "delete". The choice whether 
-                        the user will rename or delete the category. 
+    display_consolidated_report shows the income, expenses, profit and 
+    amount left to save of each ledger and of all of them together, then 
+    the consolidated budget report with display_budget_report and the 
+    consolidated progress of the goals.
+
+    Parameters  :   ledgers : list
+                        The names of the ledgers.
+                    summaries : list
+                        The summary of each ledger from summarise_ledgers,
+                        in the same order as ledgers.
+                    date_range : list
+                        The [start_date, end_date] of the report.
 
     Returns     :
     """
+    consolidated_summary = merge_ledger_summaries(summaries)
+    ledger_records = []
 
-    print("\nWe will now ask you to choose which category you wish to"
-          +" update.")
-    # Here we have chosen to set the function ask_for_category 's menu_choice
-    # as "2" so that the user can not make a new category up.
+    for ledger_name, summary in zip(ledgers + ["All Ledgers"], 
+                                    summaries + [consolidated_summary]):
+        income = summary["Income"][0]
+        expenses = summary["Expenses"][0]
+        ledger_records.append([ledger_name, income, expenses, 
+                               income - expenses, summary["Goals"][2]])
 
-    if rename_or_delete == "rename":
-        original_category = ask_for_category(table_name, "2")
+    print(f"\nHere are the totals of your {len(ledgers)} ledgers between "
+          + f"{date_range[0]} and {date_range[1]}.")
+    display_as_table("Ledgers", ledger_records)
 
-        print("\nNow we will ask you for what you would like to change the"
-            + " category to?")
-        # Here we have set the function ask_for_category's menu_choice as "4"
-        # so that the user has the option to make up a new category name.
-        new_category = ask_for_category(table_name, "4")
+    display_budget_report(consolidated_summary["BudgetReport"], date_range)
 
-    elif rename_or_delete == "delete":
-        original_category = ask_for_category(table_name, "2", "delete")
+    [no_of_goals, goals_total, left_to_save] = consolidated_summary["Goals"]
 
-        new_category = "Misc"
+    if no_of_goals != 0:
+        print(f"\nAcross your ledgers you have {no_of_goals} goal(s) worth "
+              + f"£{format_pounds(goals_total)}, with "
+              + f"£{format_pounds(left_to_save)} left to save.")
 
-    cursor.execute(f'''
-        UPDATE {table_name} SET category = ? WHERE category = ?''' 
-        ,(new_category, original_category))
-    db.commit()
 
-    print(f"\nAll records in the \'{original_category}\' are now in the \'"
-          + f"{new_category}\' category.\n")
+# MAIN CODE
+parser = argparse.ArgumentParser(description = "An expense and budget "
+                                 + "tracker app using SQLite.")
+parser.add_argument("--check-indexes", action = "store_true", 
+                    help = "check that every query the app issues uses an"
+                    + " index and then quit.")
+parser.add_argument("--benchmark-goals", type = int, metavar = "NO_OF_GOALS",
+                    help = "time the sharing of profits between this many "
+                    + "randomly generated goals and then quit.")
+parser.add_argument("--rebuild-totals", action = "store_true", 
+                    help = "add up the daily totals of every day and "
+                    + "category again from the records and then quit.")
+parser.add_argument("--import", dest = "import_file", metavar = "FILE",
+                    help = "add the records in a CSV file in the same format"
+                    + " as Income_expense_goals.csv and then quit.")
+parser.add_argument("--commands", type = argparse.FileType('r'), 
+                    metavar = "FILE", help = "carry out the batch commands "
+                    + "in a file (or - for standard input), one per line, "
+                    + "and then quit.")
+parser.add_argument("command", nargs = "*", 
+                    help = "a batch command to carry out without any "
+                    + "questions, such as: add Expenses 2024-09-01 12.50 "
+                    + "Groceries \"Weekly shop\". The app quits afterwards.")
+parser.add_argument("--benchmark", type = int, nargs = "+", 
+                    metavar = "NO_OF_ROWS", help = "time the core operations"
+                    + " on synthetic ledgers with each number of records, "
+                    + "print the results as JSON and then quit.")
+parser.add_argument("--benchmark-output", metavar = "FILE", 
+                    help = "save the --benchmark results to a JSON file "
+                    + "instead of printing them.")
+parser.add_argument("--analytics", nargs = 2, 
+                    metavar = ("START_DATE", "END_DATE"),
+                    help = "show the totals of each category, the highest "
+                    + "spending over 30 days and the cash flow between two "
+                    + "dates using NumPy and then quit.")
+parser.add_argument("--snapshot", metavar = "FILE", 
+                    help = "write the income and expense records to a "
+                    + "snapshot file which --from-snapshot can read without"
+                    + " the database and then quit.")
+parser.add_argument("--from-snapshot", metavar = "FILE", 
+                    help = "read the records for --analytics from a snapshot"
+                    + " written by --snapshot rather than the database.")
+ledger_arguments = parser.add_mutually_exclusive_group()
+ledger_arguments.add_argument("--db", default = "budget_app_db", 
+                              metavar = "FILE", help = "the database file to"
+                              + " use, budget_app_db if not given.")
+ledger_arguments.add_argument("--ledger", metavar = "NAME", 
+                              help = "use the database file of a ledger "
+                              + "registered with --add-ledger.")
+parser.add_argument("--add-ledger", nargs = 2, metavar = ("NAME", "FILE"),
+                    help = f"register a ledger and its database file in "
+                    + f"{LEDGER_REGISTRY_FILE} and then quit.")
+parser.add_argument("--remove-ledger", metavar = "NAME", 
+                    help = "take a ledger out of the registry, keeping its "
+                    + "database file, and then quit.")
+parser.add_argument("--list-ledgers", action = "store_true", 
+                    help = "show the registered ledgers and then quit.")
+parser.add_argument("--consolidated", nargs = 2, 
+                    metavar = ("START_DATE", "END_DATE"),
+                    help = "show the totals, budgets and goal progress of "
+                    + "every registered ledger together between two dates "
+                    + "and then quit.")
+parser.add_argument("--serve", metavar = "[HOST:]PORT", 
+                    help = "serve the records, totals, budgets and goals as a"
+                    + " JSON service on a port (of 127.0.0.1 if no host is "
+                    + "given) until stopped with Ctrl+C.")
+arguments = parser.parse_args()
+
+if arguments.benchmark_goals != None:
+    benchmark_goal_allocation(arguments.benchmark_goals)
+    exit()
+
+if arguments.benchmark != None:
+    benchmark_results = run_benchmarks(arguments.benchmark)
+
+    if arguments.benchmark_output != None:
+        with open(arguments.benchmark_output, 'w') as file:
+            json.dump(benchmark_results, file, indent = 2)
 
+    else:
+        print(json.dumps(benchmark_results, indent = 2))
 
-def delete_record (table_name):
-    """
-    delete_record finds the record which the user wants to delete and then
-    deletes it from the corresponding table. It then informs the user that
-    the record has been deleted. 
+    exit()
 
-    Parameters  :   table_name
-                        The name of the table the user wishes to delete a 
-                        record from. 
+# A snapshot is read without opening the database at all.
+if arguments.analytics != None and arguments.from_snapshot != None:
 
-    Returns     :       
-    """
-    original_record = ask_for_id(table_name)
+    try:
+        ledgers = open_snapshot(arguments.from_snapshot)
+        print(f"Using the snapshot made at {ledgers['created']}.")
+        date_range = validate_date_range(arguments.analytics[0], 
+                                         arguments.analytics[1])
+        display_analytics(date_range[0], date_range[1], ledgers = ledgers)
 
-    if original_record != None:
+    except FileNotFoundError:
+        print(f"Unfortunately {arguments.from_snapshot} could not be found.")
 
-        id_ = original_record[-1]
+    except (ImportError, ValueError) as e:
+        print(e)
 
-        cursor.execute(f'''DELETE FROM {table_name} WHERE id = ?''',(id_,))
-        db.commit()
+    exit()
 
-        print(f"The following record has been deleted from the {table_name}"
-              + " table:")
-        print("")
-        display_as_table(table_name, original_record)
+# The registry and consolidated reports don't use any one database.
+if arguments.add_ledger != None:
+    register_ledger(arguments.add_ledger[0], arguments.add_ledger[1])
+    print(f"The ledger \'{arguments.add_ledger[0]}\' uses "
+          + f"{find_ledger(arguments.add_ledger[0])}.")
+    exit()
 
+if arguments.remove_ledger != None:
 
-def update_record (table_name):
-    """
-    update_record asks the user for a record to change by using the as_for_id
-    function. Once the record is found the user is then asked to update 
-    each column. With the new column data, the record is updated and the
-    user is informed of this and displayed the change using the 
-    display_as_table function. 
+    try:
+        remove_ledger(arguments.remove_ledger)
+        print(f"The ledger \'{arguments.remove_ledger}\' has been removed.")
 
-    Parameters  :   table_name : str
-                        The name of the table where the record resides. 
+    except ValueError as e:
+        print(e)
 
-    Returns     :       
-    """
-    original_record = ask_for_id(table_name)
+    exit()
 
-    if original_record != None:
+if arguments.list_ledgers:
+    ledgers = read_ledger_registry()
 
-        id_ = original_record[-1]
+    if len(ledgers) == 0:
+        print("No ledgers have been registered, use --add-ledger to "
+              + "register one.")
 
-        print("\nWe will now ask you to put in the correct information.")
+    for ledger_name, db_path in sorted(ledgers.items()):
+        print(f"{ledger_name}: {db_path}")
 
-        if table_name == "Expenses" or table_name == "Income":
+    exit()
 
-            # The menu_choice for ask_for_record_data is chosen to be "4" to 
-            # allow the user to add a new category if they wish to. 
-            new_record = ask_for_record_data(table_name, "4")
-            new_record.append(id_)
+if arguments.consolidated != None:
+    ledgers = read_ledger_registry()
 
-            cursor.execute(f'''UPDATE {table_name} 
-SET date = ?, amount = ?, category = ?, description = ? 
-WHERE  id = ? ''', (new_record))
-            db.commit()
-            
-            print("This record has now been changed to:")
-            display_as_table(table_name, new_record)
+    try:
+        date_range = validate_date_range(arguments.consolidated[0], 
+                                         arguments.consolidated[1])
+
+        if len(ledgers) == 0:
+            raise ValueError("No ledgers have been registered, use "
+                             + "--add-ledger to register them.")
+
+        ledger_names = sorted(ledgers)
+        summaries = summarise_ledgers([ledgers[ledger_name] 
+                                       for ledger_name in ledger_names],
+                                      date_range[0], date_range[1])
+        # The ledgers which could be read are reported on and the rest are 
+        # listed with the reason they were left out.
+        read_ledger_names = []
+        read_summaries = []
+
+        for ledger_name, summary in zip(ledger_names, summaries):
+            if "Error" in summary:
+                print(f"\nThe ledger \'{ledger_name}\' has been left out of "
+                      + f"the report: {summary['Error']}")
+                continue
 
-        elif table_name == "Goals":
-            ""
-    return
+            read_ledger_names.append(ledger_name)
+            read_summaries.append(summary)
 
+        if len(read_summaries) != 0:
+            display_consolidated_report(read_ledger_names, read_summaries, 
+                                        date_range)
 
-def edit_table(table_name):
-    """
-    edit_table asks the user if they wish to update a record, delete a 
-    record, rename a category, delete a category or carry on without 
-    doing any of them. The functions update_record, delete_record and 
-    rename_delete_category are used to fulfil the users choice. 
+    except (ValueError, FileNotFoundError, sqlite3.Error) as e:
+        print(e)
 
-    Parameters  :   table_name
-                        The name of the table which the user's choice will
-                        be used on. 
+    exit()
 
-    Returns     :
-    """
+# Create or open a file called 'budget_app_db', or the file given with 
+# --db or of the ledger given with --ledger, with a SQLite3 Database.
+if arguments.ledger != None:
 
-    while True:
+    try:
+        db_path = find_ledger(arguments.ledger)
 
-        edit_choice = input("""\nPlease choose whether you would like to:
-1. Update a record
-2. Delete a record
-3. Rename a category
-4. Delete a category 
-5. None of the above.\n\n""")
-        
-        if edit_choice == "1" :
-            update_record(table_name)
-            return
+    except ValueError as e:
+        print(e)
+        exit()
 
-        elif edit_choice == "2":
-            delete_record(table_name)
-            return
-            
-        elif edit_choice == "3":
-            rename_delete_category(table_name, "rename")
-            return
+else:
+    db_path = arguments.db
 
-        elif edit_choice == "4":
-            print("\nWhen we delete a category, the records within that"
-                  + " category move to the Misc category. ")
-            rename_delete_category(table_name, "delete")
-            return
+connect_to_database(db_path)
 
-        elif edit_choice == "5":
-            return
-        else: 
-            print("Please only input \"1\", \"2\", \"3\" or \"4\"")
 
+if arguments.snapshot != None:
+    write_snapshot(arguments.snapshot)
 
-def display_goal_progress(original_goal_records, current_progress_records):
-    """
-    display_goal_progress calculates how far the user has gotten in achieving
-    their goals. It takes the current progress and compares it to the original
-    goal. Depending on the progress, the function gives a message to the user
-    detailing their progress.
+    close_database()
+    exit()
 
-    Parameters  :   original_goal_records : list
-                        A list containing all the original records of the 
-                        goals. The records are in the format [date, amount,
-                        description, id].
-                    current_progress_records : list
-                        A list containing all the progress of the goals to
-                        today. The records are in the format [date, amount,
-                        description, id].
 
-    Returns     :
-    """    
-    current_progress_id_list = []
-    
-    for record in range(len(current_progress_records)):
-        progress_id = current_progress_records[record][3]
-        current_progress_id_list.append(progress_id)
+if arguments.serve != None:
+    (host, _, port) = arguments.serve.rpartition(":")
 
-    for i in range(len(original_goal_records)):
-        # The I.D. is used to find the index of this goal
-        # in the current_progress_records list.
-        original_id = original_goal_records[i][3]
-        record_index = current_progress_id_list.index(original_id)
+    try:
+        asyncio.run(run_service(host or "127.0.0.1", int(port)))
 
-        date_ = original_goal_records[i][0]
-        original_amount = original_goal_records[i][1]
-        description = original_goal_records[i][2]
+    except KeyboardInterrupt:
+        print("\nThe JSON service has been stopped.")
 
-        current_amount = current_progress_records[record_index][1]
+    except (ValueError, OSError) as e:
+        print(f"Unfortunately the JSON service could not be started: {e}")
 
-        # Find the amount 
-        amount_difference = abs(original_amount - current_amount)
-        difference_percentage = (amount_difference/original_amount) * 100
-        difference_percentage = round(difference_percentage,1)
+    close_database()
+    exit()
 
-        # Convert the amounts to str to 2 decimal places. 
-        original_amount_str =  f"{original_amount:.2f}"
-        current_amount_str = f"{current_amount:.2f}"
-        amount_difference_str = f"{amount_difference:.2f}"
-            
 
+if arguments.rebuild_totals:
+    # The checkpoint of the goal progress was found from the old totals.
+    with transaction():
+        rebuild_daily_totals()
+        cursor.execute('''DELETE FROM GoalCheckpoint''')
 
-        print("\n\nGoal Description:\n-----------------\n")
-        print("\'" + description + "\'\n")
-        
-        # Inform the user how their goal is going
-        if original_amount < current_amount:
+    print("The daily totals have been rebuilt from the records.")
 
-            print("Unfortunately it seems as though you have been spending"
-                + f" too much!\nThis goal was set on {date_} with a goal"
-                + f" of £{original_amount_str} but today the \ngoal is now £"
-                + f"{current_amount_str}. Don't worry, you can \nget back on"
-                + "track!")
-            
-        elif difference_percentage == 0:
+    close_database()
+    exit()
 
-            print("We are just getting started!\nLet\'s get to saving!\n"
-                + f"This goal was set on {date_} to save £"
-                + f"{original_amount_str}.\nWe haven't saved any yet, but I "
-                + "believe in you!") 
 
+if arguments.analytics != None:
 
-        elif difference_percentage < 50:
+    try:
+        date_range = validate_date_range(arguments.analytics[0], 
+                                         arguments.analytics[1])
+        display_analytics(date_range[0], date_range[1])
 
-            print("We are off to a really strong start!\nThis goals was set "
-                + f"on {date_} and you have already \nmanaged to "
-                + f"save £{amount_difference_str} of £{original_amount_str}."
-                + f"\nThat\'s {difference_percentage}% of the way there!\n")
-            
-        elif difference_percentage >= 50 and difference_percentage < 100: 
-            print("Incredible!\nWe are almost there!\nThis goal was set on"
-                  + f"{date_} and you have managed \nto save a whopping "
-                  + f"{difference_percentage}%.\nThat's right you have saved"
-                  + f"£{amount_difference_str} of £{original_amount_str}."
-                  + "\nThe end is in sight!")
-            
-        elif difference_percentage == 100:
-            print("Holy Moly!!!!!\nYou\'ve only gone and done it!\nYou have"
-                + f"saved the full £{original_amount_str}.\nI bet that feels"
-                + "good!")
-    
+    except (ImportError, ValueError) as e:
+        print(e)
 
-        
+    close_database()
+    exit()
 
 
-# MAIN CODE
-try: 
+if arguments.check_indexes:
+    unindexed_queries = check_query_plans()
 
-    # Create or open a file called 'budget_app_db' with a SQLite3 Database.       
-    db = sqlite3.connect('budget_app_db')
-    cursor = db.cursor()
+    if len(unindexed_queries) == 0:
+        print("Every query the app issues uses an index.")
 
-    # Create a table called 'Income' if it doesn't exist.
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS 
-        Income( id INTEGER PRIMARY KEY, date DATE, amount REAL, 
-            category TEXT DEFAULT "Misc" NOT NULL, description TEXT)
-                ''')
-    db.commit()
+    else:
+        print("The following queries do not use an index:\n")
+        for [query, detail] in unindexed_queries:
+            print(f"{query}\n    {detail}\n")
 
-    # Create  a table called 'Expenses' if it doesn't exist.
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS
-        Expenses( id INTEGER PRIMARY KEY,  date DATE,  amount REAL, 
-            category TEXT DEFAULT "Misc" NOT NULL, description TEXT)
-                   ''')
-    db.commit()
+    close_database()
+    exit(len(unindexed_queries) != 0)
 
 
-    # Create a table called 'Budget" if it doesn't exist
-    # The Budget table will hold the weekly budget for the categories in 
-    # Expenses. 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS
-        Budget( category TEXT PRIMARY KEY, budget REAL)
-''')
-    db.commit()
+if arguments.import_file != None:
 
-    # Create a table called "Goals" if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS
-        Goals( date DATE, amount REAL, description TEXT,  
-                   id INTEGER PRIMARY KEY)
-''')
-    db.commit()
+    try:
+        import_csv(arguments.import_file)
 
-except Exception as e: 
+    except FileNotFoundError:
+        print(f"Unfortunately {arguments.import_file} could not be found.")
 
-    # Roll back any change if something goes wrong.
-    db.rollback()
-    raise e
+    close_database()
+    exit()
 
 
-print("\nAs this is a demo app, we recommend populating the tables with "
-      + "example data.")
-populate_tables = input("Would you like to populate the tables?\n")
-populate_tables = check_yes_no(populate_tables)
+if arguments.commands != None or len(arguments.command) != 0:
+    no_of_failed = 0
 
+    if len(arguments.command) != 0:
+        try:
+            run_command(arguments.command)
 
-if populate_tables == "yes":
+        except ValueError as e:
+            print(e)
+            no_of_failed += 1
 
-    income_record_list = []
-    expense_record_list = []
-    budget_record_list = []
-    goals_record_list = []
+        except sqlite3.Error as e:
+            print(f"The database could not be used, {e}.")
+            no_of_failed += 1
 
-    try:
-        # Open "Income_expense_goals" 
-        with open("Income_expense_goals.csv", 'r') as file:
-            csvreader = csv.reader(file)
+    if arguments.commands != None:
+        no_of_failed += run_commands(arguments.commands)
 
-            for read_in_record in csvreader:
-                # For each table the second column is a number and so 
-                # we must convert this to a float for each record.
-                read_in_record[1] = float(read_in_record[1])
+    close_database()
+    exit(no_of_failed != 0)
 
-                if read_in_record[-1] == "Income":
-                    read_in_income = read_in_record[:-1]
-                    income_record_list.append(read_in_income)
-                    
 
-                elif read_in_record[-1] == "Expenses" : 
-                    read_in_expense = read_in_record[:-1]
-                    expense_record_list.append(read_in_expense)
-                    
-                elif read_in_record[-1] == "Budget":
-                    read_in_budget = read_in_record[:-1]
-                    budget_record_list.append(read_in_budget)
+print("\nAs this is a demo app, we recommend populating the tables with "
+      + "example data.")
+populate_tables = input("Would you like to populate the tables?\n")
+populate_tables = check_yes_no(populate_tables)
 
 
-                elif read_in_record[-1] == "Goals":
-                    read_in_goals = read_in_record[:-1]
-                    goals_record_list.append(read_in_goals)
+if populate_tables == "yes":
 
-        add_to_table("Income", income_record_list, "yes")
-        add_to_table("Expenses", expense_record_list, "yes")
-        add_to_table("Budget",budget_record_list,"yes")
-        add_to_table("Goals", goals_record_list,"yes")
+    try:
+        import_csv("Income_expense_goals.csv")
     
     except FileNotFoundError:
         print("\n\nUnfortunately Income_expense_goals.csv could not be found."
@@ -1395,34 +6542,30 @@ What operation would you like to perform:
 
         [category, budget] = ask_for_record_data("Budget", menu)
 
-        budget_categories = retrieve_categories("Budget", "not")
-
-        # If the user's chosen category is already in the Budget table 
-        # then update that budget, otherwise insert a new budget. 
-        if (category,) in budget_categories:
-            cursor.execute('''UPDATE Budget SET budget = ? 
-                           WHERE category = ? ''', (budget, category))
-            db.commit()
-            
-        else:
-            cursor.execute('''INSERT INTO Budget(category, budget)
-                           VALUES (?,?)''', (category, budget))
-            db.commit()
+        set_budget(category, budget)
         
         print(f"\'{category}\' now has a weekly budget of £"
-              + f"{budget:.2f}.")
+              + f"{format_pounds(budget)}.")
 
 
     # View budget for a category
     elif menu == "8":
 
-        cursor.execute('''SELECT * FROM Budget ORDER BY category''')
+        cursor.execute(BUDGETS_QUERY)
         budget_records = cursor.fetchall()
-        db.commit()
 
         print("Here are all of the budgets you have set.")
         display_as_table("Budget", budget_records)
 
+        compare_or_not = input("Would you like to compare your spending in"
+                               + " every category with these budgets?\n")
+
+        if check_yes_no(compare_or_not) == "yes":
+            date_range = ask_for_date_range()
+            budget_report = retrieve_budget_report(date_range[0], 
+                                                   date_range[1])
+            display_budget_report(budget_report, date_range)
+
 
     #Set financial goals
     elif menu == "9":
@@ -1434,187 +6577,14 @@ What operation would you like to perform:
     # View progress towards financial goals
     elif menu == "10":
 
-        # Fetching all the goal records from the Goals table.
-        cursor.execute('''SELECT * FROM Goals ORDER BY DATE''')
-        goal_records_tuple = cursor.fetchall()
-        db.commit()
-
-        # Getting all the distinct dates in order.
-        cursor.execute('''SELECT DISTINCT date FROM Goals ORDER BY date''')
-        goal_dates_distinct_tuple = cursor.fetchall()
-        db.commit()
-
-        # A list of the distinct start dates of the goals
-        goal_dates_distinct = []
-        # A list of the records for each goal.
-        goal_records = []
-        # A copy of the goal_records list containing the original goal records
-        goal_records_original = []
-        # A list of the indivual goal dates. 
-        goal_dates_actual = []
-        # A list of the individual goal amounts which will .
-        goal_amounts = []
-        # A list of the profit the user has generated between the goal dates.
-        profit_between_dates = []
-        # The number of goals which start at each distinct date
-        records_per_date = []
-        
-        today = datetime.date.today()
-        counter = 0
-
-        # Converting the records and dates to lists instead of tuples.
-        for record in goal_records_tuple:
-            record = list(record)
-            record[0] = datetime.datetime.strptime(record[0], 
-                                                       "%Y-%m-%d").date()
-            goal_records.append(record)
-            goal_records_original.append(record)
-
-        
-        for date_ in goal_dates_distinct_tuple:
-            (date_distinct,) = date_
-            date_distinct = datetime.datetime.strptime(date_distinct, 
-                                                      "%Y-%m-%d").date()
-            goal_dates_distinct.append(date_distinct)
-
-
-        for record in goal_records:
-            record = list(record)
-            date = record[0]
-            amount = record[1]
-
-            goal_dates_actual.append(date)
-            goal_amounts.append(amount)
-
-
-
-        for date in goal_dates_distinct:
-
-            # If the goals start_date is today or before carry on
-            if  goal_dates_distinct[counter] <= today: 
-                # if the current date is not the last in the list and the 
-                # next date is before today 
-                if  (len(goal_dates_distinct) >= (counter + 2) and 
-                    goal_dates_distinct[counter + 1] <= today):
-                        
-                        # We must takeaway a day from the end date as
-                        # retrieve_income_expense is inclusive when searching
-                        expenses = retrieve_income_expense("Expenses",
-                                goal_dates_distinct[counter], 
-                                (goal_dates_distinct[counter+1] -
-                                datetime.timedelta(days=1)))
-                        
-                        incomes = retrieve_income_expense("Income", 
-                                    goal_dates_distinct[counter], 
-                                    (goal_dates_distinct[counter + 1] - 
-                                     datetime.timedelta(days=1)))
-                
-                else :
-                    expenses = retrieve_income_expense("Expenses", 
-                                    goal_dates_distinct[counter], today)
-                    incomes = retrieve_income_expense("Income", 
-                                    goal_dates_distinct[counter], today)
-                
-                expense_total = calculate_total(expenses)
-                income_total = calculate_total(incomes)
-                # Find the profit to be added
-                profit = income_total - expense_total
-                profit_between_dates.append(profit)
-
-            else:
-                break
-            counter += 1 
-
-        cumulative_no_records = 0 
-
-        for date_distinct in goal_dates_distinct: 
-            
-            no_of_records = goal_dates_actual.count(date_distinct)
-            cumulative_no_records += no_of_records
-            date_with_number = [date_distinct,cumulative_no_records]
-            records_per_date.append(date_with_number)    
-
-
-        counter  = 0 
-        # Go through the date and number in records_per_date
-        for entry, date_or_number in enumerate(records_per_date):
-
-            # Sort the records by amount ascending order
-            goal_records =sorted(goal_records, key = itemgetter(1))
-            # The number of records left with unachieved goals
-            no_of_records = records_per_date[entry][1]
-            date = records_per_date[entry][0]
-            
-            for i, column in enumerate(goal_records):
-
-                # If the current goal has the same or before the date as 
-                # the current date
-                if goal_records[i][0] <= date :
-
-                    # If the current goal has ended take away their share
-                    # of profit.
-                    if goal_records[i][1] == 0:
-                        no_of_records -= 1
-
-            # If there is no goals that need the profit then no profit
-            # is needed.
-            if no_of_records == 0:
-                share_of_profit = 0
-                        
-            else:
-                # Divide the profit by the number of goals which will share it
-                share_of_profit = (profit_between_dates[entry] / 
-                                    no_of_records)
-                
-            for i, column in enumerate(goal_records):
-                
-                if goal_records[i][0] <= date :
-                        
-                    # If the goal is completed nothing happens to it
-                    if goal_records[i][1] == 0:
-                        continue
-                    
-                    # Else if the goal amount left is less than the profit then 
-                    # the goal is completed and set to 0.
-                    elif goal_records[i][1] <= share_of_profit:
-                        # If there are more records after this adjust the
-                        # next record's share of profit.
-                        if no_of_records != 1:
-                            # share = ((n-1)share_old + difference) / (n-1) 
-                            n = no_of_records
-                            difference = share_of_profit - goal_records[i][1]
-                            profit_left = (n-1) * share_of_profit + difference
-
-                            share_of_profit = profit_left / (n-1)
-
-                        # Set the goal to accomplished
-                        goal_records[i][1] = 0
-                        no_of_records -= 1
-                    
-                    # Else the goal amount is reduced by the share of the
-                    # profits
-                    else:   
-                        goal_records[i][1] -= share_of_profit
-
-                    
-            # If the code isn't on the final entry, then remove the completed 
-            # records from the next records_per_date entry.
-            if entry != len(records_per_date) - 1:
-                no_records_completed = (records_per_date[entry][1]
-                                         - no_of_records)
-                records_per_date[entry+1][1] -= no_records_completed
-
-        # Collect the original goal records.        
-        cursor.execute('''SELECT * FROM Goals ORDER BY DATE''')
-        goal_records_original = cursor.fetchall()
-        db.commit()
+        [goal_records_original, goal_records] = calculate_goal_progress()
 
         display_goal_progress(goal_records_original, goal_records)
 
     # Quit
     elif menu == "11":
 
-        db.close()
+        close_database()
         exit()
     
 
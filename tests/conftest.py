@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the tests of Tracker app.py.
+
+The app is a single script whose main code parses the command line and 
+starts the menu, so the tests load everything before the "# MAIN CODE" 
+marker into a fresh module for each test. Each test then gets its own 
+copy of the app's globals (the connections, the transaction depth and the
+category cache) and its own database file.
+"""
+import pathlib
+import types
+
+import pytest
+
+
+APP_PATH = pathlib.Path(__file__).resolve().parent.parent / "Tracker app.py"
+
+
+def load_app():
+    """
+    load_app loads the functions and settings of Tracker app.py into a new
+    module without running its main code.
+
+    Parameters  :
+
+    Returns     :   app : module
+                        The loaded app.
+    """
+    source = APP_PATH.read_text(encoding = "utf-8")
+    [definitions, marker, main_code] = source.partition("\n# MAIN CODE")
+    assert marker != "", "Tracker app.py has no # MAIN CODE marker."
+
+    app = types.ModuleType("tracker_app")
+    app.__file__ = str(APP_PATH)
+    exec(compile(definitions, str(APP_PATH), "exec"), app.__dict__)
+
+    return app
+
+
+@pytest.fixture(scope = "session")
+def functions():
+    """
+    functions gives the app loaded once for the whole test run, without a 
+    database, for testing the functions which don't use one.
+    """
+    return load_app()
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    app gives a freshly loaded app connected to a new, empty database.
+    """
+    tracker = load_app()
+    tracker.connect_to_database(str(tmp_path / "budget_app_db"))
+
+    yield tracker
+
+    tracker.close_database()
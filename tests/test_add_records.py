@@ -0,0 +1,64 @@
+"""
+Tests that add_to_table gives each new record the ID SQLite gave it, even
+when another program adds records to the same database, and counts the
+budgets it skips.
+"""
+import sqlite3
+
+
+def test_batch_is_given_the_ids_of_its_records(app):
+    records = [["2024-03-01", 300, "Food", "Coffee"],
+               ["2024-03-01", 300, "Food", "Coffee"],
+               ["2024-03-02", 750, "Misc", "Lunch"]]
+
+    assert app.add_to_table("Expenses", records, "yes")["Added"] == 3
+
+    for record in records:
+        assert app.retrieve_by_id("Expenses", record[-1]) == tuple(record)
+
+    assert len({record[-1] for record in records}) == 3
+
+
+def test_ids_are_right_when_another_program_adds_records(app, tmp_path):
+    other_program = sqlite3.connect(str(tmp_path / "budget_app_db"))
+    first_records = [["2024-03-01", 300, "Food", "Coffee"]]
+    app.add_to_table("Expenses", first_records, "yes")
+
+    # The other program's record takes the next ID, so the IDs of the next
+    # batch can't be worked out from the first batch.
+    other_program.execute('''INSERT INTO Expenses(date, amount,
+                          category_id, description, content_hash)
+                          VALUES (2460371, 100, 1, 'Tea', NULL)''')
+    other_program.commit()
+    other_program.close()
+
+    records = [["2024-03-02", 750, "Food", "Lunch"],
+               ["2024-03-03", 200, "Food", "Snack"]]
+    app.add_to_table("Expenses", records, "yes")
+
+    assert [record[-1] for record in records] == [3, 4]
+
+    for record in first_records + records:
+        assert app.retrieve_by_id("Expenses", record[-1]) == tuple(record)
+
+
+def test_goal_is_given_its_id(app):
+    goal = ["2024-05-01", 100000, "Bike"]
+
+    app.add_to_table("Goals", goal, "no")
+
+    app.cursor.execute('''SELECT description FROM Goals WHERE id = ?''',
+                       (goal[-1],))
+    assert app.cursor.fetchone() == ("Bike",)
+
+
+def test_second_budget_for_a_category_is_skipped(app):
+    assert (app.add_to_table("Budget", ["Food", 500], "no")
+            == {"Added": 1, "Duplicates": 0})
+
+    added_counts = app.add_to_table("Budget", [["Food", 700], ["Rent", 900]],
+                                    "yes")
+
+    assert added_counts == {"Added": 1, "Duplicates": 1}
+    app.cursor.execute('''SELECT * FROM Budget ORDER BY category''')
+    assert app.cursor.fetchall() == [("Food", 500), ("Rent", 900)]
@@ -0,0 +1,44 @@
+"""
+Tests of the NumPy analytics, which are skipped when NumPy isn't installed.
+"""
+import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_category_totals_and_spending(app, capsys):
+    app.add_to_table("Expenses", [["2024-01-01", 1000, "Food", "Shop"], 
+                                  ["2024-01-20", 2500, "Food", "Meal"], 
+                                  ["2024-02-10", 400, "Travel", "Bus"]], 
+                     "yes")
+    app.add_to_table("Income", ["2024-01-05", 10000, "Pay", "Wages"], "no")
+    start_date = datetime.date(2024, 1, 1)
+    end_date = datetime.date(2024, 2, 29)
+
+    expenses_ledger = app.load_ledger("Expenses", start_date, end_date)
+
+    assert (app.category_totals(expenses_ledger, start_date, end_date) 
+            == {"Food": 3500, "Travel": 400})
+
+    capsys.readouterr()
+    app.display_analytics(start_date, end_date)
+    output = capsys.readouterr().out
+
+    assert "£35.00 in 'Food'" in output
+    assert "£100.00 in 'Pay'" in output
+    assert "highest spending over 30 days was £35.00" in output
+
+
+def test_no_records_gives_a_message_rather_than_an_error(app, capsys):
+    app.display_analytics(datetime.date(2024, 1, 1), 
+                          datetime.date(2024, 1, 31))
+
+    assert "There are no records between" in capsys.readouterr().out
+
+
+def test_reversed_range_is_rejected(app):
+    with pytest.raises(ValueError):
+        app.display_analytics(datetime.date(2024, 1, 31), 
+                              datetime.date(2024, 1, 1))
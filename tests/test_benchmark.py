@@ -0,0 +1,83 @@
+"""
+Tests of the synthetic ledgers made by generate_ledger and of the
+benchmark suite which times the app's operations on them.
+"""
+from conftest import load_app
+
+
+def ledger_rows(app):
+    rows = {}
+
+    for table_name in ["Income", "Expenses", "Budget", "Goals"]:
+        app.cursor.execute(f'''SELECT * FROM {table_name} ORDER BY 1, 2''')
+        rows[table_name] = app.cursor.fetchall()
+
+    return rows
+
+
+def test_ledger_has_the_shape_asked_for(app):
+    app.generate_ledger(2500)
+    rows = ledger_rows(app)
+
+    assert len(rows["Income"]) + len(rows["Expenses"]) == 2500
+    assert 0 < len(rows["Income"]) < len(rows["Expenses"])
+    assert len(rows["Goals"]) == 10
+
+    # Every expense category has a budget.
+    expense_categories = {category for (category,) 
+                          in app.retrieve_categories("Expenses", "not")}
+    assert ({category for (category, budget) in rows["Budget"]} 
+            == expense_categories)
+
+    # Every record is dated within the ten years from the start of 2015.
+    first_day = app.date_to_day_number("2015-01-01")
+
+    for table_name in ["Income", "Expenses", "Goals"]:
+        app.cursor.execute(f'''SELECT MIN(date), MAX(date) 
+                           FROM {table_name}''')
+        (earliest, latest) = app.cursor.fetchone()
+        assert first_day <= earliest <= latest <= first_day + 3652
+
+
+def test_same_seed_makes_the_same_ledger(tmp_path):
+    ledgers = []
+
+    for seed in [7, 7, 8]:
+        app = load_app()
+        app.connect_to_database(str(tmp_path / f"ledger_{len(ledgers)}"))
+        app.generate_ledger(300, seed)
+        ledgers.append(ledger_rows(app))
+        app.close_database()
+
+    assert ledgers[0] == ledgers[1]
+    assert ledgers[0] != ledgers[2]
+
+
+def test_time_operation_hides_output_and_times_each_run(functions, capsys):
+    runs = []
+
+    def operation():
+        runs.append(None)
+        print("Shown to the user")
+
+    timing = functions.time_operation(operation, 3)
+
+    assert len(runs) == 3 and timing["repeats"] == 3
+    assert 0 <= timing["min_seconds"] <= timing["median_seconds"]
+    assert capsys.readouterr().out == ""
+
+
+def test_benchmarks_time_every_operation():
+    app = load_app()
+
+    results = app.run_benchmarks([200, 400])
+
+    assert ([scale_factor["no_of_rows"]
+             for scale_factor in results["scale_factors"]] == [200, 400])
+
+    for scale_factor in results["scale_factors"]:
+        assert "goal_progress" in scale_factor["timings"]
+        assert "rename_category_and_back" in scale_factor["timings"]
+
+        for timing in scale_factor["timings"].values():
+            assert timing["min_seconds"] <= timing["median_seconds"]
@@ -0,0 +1,51 @@
+"""
+Tests of the budget report, which compares the spending of every category
+with its budget in one query.
+"""
+import datetime
+
+import pytest
+
+
+@pytest.fixture
+def budgeted_app(app):
+    app.set_budget("Food", 7000)
+    app.set_budget("Holidays", 14000)
+    app.add_to_table("Expenses", [["2024-01-02", 2500, "Food", "Shop"], 
+                                  ["2024-01-03", 6000, "Food", "Meal out"], 
+                                  ["2024-01-04", 1200, "Travel", "Train"]], 
+                     "yes")
+
+    return app
+
+
+def test_report_has_budgeted_and_unbudgeted_categories(budgeted_app):
+    budget_report = budgeted_app.retrieve_budget_report(
+        datetime.date(2024, 1, 1), datetime.date(2024, 1, 8))
+
+    assert budget_report == [("Food", 7000, 8500, -1500, 8500 * 100 / 7000),
+                             ("Holidays", 14000, 0, 14000, 0.0),
+                             ("Travel", None, 1200, None, None)]
+
+
+def test_report_does_not_use_a_full_outer_join(functions):
+    # FULL OUTER JOIN needs SQLite 3.39 or later.
+    assert "FULL" not in functions.BUDGET_REPORT_QUERY.upper()
+
+
+def test_reversed_date_range_is_rejected(budgeted_app):
+    with pytest.raises(ValueError):
+        budgeted_app.retrieve_budget_report(datetime.date(2024, 1, 8), 
+                                            datetime.date(2024, 1, 1))
+
+    with pytest.raises(ValueError):
+        budgeted_app.run_command(["budget", "report", "2024-01-08", 
+                                  "2024-01-01"])
+
+    with pytest.raises(ValueError):
+        budgeted_app.handle_api_request("GET", "/budget-report", 
+                                        {"start": "2024-01-08", 
+                                         "end": "2024-01-01"})
+
+    assert (budgeted_app.validate_date_range("2024-01-01", "2024-01-01") 
+            == [datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)])
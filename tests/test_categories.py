@@ -0,0 +1,90 @@
+"""
+Tests of the Categories table: each category is kept once by its ID,
+renaming a category only changes its row in the Categories table and
+merging a category moves its records to the ID of the other.
+"""
+
+
+def categories(app):
+    app.cursor.execute('''SELECT id, table_name, name FROM Categories
+                       ORDER BY id''')
+
+    return app.cursor.fetchall()
+
+
+def record_category_ids(app, table_name):
+    app.cursor.execute(f'''SELECT description, category_id
+                       FROM {table_name} ORDER BY id''')
+
+    return app.cursor.fetchall()
+
+
+def test_each_category_is_kept_once_for_each_table(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"],
+                                  ["2024-03-02", 750, "Food", "Lunch"],
+                                  ["2024-03-02", 900, "Travel", "Train"]],
+                     "yes")
+    app.add_to_table("Income", ["2024-03-01", 5000, "Food", "Refund"], "no")
+
+    category_ids = {(table_name, name): id_ 
+                    for (id_, table_name, name) in categories(app)}
+
+    assert sorted(category_ids) == [("Expenses", "Food"), 
+                                    ("Expenses", "Travel"),
+                                    ("Income", "Food")]
+    assert record_category_ids(app, "Expenses") == [
+        ("Coffee", category_ids[("Expenses", "Food")]),
+        ("Lunch", category_ids[("Expenses", "Food")]),
+        ("Train", category_ids[("Expenses", "Travel")])]
+    assert record_category_ids(app, "Income") == [
+        ("Refund", category_ids[("Income", "Food")])]
+
+
+def test_rename_only_changes_the_categories_table(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"],
+                                  ["2024-03-02", 750, "Food", "Lunch"]],
+                     "yes")
+    app.add_to_table("Income", ["2024-03-01", 5000, "Food", "Refund"], "no")
+    app.cursor.execute('''SELECT * FROM Expenses ORDER BY id''')
+    original_records = app.cursor.fetchall()
+
+    assert app.update_category("Expenses", "Food", "Groceries")
+
+    # The category keeps its ID, so the records themselves are untouched,
+    # and the category of the same name in the Income table is left alone.
+    assert categories(app) == [(1, "Expenses", "Groceries"),
+                               (2, "Income", "Food")]
+    app.cursor.execute('''SELECT * FROM Expenses ORDER BY id''')
+    assert app.cursor.fetchall() == original_records
+    assert [record[2] for record in app.retrieve_income_expense(
+        "Expenses", "2024-03-01", "2024-03-02")] == ["Groceries"] * 2
+
+
+def test_merge_moves_the_records_to_the_other_category(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"],
+                                  ["2024-03-02", 750, "Groceries", "Shop"],
+                                  ["2024-03-02", 900, "Food", "Lunch"]],
+                     "yes")
+
+    app.cursor.execute('''SELECT id FROM Categories WHERE name = ?''',
+                       ("Groceries",))
+    (groceries_id,) = app.cursor.fetchone()
+
+    assert app.update_category("Expenses", "Food", "Groceries")
+
+    assert categories(app) == [(groceries_id, "Expenses", "Groceries")]
+    assert record_category_ids(app, "Expenses") == [
+        ("Coffee", groceries_id), ("Shop", groceries_id), 
+        ("Lunch", groceries_id)]
+    assert app.retrieve_categories("Expenses", "not") == [("Groceries",)]
+
+
+def test_unknown_category_is_not_renamed(app):
+    app.add_to_table("Expenses", ["2024-03-01", 300, "Food", "Coffee"], "no")
+
+    assert not app.update_category("Expenses", "Travel", "Trips")
+    assert not app.update_category("Income", "Food", "Groceries")
+
+    # Renaming a category to its own name changes nothing.
+    assert app.update_category("Expenses", "Food", "Food")
+    assert categories(app) == [(1, "Expenses", "Food")]
@@ -0,0 +1,128 @@
+"""
+Tests that the categories kept in category_cache are loaded once and stay
+the same as the categories in the database as records are added, changed,
+deleted, renamed, merged and rolled back.
+"""
+import pytest
+
+
+def categories_in_database(app, table_name):
+    app.cursor.execute(f'''SELECT DISTINCT Categories.name FROM {table_name}
+                       JOIN Categories
+                       ON Categories.id = {table_name}.category_id
+                       ORDER BY Categories.name''')
+
+    return app.cursor.fetchall()
+
+
+def check_cache(app, table_name):
+    assert table_name in app.category_cache
+    assert (app.retrieve_categories(table_name, "not")
+            == categories_in_database(app, table_name))
+
+
+@pytest.fixture
+def cached_app(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"],
+                                  ["2024-03-02", 750, "Food", "Lunch"],
+                                  ["2024-03-02", 900, "Travel", "Train"],
+                                  ["2024-03-03", 100, "Misc", "Stamps"]],
+                     "yes")
+    app.retrieve_categories("Expenses", "not")
+
+    return app
+
+
+def test_categories_are_loaded_once(cached_app, monkeypatch):
+    def reader():
+        raise AssertionError("The categories were loaded again.")
+
+    monkeypatch.setattr(cached_app, "reader", reader)
+
+    assert cached_app.retrieve_categories("Expenses", "not") == [
+        ("Food",), ("Misc",), ("Travel",)]
+    assert cached_app.retrieve_categories("Expenses", "show") == [
+        ("Food",), ("Travel",)]
+
+
+def test_added_records_add_their_categories(cached_app):
+    cached_app.add_to_table("Expenses", ["2024-03-04", 500, "Rent", "May"],
+                            "no")
+    cached_app.add_to_table("Expenses", [["2024-03-04", 200, "Food", "Tea"],
+                                         ["2024-03-05", 800, "Gifts", "Card"]],
+                            "yes")
+
+    assert ("Rent",) in cached_app.retrieve_categories("Expenses", "not")
+    check_cache(cached_app, "Expenses")
+
+
+def test_category_is_removed_with_its_last_record(cached_app):
+    cached_app.cursor.execute('''SELECT description, id FROM Expenses''')
+    ids = dict(cached_app.cursor.fetchall())
+    (coffee_id, lunch_id) = (ids["Coffee"], ids["Lunch"])
+
+    # Food still has a record after the first is deleted.
+    assert cached_app.delete_record_by_id("Expenses", coffee_id)
+    assert ("Food",) in cached_app.retrieve_categories("Expenses", "not")
+    check_cache(cached_app, "Expenses")
+
+    assert cached_app.delete_record_by_id("Expenses", lunch_id)
+    assert ("Food",) not in cached_app.retrieve_categories("Expenses", "not")
+    check_cache(cached_app, "Expenses")
+
+    # Deleting a record which doesn't exist changes nothing.
+    assert not cached_app.delete_record_by_id("Expenses", lunch_id)
+    check_cache(cached_app, "Expenses")
+
+
+def test_updated_record_moves_between_categories(cached_app):
+    train = cached_app.retrieve_income_expense(
+        "Expenses", "2024-03-02", "2024-03-02", "Travel")[0]
+
+    assert cached_app.update_record_by_id(
+        "Expenses", ["2024-03-02", 900, "Commute", "Train", train[-1]])
+
+    assert cached_app.retrieve_categories("Expenses", "not") == [
+        ("Commute",), ("Food",), ("Misc",)]
+    check_cache(cached_app, "Expenses")
+
+
+def test_rename_and_merge_change_the_cached_categories(cached_app):
+    assert cached_app.update_category("Expenses", "Travel", "Trips")
+    assert cached_app.retrieve_categories("Expenses", "not") == [
+        ("Food",), ("Misc",), ("Trips",)]
+    check_cache(cached_app, "Expenses")
+
+    assert cached_app.update_category("Expenses", "Trips", "Food")
+    assert cached_app.retrieve_categories("Expenses", "not") == [
+        ("Food",), ("Misc",)]
+    check_cache(cached_app, "Expenses")
+
+
+def test_tables_have_their_own_categories(cached_app):
+    cached_app.add_to_table("Income", ["2024-03-01", 5000, "Salary", "Pay"],
+                            "no")
+
+    assert cached_app.retrieve_categories("Income", "not") == [("Salary",)]
+    assert ("Salary",) not in cached_app.retrieve_categories("Expenses",
+                                                             "not")
+
+    cached_app.update_category("Income", "Salary", "Wages")
+
+    check_cache(cached_app, "Income")
+    check_cache(cached_app, "Expenses")
+
+
+def test_cache_is_cleared_when_a_change_is_rolled_back(cached_app):
+    with pytest.raises(ValueError):
+        with cached_app.transaction():
+            cached_app.add_to_table("Expenses",
+                                    ["2024-03-04", 500, "Rent", "May"], "no")
+            assert ("Rent",) in cached_app.retrieve_categories("Expenses",
+                                                               "not")
+
+            raise ValueError("Something went wrong.")
+
+    assert cached_app.category_cache == {}
+    assert ("Rent",) not in cached_app.retrieve_categories("Expenses", "not")
+    check_cache(cached_app, "Expenses")
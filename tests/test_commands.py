@@ -0,0 +1,44 @@
+"""
+Tests of the batch commands carried out by run_commands.
+"""
+import sqlite3
+
+
+def expense_descriptions(app):
+    app.cursor.execute('''SELECT description FROM Expenses ORDER BY id''')
+
+    return [description for (description,) in app.cursor.fetchall()]
+
+
+def test_failed_command_keeps_the_commands_before_it(app):
+    no_of_failed = app.run_commands([
+        "add Expenses 2024-01-01 3.00 Food Coffee", 
+        "add Expenses 2024-13-01 3.00 Food 'Not a date'",
+        "# A comment",
+        "add Expenses 2024-01-02 4.50 Food Lunch"])
+
+    assert no_of_failed == 1
+    assert expense_descriptions(app) == ["Coffee", "Lunch"]
+
+
+def test_locked_database_fails_only_that_command(app, tmp_path):
+    # The app gives up straight away rather than waiting for the lock.
+    app.db.execute("PRAGMA busy_timeout = 0")
+
+    other_program = sqlite3.connect(str(tmp_path / "budget_app_db"), 
+                                    isolation_level = None)
+    other_program.execute("BEGIN IMMEDIATE")
+
+    lines = iter(["add Expenses 2024-01-01 3.00 Food Coffee",
+                  "add Expenses 2024-01-02 4.50 Food Lunch"])
+
+    def command_lines():
+        yield next(lines)
+        # The other program finishes its changes before the next command.
+        other_program.execute("COMMIT")
+        yield next(lines)
+
+    assert app.run_commands(command_lines()) == 1
+    assert expense_descriptions(app) == ["Lunch"]
+
+    other_program.close()
@@ -0,0 +1,98 @@
+"""
+Tests of the connections to the database: WAL mode and the settings of
+each connection, the pool of read only connections used through reader and
+the transactions of the connection which makes every change.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+
+def expense_descriptions(read_cursor):
+    read_cursor.execute('''SELECT description FROM Expenses ORDER BY id''')
+
+    return [description for (description,) in read_cursor.fetchall()]
+
+
+def test_database_is_in_wal_mode_with_the_settings(app):
+    assert app.db.execute('''PRAGMA journal_mode''').fetchone() == ("wal",)
+
+    with app.reader() as read_cursor:
+        for [pragma, value] in app.CONNECTION_PRAGMAS:
+            read_cursor.execute(f"PRAGMA {pragma}")
+            setting = read_cursor.fetchone()[0]
+
+            # synchronous is read back as a number, 1 being NORMAL.
+            if pragma == "synchronous":
+                assert setting == 1
+
+            else:
+                assert setting == value
+
+
+def test_readers_are_read_only_and_given_back(app):
+    assert app.reader_pool.qsize() == app.READER_POOL_SIZE
+
+    with app.reader() as read_cursor:
+        assert app.reader_pool.qsize() == app.READER_POOL_SIZE - 1
+
+        with pytest.raises(sqlite3.OperationalError):
+            read_cursor.execute('''DELETE FROM Expenses''')
+
+    assert app.reader_pool.qsize() == app.READER_POOL_SIZE
+
+
+def test_readers_are_not_blocked_by_a_change(app):
+    app.add_to_table("Expenses", ["2024-03-01", 300, "Food", "Coffee"],
+                     "no")
+    seen_by_other_thread = []
+
+    def read_from_other_thread():
+        with app.reader() as read_cursor:
+            seen_by_other_thread.append(expense_descriptions(read_cursor))
+
+    with app.transaction():
+        app.add_to_table("Expenses", ["2024-03-02", 750, "Food", "Lunch"],
+                         "no")
+
+        # The thread making the change sees it straight away, while another
+        # thread reads the database as it was before the change without
+        # waiting for it to be committed.
+        with app.reader() as read_cursor:
+            assert expense_descriptions(read_cursor) == ["Coffee", "Lunch"]
+
+        other_thread = threading.Thread(target = read_from_other_thread)
+        other_thread.start()
+        other_thread.join(5)
+
+        assert seen_by_other_thread == [["Coffee"]]
+
+    read_from_other_thread()
+    assert seen_by_other_thread[-1] == ["Coffee", "Lunch"]
+
+
+def test_failed_transaction_is_rolled_back(app):
+    with pytest.raises(ValueError):
+        with app.transaction():
+            app.add_to_table("Expenses",
+                             ["2024-03-01", 300, "Food", "Coffee"], "no")
+
+            raise ValueError("Something went wrong.")
+
+    assert expense_descriptions(app.cursor) == []
+    assert app.transaction_depth == 0
+
+    # A failed transaction inside another only rolls back its own changes.
+    with app.transaction():
+        app.add_to_table("Expenses", ["2024-03-01", 300, "Food", "Coffee"],
+                         "no")
+
+        with pytest.raises(ValueError):
+            with app.transaction():
+                app.add_to_table("Expenses",
+                                 ["2024-03-02", 750, "Food", "Lunch"], "no")
+
+                raise ValueError("Something went wrong.")
+
+    assert expense_descriptions(app.cursor) == ["Coffee"]
@@ -0,0 +1,100 @@
+"""
+Tests that the DailyTotals table kept up to date by its triggers always 
+holds the same totals as adding up the Income and Expenses tables again.
+"""
+import random
+
+
+def expected_daily_totals(app):
+    """
+    expected_daily_totals adds up the totals of each day and category from
+    the Income and Expenses tables themselves.
+    """
+    expected = []
+
+    for table_name in ["Income", "Expenses"]:
+        app.cursor.execute(f'''SELECT '{table_name}', date, category_id, 
+                           SUM(amount), COUNT(*), MIN(amount), MAX(amount) 
+                           FROM {table_name} GROUP BY date, category_id''')
+        expected += app.cursor.fetchall()
+
+    return sorted(expected)
+
+
+def daily_totals(app):
+    app.cursor.execute('''SELECT * FROM DailyTotals''')
+
+    return sorted(app.cursor.fetchall())
+
+
+def test_daily_totals_follow_every_change(app):
+    generator = random.Random(3)
+    categories = ["Food", "Rent", "Travel", "Misc"]
+
+    for table_name in ["Income", "Expenses"]:
+        records = []
+
+        for i in range(300):
+            date = f"2024-03-{generator.randint(1, 5):02}"
+            records.append([date, generator.choice([100, 250, 999, 
+                                                    generator.randint(1, 
+                                                                      5000)]),
+                            generator.choice(categories), f"Record {i}"])
+
+        app.add_to_table(table_name, records, "yes")
+
+    assert daily_totals(app) == expected_daily_totals(app)
+
+    for step in range(150):
+        table_name = generator.choice(["Income", "Expenses"])
+        id_ = generator.randint(1, 300)
+        record = app.retrieve_by_id(table_name, id_)
+
+        if record == None:
+            continue
+
+        if step % 3 == 0:
+            # Deleting the smallest or largest amount of a day and category
+            # makes the triggers find the new smallest or largest amount.
+            app.delete_record_by_id(table_name, id_)
+
+        else:
+            app.update_record_by_id(table_name, 
+                [f"2024-03-{generator.randint(1, 5):02}", 
+                 generator.randint(1, 5000), generator.choice(categories), 
+                 f"Updated {step}", id_])
+
+        assert daily_totals(app) == expected_daily_totals(app), step
+
+    # Renaming a category, then merging it into another.
+    app.update_category("Expenses", "Food", "Groceries")
+    assert daily_totals(app) == expected_daily_totals(app)
+
+    app.update_category("Expenses", "Groceries", "Misc")
+    assert daily_totals(app) == expected_daily_totals(app)
+
+
+def test_rebuilt_daily_totals_match_the_triggers(app):
+    app.add_to_table("Expenses", [["2024-01-01", 500, "Food", "Lunch"], 
+                                  ["2024-01-01", 700, "Food", "Dinner"], 
+                                  ["2024-01-02", 300, "Travel", "Bus"]], 
+                     "yes")
+    kept_by_triggers = daily_totals(app)
+
+    app.rebuild_daily_totals()
+
+    assert daily_totals(app) == kept_by_triggers
+    assert daily_totals(app) == expected_daily_totals(app)
+
+
+def test_totals_are_read_from_daily_totals(app):
+    app.add_to_table("Income", [["2024-01-01", 500, "Pay", "Shift"], 
+                                ["2024-01-05", 1500, "Pay", "Overtime"], 
+                                ["2024-02-01", 99, "Gift", "Card"]], "yes")
+
+    assert (app.retrieve_totals("Income", "2024-01-01", "2024-01-31") 
+            == [2000, 2, 500, 1500])
+    assert (app.retrieve_totals("Income", "2024-01-01", "2024-12-31", 
+                                "Gift") == [99, 1, 99, 99])
+    assert (app.retrieve_totals("Income", "2023-01-01", "2023-12-31") 
+            == [0, 0, None, None])
@@ -0,0 +1,74 @@
+"""
+Tests of the Julian day numbers dates are stored as: converting dates to
+and from them, and finding the records of a date range by comparing them.
+"""
+import datetime
+
+import pytest
+
+
+def test_known_dates_have_their_julian_day_numbers(functions):
+    assert functions.date_to_day_number("2000-01-01") == 2451545
+    assert functions.date_to_day_number("2024-03-01") == 2460371
+    assert functions.date_to_day_number(datetime.date(2024, 3, 1)) == 2460371
+    assert functions.day_number_to_date(2460371) == datetime.date(2024, 3, 1)
+
+
+def test_dates_round_trip_across_leap_days(functions):
+    first_day = datetime.date(1899, 12, 1)
+    day_number = functions.date_to_day_number(first_day)
+
+    # Every day for more than 125 years, so 1900 (not a leap year), 2000
+    # (a leap year) and every leap day in between are crossed.
+    for offset in range(46000):
+        date = first_day + datetime.timedelta(days = offset)
+
+        assert functions.date_to_day_number(str(date)) == day_number + offset
+        assert functions.day_number_to_date(day_number + offset) == date
+
+    assert (functions.date_to_day_number("2024-03-01")
+            - functions.date_to_day_number("2024-02-28")) == 2
+    assert (functions.date_to_day_number("1900-03-01")
+            - functions.date_to_day_number("1900-02-28")) == 1
+
+
+def test_dates_which_do_not_exist_are_rejected(functions):
+    for date in ["2023-02-29", "1900-02-29", "2024-13-01", "2024-04-31"]:
+        with pytest.raises(ValueError):
+            functions.date_to_day_number(date)
+
+
+def test_dates_are_stored_as_integers(app):
+    app.add_to_table("Expenses", ["2024-02-29", 300, "Food", "Coffee"], "no")
+    app.add_to_table("Goals", ["2024-12-31", 100000, "Bike"], "no")
+
+    for table_name in ["Expenses", "Goals"]:
+        app.cursor.execute(f'''SELECT typeof(date), date FROM {table_name}''')
+        (date_type, date) = app.cursor.fetchone()
+
+        assert date_type == "integer"
+        assert app.day_number_to_date(date) in [datetime.date(2024, 2, 29),
+                                                datetime.date(2024, 12, 31)]
+
+
+@pytest.mark.parametrize(["start_date", "end_date", "expected"], [
+    ["2024-02-29", "2024-02-29", ["Leap day"]],
+    ["2024-02-28", "2024-03-01", ["February", "Leap day", "March"]],
+    ["2023-12-31", "2024-01-01", ["New Year's Eve", "New Year's Day"]],
+    ["2024-01-02", "2024-02-27", []],
+    ["2023-01-01", "2024-12-31", ["New Year's Eve", "New Year's Day",
+                                  "February", "Leap day", "March"]]])
+def test_date_ranges_include_both_ends(app, start_date, end_date, expected):
+    app.add_to_table("Expenses", [["2024-03-01", 400, "Food", "March"],
+                                  ["2024-02-29", 300, "Food", "Leap day"],
+                                  ["2023-12-31", 100, "Food",
+                                   "New Year's Eve"],
+                                  ["2024-02-28", 200, "Food", "February"],
+                                  ["2024-01-01", 500, "Food",
+                                   "New Year's Day"]],
+                     "yes")
+
+    records = app.retrieve_income_expense("Expenses", start_date, end_date)
+
+    assert [record[3] for record in records] == expected
+    assert all(start_date <= record[0] <= end_date for record in records)
@@ -0,0 +1,353 @@
+"""
+Tests that the goal engine shares out profit the same way as the original
+menu option 10, which sorted every goal by the amount left and went 
+through all of them for each interval, and that the goal checkpoint 
+gives the same progress as sharing out the whole history again.
+"""
+import datetime
+import random
+import sqlite3
+import time
+import types
+from fractions import Fraction
+
+import pytest
+
+
+def baseline_goal_progress(goal_records, profit_between_dates):
+    """
+    baseline_goal_progress is the allocation of the original menu option 10,
+    kept as it was apart from using exact fractions rather than floats, so 
+    the engine can be compared with it to the penny.
+
+    Parameters  :   goal_records : list
+                        The goal records in the format [date, amount, 
+                        description, id] in date order.
+                    profit_between_dates : list
+                        The profit of the interval starting at each distinct
+                        goal date which has started.
+
+    Returns     :   amounts_left : dict
+                        The exact amount left of each goal in the form 
+                        {id: amount left}.
+    """
+    goal_records = [list(record) for record in goal_records]
+    goal_dates_actual = [record[0] for record in goal_records]
+
+    records_per_date = []
+    cumulative_no_records = 0
+
+    for date_distinct in sorted(set(goal_dates_actual)):
+        cumulative_no_records += goal_dates_actual.count(date_distinct)
+        records_per_date.append([date_distinct, cumulative_no_records])
+
+    for entry in range(len(profit_between_dates)):
+        goal_records = sorted(goal_records, key = lambda record: record[1])
+        no_of_records = records_per_date[entry][1]
+        date = records_per_date[entry][0]
+
+        for record in goal_records:
+            if record[0] <= date and record[1] == 0:
+                no_of_records -= 1
+
+        if no_of_records == 0:
+            share_of_profit = 0
+
+        else:
+            share_of_profit = Fraction(profit_between_dates[entry], 
+                                       no_of_records)
+
+        for record in goal_records:
+            if record[0] > date or record[1] == 0:
+                continue
+
+            elif record[1] <= share_of_profit:
+                if no_of_records != 1:
+                    n = no_of_records
+                    difference = share_of_profit - record[1]
+                    profit_left = (n-1) * share_of_profit + difference
+
+                    share_of_profit = profit_left / (n-1)
+
+                record[1] = 0
+                no_of_records -= 1
+
+            else:
+                record[1] -= share_of_profit
+
+        if entry != len(records_per_date) - 1:
+            no_records_completed = records_per_date[entry][1] - no_of_records
+            records_per_date[entry + 1][1] -= no_records_completed
+
+    return {record[3]: record[1] for record in goal_records}
+
+
+def random_goals(seed, no_of_goals = 30):
+    """
+    random_goals makes goal records and interval profits which include goals
+    of nothing, goals with the same amount, many goals on the same date, 
+    losses and profits which use a goal up exactly.
+    """
+    generator = random.Random(seed)
+    first_day = 2460000
+    goal_records = []
+
+    for id_ in range(1, no_of_goals + 1):
+        date = first_day + generator.choice([0, 0, 3, 10, 10, 40, 41, 90])
+        amount = generator.choice([0, 100, 250, 1000, 
+                                   generator.randint(1, 500000)])
+        goal_records.append([date, amount, f"Goal {id_}", id_])
+
+    goal_records.sort(key = lambda record: (record[0], record[3]))
+
+    no_of_dates = len({record[0] for record in goal_records})
+    # Some of the later goals may not have started yet.
+    no_of_intervals = generator.randint(1, no_of_dates)
+    profit_between_dates = [generator.choice([0, 300, -500, 
+                                              generator.randint(-20000, 
+                                                                400000)])
+                            for i in range(no_of_intervals)]
+
+    return [goal_records, profit_between_dates]
+
+
+def assert_same_progress(current_progress_records, expected):
+    """
+    assert_same_progress checks that the amount left of every goal is the 
+    exact amount left rounded to the penny.
+    """
+    assert len(current_progress_records) == len(expected)
+
+    for [date, amount_left, description, id_] in current_progress_records:
+        assert isinstance(amount_left, int)
+        assert abs(amount_left - expected[id_]) <= Fraction(1, 2), id_
+
+
+def set_today(app, today):
+    """
+    set_today makes datetime.date.today() give a fixed date within the app.
+    """
+    class FixedDate(datetime.date):
+        @classmethod
+        def today(cls):
+            return today
+
+    app.datetime = types.SimpleNamespace(date = FixedDate, 
+                                         datetime = datetime.datetime, 
+                                         timedelta = datetime.timedelta)
+
+
+def test_completed_goal_passes_on_the_rest_of_its_share(functions):
+    goal_records = [[2460000, 100, "Small", 1], [2460000, 300, "Large", 2]]
+
+    current_progress_records = functions.allocate_goal_progress(
+        goal_records, [400])
+
+    assert [record[1] for record in current_progress_records] == [0, 0]
+
+
+def test_goals_which_have_not_started_keep_their_amount(functions):
+    goal_records = [[2460000, 1000, "Started", 1], 
+                    [2460050, 700, "Not started", 2]]
+
+    current_progress_records = functions.allocate_goal_progress(
+        goal_records, [250])
+
+    assert [record[1] for record in current_progress_records] == [750, 700]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_allocation_matches_the_baseline(functions, seed):
+    [goal_records, profit_between_dates] = random_goals(seed)
+
+    current_progress_records = functions.allocate_goal_progress(
+        goal_records, profit_between_dates)
+
+    assert_same_progress(current_progress_records, 
+        baseline_goal_progress(goal_records, profit_between_dates))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_allocation_resumed_from_json_matches_one_pass(functions, seed):
+    [goal_records, profit_between_dates] = random_goals(seed)
+    split = random.Random(seed).randint(0, len(profit_between_dates))
+
+    allocation = functions.new_goal_allocation(goal_records)
+    functions.continue_goal_allocation(allocation, goal_records, 
+                                       profit_between_dates[:split])
+    allocation = functions.goal_allocation_from_json(
+        functions.goal_allocation_to_json(allocation))
+    functions.continue_goal_allocation(allocation, goal_records, 
+                                       profit_between_dates[split:])
+
+    assert (functions.goal_amounts_left(allocation, goal_records) 
+            == functions.allocate_goal_progress(goal_records, 
+                                                profit_between_dates))
+
+
+def test_goal_progress_from_the_database_matches_the_baseline(app):
+    generator = random.Random(7)
+    first_date = datetime.date(2024, 1, 1)
+    today = datetime.date(2024, 6, 30)
+    set_today(app, today)
+
+    records = {"Income": [], "Expenses": []}
+
+    for day in range((today - first_date).days + 30):
+        date = first_date + datetime.timedelta(days = day)
+
+        for table_name in records:
+            records[table_name].append([str(date), 
+                                        generator.randint(1, 20000), 
+                                        "Misc", f"{table_name} {day}"])
+
+    for table_name, table_records in records.items():
+        app.add_to_table(table_name, table_records, "yes")
+
+    goal_dates = ["2024-01-01", "2024-01-01", "2024-02-14", "2024-03-01", 
+                  "2024-06-30", "2024-08-01"]
+    app.add_to_table("Goals", [[date, generator.randint(0, 300000), 
+                                f"Goal {i}"] 
+                               for i, date in enumerate(goal_dates)], "yes")
+
+    [goal_records_original, current_progress_records] = (
+        app.calculate_goal_progress())
+
+    # The profit of each interval from the start of each goal date which 
+    # has started until the day before the next one, or today.
+    goal_records = [[app.date_to_day_number(record[0])] + list(record[1:])
+                    for record in goal_records_original]
+    started_dates = sorted({record[0] for record in goal_records 
+                            if record[0] <= app.date_to_day_number(today)})
+    profit_between_dates = []
+
+    for i, start_date in enumerate(started_dates):
+        if i != len(started_dates) - 1:
+            end_date = started_dates[i + 1] - 1
+
+        else:
+            end_date = app.date_to_day_number(today)
+
+        profit = 0
+
+        for table_name, sign in [["Income", 1], ["Expenses", -1]]:
+            for record in records[table_name]:
+                day_number = app.date_to_day_number(record[0])
+
+                if start_date <= day_number <= end_date:
+                    profit += sign * record[1]
+
+        profit_between_dates.append(profit)
+
+    assert_same_progress(current_progress_records, 
+        baseline_goal_progress(goal_records, profit_between_dates))
+
+
+def test_allocation_state_stays_small(functions):
+    # Thousands of intervals shared between goal counts with no common 
+    # factor used to give fractions with thousands of digits.
+    generator = random.Random(11)
+    goal_records = [[2460000 + day, generator.randint(100000, 9000000), 
+                     f"Goal {day}", day + 1] for day in range(3000)]
+    profit_between_dates = [generator.randint(-50000, 200000) 
+                            for day in range(3000)]
+
+    allocation = functions.new_goal_allocation(goal_records)
+    functions.continue_goal_allocation(allocation, goal_records, 
+                                       profit_between_dates)
+
+    assert isinstance(allocation["share_offset"], int)
+    assert len(str(allocation["share_offset"])) < 30
+    assert len(functions.goal_allocation_to_json(allocation)) < 250000
+
+
+def full_goal_progress(app):
+    """
+    full_goal_progress shares out the whole history again without a 
+    checkpoint, as calculate_goal_progress would if there wasn't one.
+    """
+    app.cursor.execute(app.GOALS_QUERY)
+    goal_records = app.cursor.fetchall()
+    today = app.date_to_day_number(app.datetime.date.today())
+
+    [allocation, started_goal_dates] = app.goal_allocation_until(
+        goal_records, None, today)
+    app.continue_goal_allocation(allocation, goal_records, 
+                                 [allocation["open_profit"]])
+
+    return app.goal_amounts_left(allocation, goal_records)
+
+
+def checkpoint_date(app):
+    app.cursor.execute(app.GOAL_CHECKPOINT_QUERY)
+    checkpoint = app.cursor.fetchone()
+
+    if checkpoint == None:
+        return None
+
+    return app.day_number_to_date(checkpoint[0])
+
+
+def test_incremental_progress_matches_a_full_recompute(app):
+    generator = random.Random(5)
+    today = datetime.date(2024, 1, 1)
+    app.add_to_table("Goals", [[str(today + datetime.timedelta(days = day)),
+                                generator.randint(1000, 500000), f"Goal {day}"]
+                               for day in range(0, 120, 9)], "yes")
+
+    for day in range(100):
+        today += datetime.timedelta(days = generator.choice([0, 1, 1, 3]))
+        set_today(app, today)
+
+        # Mostly records of today, with some dated earlier.
+        days_back = generator.choice([0, 0, 0, 1, 30])
+        app.add_to_table(generator.choice(["Income", "Expenses"]), 
+            [str(today - datetime.timedelta(days = days_back)), 
+             generator.randint(1, 50000), "Misc", f"Record {day}"], "no")
+
+        [goal_records_original, current_progress_records] = (
+            app.calculate_goal_progress())
+
+        assert current_progress_records == full_goal_progress(app)
+        assert checkpoint_date(app) == today - datetime.timedelta(days = 1)
+
+
+def test_only_records_before_today_delete_the_checkpoint(app):
+    set_today(app, datetime.date(2024, 3, 10))
+    app.add_to_table("Goals", ["2024-01-01", 100000, "Holiday"], "no")
+    app.calculate_goal_progress()
+
+    assert checkpoint_date(app) == datetime.date(2024, 3, 9)
+
+    app.add_to_table("Expenses", ["2024-03-10", 300, "Food", "Coffee"], "no")
+    assert checkpoint_date(app) == datetime.date(2024, 3, 9)
+
+    app.add_to_table("Expenses", ["2024-03-09", 300, "Food", "Coffee"], "no")
+    assert checkpoint_date(app) == None
+
+
+def test_progress_is_read_while_another_program_is_writing(app, tmp_path):
+    set_today(app, datetime.date(2024, 3, 10))
+    app.add_to_table("Goals", ["2024-01-01", 100000, "Holiday"], "no")
+    app.add_to_table("Income", ["2024-02-01", 25000, "Pay", "Wages"], "no")
+
+    other_db = sqlite3.connect(str(tmp_path / "budget_app_db"), 
+                               isolation_level = None)
+    other_db.execute('''BEGIN IMMEDIATE''')
+
+    try:
+        start_time = time.perf_counter()
+        [goal_records_original, current_progress_records] = (
+            app.calculate_goal_progress())
+
+        # The checkpoint isn't moved on, without waiting for the lock.
+        assert time.perf_counter() - start_time < 1
+        assert current_progress_records[0][1] == 75000
+        assert checkpoint_date(app) == None
+
+    finally:
+        other_db.rollback()
+        other_db.close()
+
+    app.calculate_goal_progress()
+    assert checkpoint_date(app) == datetime.date(2024, 3, 9)
@@ -0,0 +1,145 @@
+"""
+Tests of importing CSV files with import_csv and of adding the same record
+more than once.
+"""
+
+
+def write_csv(tmp_path, rows):
+    file_path = tmp_path / "import.csv"
+    file_path.write_text("".join(row + "\n" for row in rows))
+
+    return str(file_path)
+
+
+def expense_count(app):
+    app.cursor.execute('''SELECT COUNT(*) FROM Expenses''')
+
+    return app.cursor.fetchone()[0]
+
+
+COFFEE = "2024-03-01,3.00,Food,Coffee,Expenses"
+LUNCH = "2024-03-01,7.50,Food,Lunch,Expenses"
+
+
+def test_identical_rows_of_one_file_are_all_imported(app, tmp_path):
+    file_path = write_csv(tmp_path, [COFFEE, COFFEE, LUNCH])
+
+    imported_counts = app.import_csv(file_path)
+
+    assert imported_counts["Expenses"] == 3
+    assert imported_counts["Duplicates"] == 0
+
+
+def test_importing_a_file_again_adds_nothing(app, tmp_path):
+    file_path = write_csv(tmp_path, [COFFEE, COFFEE, LUNCH])
+    app.import_csv(file_path)
+
+    # A chunk size of one carries the counts from one chunk to the next.
+    for chunk_size in [1000, 1]:
+        imported_counts = app.import_csv(file_path, chunk_size)
+
+        assert imported_counts["Expenses"] == 0
+        assert imported_counts["Duplicates"] == 3
+        assert expense_count(app) == 3
+
+
+def test_overlapping_file_only_adds_the_new_copies(app, tmp_path):
+    app.import_csv(write_csv(tmp_path, [COFFEE, LUNCH]))
+
+    imported_counts = app.import_csv(write_csv(tmp_path, 
+                                               [COFFEE, LUNCH, COFFEE]), 1)
+
+    assert imported_counts["Expenses"] == 1
+    assert imported_counts["Duplicates"] == 2
+    assert expense_count(app) == 3
+
+
+def test_copies_are_counted_across_chunks(app, tmp_path):
+    app.import_csv(write_csv(tmp_path, [COFFEE, LUNCH]))
+
+    # Chunks of two split the coffees so the one already in the table is 
+    # skipped in the first chunk and the others added across both.
+    imported_counts = app.import_csv(write_csv(tmp_path, 
+        [LUNCH, COFFEE, COFFEE, LUNCH, COFFEE]), 2)
+
+    assert imported_counts["Expenses"] == 3
+    assert imported_counts["Duplicates"] == 2
+    assert expense_count(app) == 5
+
+
+def test_same_record_can_be_added_twice(app):
+    for i in range(2):
+        added_counts = app.add_to_table("Expenses", 
+            ["2024-03-01", 300, "Food", "Coffee"], "no")
+
+        assert added_counts == {"Added": 1, "Duplicates": 0}
+
+    added_counts = app.add_to_table("Expenses", 
+        [["2024-03-01", 300, "Food", "Coffee"], 
+         ["2024-03-01", 300, "Food", "Coffee"]], "yes")
+
+    assert added_counts == {"Added": 2, "Duplicates": 0}
+    assert expense_count(app) == 4
+
+
+def stored_hashes(app):
+    app.cursor.execute('''SELECT content_hash FROM Expenses ORDER BY id''')
+
+    return [hash_ for (hash_,) in app.cursor.fetchall()]
+
+
+def test_updated_record_is_given_its_new_hash(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"], 
+                                  ["2024-03-01", 750, "Food", "Lunch"]], 
+                     "yes")
+
+    # Updating the lunch to match the coffee leaves two copies of it.
+    assert app.update_record_by_id("Expenses", 
+        ["2024-03-01", 300, "Food", "Coffee", 2])
+
+    coffee_hash = app.content_hash(app.date_to_day_number("2024-03-01"), 
+                                   300, "Coffee")
+    assert stored_hashes(app) == [coffee_hash, coffee_hash]
+
+
+def test_renamed_and_merged_categories_keep_their_hashes(app, tmp_path):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"], 
+                                  ["2024-03-02", 400, "Drinks", "Tea"]], 
+                     "yes")
+    original_hashes = stored_hashes(app)
+
+    app.update_category("Expenses", "Food", "Groceries")
+    app.update_category("Expenses", "Drinks", "Groceries")
+    assert stored_hashes(app) == original_hashes
+
+    # The records are found when imported with their new category.
+    imported_counts = app.import_csv(write_csv(tmp_path, 
+        ["2024-03-01,3.00,Groceries,Coffee,Expenses", 
+         "2024-03-02,4.00,Groceries,Tea,Expenses"]))
+    assert imported_counts["Duplicates"] == 2
+
+
+def test_same_record_in_another_category_is_imported(app, tmp_path):
+    app.add_to_table("Expenses", ["2024-03-01", 300, "Food", "Coffee"], "no")
+
+    imported_counts = app.import_csv(write_csv(tmp_path, 
+        ["2024-03-01,3.00,Food,Coffee,Expenses", 
+         "2024-03-01,3.00,Drinks,Coffee,Expenses"]))
+
+    assert imported_counts["Expenses"] == 1
+    assert imported_counts["Duplicates"] == 1
+
+
+def test_importing_goals_again_adds_nothing(app, tmp_path):
+    holiday = "2024-01-01,500.00,Holiday,Goals"
+    file_path = write_csv(tmp_path, [holiday, holiday, 
+                                     "2024-02-01,250.00,Bike,Goals"])
+
+    assert app.import_csv(file_path)["Goals"] == 3
+
+    imported_counts = app.import_csv(file_path, 1)
+
+    assert imported_counts["Goals"] == 0
+    assert imported_counts["Duplicates"] == 3
+    app.cursor.execute('''SELECT COUNT(*) FROM Goals''')
+    assert app.cursor.fetchone() == (3,)
@@ -0,0 +1,49 @@
+"""
+Tests that the date and category indexes of the Income and Expenses tables
+are made and that the range searches of retrieve_income_expense are
+answered from them without scanning or sorting a table.
+"""
+import pytest
+
+
+def index_columns(app, index_name):
+    app.cursor.execute('''SELECT name FROM pragma_index_info(?)
+                       ORDER BY seqno''', (index_name,))
+
+    return ", ".join(name for (name,) in app.cursor.fetchall())
+
+
+def test_every_index_is_made_with_its_columns(app):
+    for [index_name, table_name, columns, is_unique] in app.INDEXES:
+        assert index_columns(app, index_name) == columns
+
+
+def test_every_query_uses_an_index(app):
+    app.add_to_table("Expenses", [["2024-03-01", 300, "Food", "Coffee"],
+                                  ["2024-03-02", 750, "Misc", "Lunch"]],
+                     "yes")
+
+    assert app.check_query_plans() == []
+
+
+@pytest.mark.parametrize("category", [None, "Food"])
+def test_range_search_reads_only_the_index(app, category):
+    [query, parameters] = app.income_expense_query(
+        "Expenses", "2024-03-01", "2024-03-31", category)
+
+    app.cursor.execute("EXPLAIN QUERY PLAN " + query, parameters)
+    details = [row[-1] for row in app.cursor.fetchall()]
+
+    assert any(detail.startswith("SEARCH Expenses USING COVERING INDEX")
+               for detail in details)
+    assert not any("TEMP B-TREE" in detail for detail in details)
+
+
+def test_missing_indexes_are_reported(app):
+    app.cursor.execute('''DROP INDEX Expenses_date_category_idx''')
+    app.cursor.execute('''DROP INDEX Expenses_category_date_idx''')
+
+    unindexed_queries = app.check_query_plans()
+
+    assert len(unindexed_queries) != 0
+    assert all("Expenses" in query for [query, detail] in unindexed_queries)
@@ -0,0 +1,40 @@
+"""
+Tests of the ledger registry and the consolidated reports across ledgers.
+"""
+import datetime
+import sys
+
+from conftest import APP_PATH, load_app
+
+
+def test_registry_is_kept_next_to_the_app(functions):
+    assert (functions.LEDGER_REGISTRY_FILE 
+            == str(APP_PATH.parent / "ledgers.json"))
+
+
+def make_ledger(db_path, amount):
+    app = load_app()
+    app.connect_to_database(db_path)
+    app.add_to_table("Income", ["2024-01-05", amount, "Pay", "Wages"], "no")
+    app.close_database()
+
+
+def test_unreadable_ledger_does_not_stop_the_others(tmp_path, monkeypatch):
+    app = load_app()
+    # The ledgers are summarised in forked processes, which find the 
+    # functions they run by the name of their module.
+    monkeypatch.setitem(sys.modules, app.__name__, app)
+
+    make_ledger(str(tmp_path / "home"), 10000)
+    make_ledger(str(tmp_path / "work"), 2500)
+    (tmp_path / "damaged").write_bytes(b"This is not a database." * 100)
+
+    summaries = app.summarise_ledgers(
+        [str(tmp_path / name) for name in ["home", "damaged", "missing", 
+                                           "work"]], 
+        datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+
+    assert summaries[0]["Income"][0] == 10000
+    assert "Error" in summaries[1]
+    assert "could not be found" in summaries[2]["Error"]
+    assert summaries[3]["Income"][0] == 2500
@@ -0,0 +1,157 @@
+"""
+Tests of the migration runner, migrate_database, on new databases, 
+databases made by the first version of the app and databases part way 
+through the migrations.
+"""
+import sqlite3
+
+import pytest
+
+from conftest import load_app
+
+
+def schema_versions(app):
+    app.cursor.execute('''SELECT version FROM schema_version 
+                       ORDER BY version''')
+
+    return [version for (version,) in app.cursor.fetchall()]
+
+
+def test_new_database_is_at_the_latest_version(app):
+    latest_version = app.MIGRATIONS[-1][0]
+
+    assert app.read_schema_version() == latest_version
+    assert (schema_versions(app) 
+            == [migration[0] for migration in app.MIGRATIONS])
+
+    # Opening an up to date database applies nothing.
+    assert app.migrate_database() == []
+    assert app.check_query_plans() == []
+
+
+def test_only_the_pending_migrations_are_applied(app):
+    latest_version = app.MIGRATIONS[-1][0]
+    app.cursor.execute('''DELETE FROM schema_version WHERE version > 3''')
+
+    assert app.read_schema_version() == 3
+    assert app.migrate_database() == list(range(4, latest_version + 1))
+    assert app.read_schema_version() == latest_version
+
+
+def test_failed_migration_leaves_the_database_as_it_was(app):
+    latest_version = app.MIGRATIONS[-1][0]
+
+    def failing_migration():
+        app.cursor.execute('''CREATE TABLE Half_finished(id INTEGER)''')
+        raise sqlite3.OperationalError("The migration failed.")
+
+    app.MIGRATIONS.append([latest_version + 1, "Fails part way", 
+                           failing_migration])
+
+    with pytest.raises(sqlite3.OperationalError):
+        app.migrate_database()
+
+    assert app.read_schema_version() == latest_version
+    app.cursor.execute('''SELECT name FROM sqlite_master 
+                       WHERE name = 'Half_finished' ''')
+    assert app.cursor.fetchone() == None
+
+
+def test_first_version_database_is_converted(tmp_path):
+    db_path = str(tmp_path / "budget_app_db")
+
+    # The tables as the first version of the app made them, with dates as 
+    # text, amounts in pounds and the name of each category in each record.
+    old_db = sqlite3.connect(db_path)
+    old_db.executescript('''
+        CREATE TABLE Income( id INTEGER PRIMARY KEY, date DATE, amount REAL, 
+            category TEXT DEFAULT "Misc" NOT NULL, description TEXT);
+        CREATE TABLE Expenses( id INTEGER PRIMARY KEY, date DATE, 
+            amount REAL, category TEXT DEFAULT "Misc" NOT NULL, 
+            description TEXT);
+        CREATE TABLE Budget( category TEXT PRIMARY KEY, budget REAL);
+        CREATE TABLE Goals( date DATE, amount REAL, description TEXT, 
+            id INTEGER PRIMARY KEY);
+        INSERT INTO Income(date, amount, category, description) 
+            VALUES ('2024-01-05', 1250.5, 'Salary', 'January pay');
+        INSERT INTO Expenses(date, amount, category, description) 
+            VALUES ('2024-01-06', 3.2, 'Food', 'Coffee'), 
+                   ('2024-01-07', 19.99, 'Misc', 'Book');
+        INSERT INTO Budget(category, budget) VALUES ('Food', 25.5);
+        INSERT INTO Goals(date, amount, description) 
+            VALUES ('2024-01-01', 500.0, 'Holiday');
+    ''')
+    old_db.commit()
+    old_db.close()
+
+    app = load_app()
+    app.connect_to_database(db_path)
+
+    try:
+        assert app.read_schema_version() == app.MIGRATIONS[-1][0]
+        assert (app.retrieve_by_id("Income", 1) 
+                == ("2024-01-05", 125050, "Salary", "January pay", 1))
+        assert (app.retrieve_by_id("Expenses", 2) 
+                == ("2024-01-07", 1999, "Misc", "Book", 2))
+        assert app.budget_for_category_over_date("Food", 
+            app.datetime.date(2024, 1, 1), 
+            app.datetime.date(2024, 1, 8)) == 2550
+        assert (app.retrieve_totals("Expenses", "2024-01-01", "2024-01-31") 
+                == [2319, 2, 320, 1999])
+
+        app.cursor.execute('''SELECT date, amount FROM Goals''')
+        assert (app.cursor.fetchall() 
+                == [(app.date_to_day_number("2024-01-01"), 50000)])
+
+        # Every record has been given its content hash.
+        app.cursor.execute('''SELECT COUNT(*) FROM Expenses 
+                           WHERE content_hash IS NULL''')
+        assert app.cursor.fetchone() == (0,)
+        assert app.check_query_plans() == []
+
+    finally:
+        app.close_database()
+
+
+def test_unique_content_hashes_are_made_non_unique(tmp_path):
+    db_path = str(tmp_path / "budget_app_db")
+    app = load_app()
+    app.connect_to_database(db_path)
+
+    # Put the database back to how version 5 left it, with unique content
+    # hash indexes, a record with a hash worked out the old way and a copy
+    # of a record without a hash.
+    app.cursor.executescript('''
+        DELETE FROM schema_version WHERE version > 5;
+        DROP INDEX Expenses_content_hash_idx;
+        CREATE UNIQUE INDEX Expenses_content_hash_idx 
+            ON Expenses(content_hash);
+        INSERT INTO Categories(table_name, name) VALUES ('Expenses', 'Food');
+        INSERT INTO Expenses(date, amount, category_id, description, 
+            content_hash) VALUES (2460371, 250, 1, 'Tea', X'00');
+        INSERT INTO Expenses(date, amount, category_id, description) 
+            VALUES (2460371, 300, 1, 'Coffee');
+    ''')
+    app.close_database()
+
+    app = load_app()
+    app.connect_to_database(db_path)
+
+    try:
+        app.cursor.execute('''SELECT sql FROM sqlite_master 
+                           WHERE name = 'Expenses_content_hash_idx' ''')
+        assert "UNIQUE" not in app.cursor.fetchone()[0]
+
+        app.cursor.execute('''SELECT content_hash FROM Expenses 
+                           ORDER BY id''')
+        assert (app.cursor.fetchall() 
+                == [(app.content_hash(2460371, 250, "Tea"),), 
+                    (app.content_hash(2460371, 300, "Coffee"),)])
+
+        app.add_to_table("Expenses", ["2024-03-01", 300, "Food", "Coffee"], 
+                         "no")
+        app.cursor.execute('''SELECT COUNT(*) FROM Expenses''')
+        assert app.cursor.fetchone() == (3,)
+
+    finally:
+        app.close_database()
@@ -0,0 +1,94 @@
+"""
+Tests that paging through records with keys finds every record exactly 
+once, in both directions, even when many records share a date and amount.
+"""
+import random
+
+import pytest
+
+
+@pytest.fixture
+def paged_app(app):
+    generator = random.Random(5)
+    records = []
+
+    # Far more records than fit on one page, on only a few dates and with
+    # few different amounts, so most of each key is the same.
+    for i in range(app.RECORD_DISPLAY_LIMIT * 3 + 17):
+        records.append([f"2024-05-{generator.randint(1, 3):02}", 
+                        generator.choice([100, 200, 300]),
+                        generator.choice(["Food", "Misc"]), 
+                        generator.choice(["Shop", "Cafe"]) + f" {i}"])
+
+    app.add_to_table("Expenses", records, "yes")
+
+    return app
+
+
+@pytest.mark.parametrize("category", [None, "Food"])
+def test_pages_cover_every_record_once(paged_app, category):
+    date_range = ["2024-05-01", "2024-05-31"]
+    expected = paged_app.retrieve_income_expense(
+        "Expenses", date_range[0], date_range[1], category)
+
+    pages = []
+    page = paged_app.retrieve_page("Expenses", date_range, category)
+
+    while len(page) != 0:
+        assert len(page) <= paged_app.RECORD_DISPLAY_LIMIT
+        pages.append(page)
+        page = paged_app.retrieve_page("Expenses", date_range, category, 
+                                       page[-1], "next")
+
+    assert [record for page in pages for record in page] == expected
+
+    # Going back from the last page gives the same pages in reverse.
+    previous_pages = [pages[-1]]
+    page = paged_app.retrieve_page("Expenses", date_range, category, 
+                                   pages[-1][0], "previous")
+
+    while len(page) != 0:
+        previous_pages.append(page)
+        page = paged_app.retrieve_page("Expenses", date_range, category, 
+                                       page[0], "previous")
+
+    assert ([record for page in reversed(previous_pages) for record in page]
+            == expected)
+
+
+def test_pages_stay_within_the_date_range(paged_app):
+    page = paged_app.retrieve_page("Expenses", ["2024-05-02", "2024-05-02"])
+
+    while len(page) != 0:
+        assert all(record[0] == "2024-05-02" for record in page)
+        page = paged_app.retrieve_page("Expenses", 
+                                       ["2024-05-02", "2024-05-02"], None, 
+                                       page[-1], "next")
+
+
+def test_pages_split_records_of_the_same_date_and_amount(app):
+    # Every record has the same date and amount, so each page boundary falls
+    # between records whose keys differ only by their ID.
+    records = [["2024-05-01", 100, "Food", f"Shop {i}"] 
+               for i in range(app.RECORD_DISPLAY_LIMIT * 2 + 3)]
+    app.add_to_table("Expenses", records, "yes")
+    date_range = ["2024-05-01", "2024-05-01"]
+
+    first_page = app.retrieve_page("Expenses", date_range)
+    second_page = app.retrieve_page("Expenses", date_range, None, 
+                                    first_page[-1], "next")
+    last_page = app.retrieve_page("Expenses", date_range, None, 
+                                  second_page[-1], "next")
+
+    assert ([len(first_page), len(second_page), len(last_page)] 
+            == [app.RECORD_DISPLAY_LIMIT, app.RECORD_DISPLAY_LIMIT, 3])
+    assert ({record[-1] for record in first_page + second_page + last_page}
+            == {record[-1] for record in records})
+
+    # There is nothing after the last record or before the first.
+    assert app.retrieve_page("Expenses", date_range, None, last_page[-1], 
+                             "next") == []
+    assert app.retrieve_page("Expenses", date_range, None, first_page[0], 
+                             "previous") == []
+    assert app.retrieve_page("Expenses", date_range, None, last_page[0], 
+                             "previous") == second_page
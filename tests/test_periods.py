@@ -0,0 +1,103 @@
+"""
+Tests that the totals of a date range of any length, and of each day, week,
+month or year of it, are the same as adding up the records themselves.
+"""
+import datetime
+import random
+
+import pytest
+
+
+def python_bucket(date, period):
+    if period == "day":
+        return str(date)
+
+    elif period == "week":
+        return str(date - datetime.timedelta(days = date.weekday()))
+
+    elif period == "month":
+        return date.strftime("%Y-%m")
+
+    return date.strftime("%Y")
+
+
+@pytest.fixture
+def ledger_app(app):
+    generator = random.Random(13)
+    first_day = datetime.date(2016, 1, 1)
+    records = []
+
+    # Records over more than eight years, so long ranges cross many months,
+    # years and leap days.
+    for i in range(2000):
+        date = first_day + datetime.timedelta(
+            days = generator.randint(0, 3100))
+        records.append([str(date), generator.randint(1, 50000),
+                        generator.choice(["Food", "Rent", "Misc"]),
+                        f"Expense {i}"])
+
+    app.add_to_table("Expenses", records, "yes")
+    app.records = records
+
+    return app
+
+
+@pytest.mark.parametrize("period", ["day", "week", "month", "year"])
+@pytest.mark.parametrize("category", [None, "Food"])
+def test_period_totals_match_the_records(ledger_app, period, category):
+    (start_date, end_date) = ("2016-02-29", "2024-06-30")
+    expected = {}
+
+    for [date, amount, record_category, *_] in ledger_app.records:
+        if (not start_date <= date <= end_date
+            or category not in [None, record_category]):
+            continue
+
+        bucket = python_bucket(datetime.date.fromisoformat(date), period)
+        [total, count, smallest, largest] = expected.get(
+            bucket, [0, 0, amount, amount])
+        expected[bucket] = [total + amount, count + 1, min(smallest, amount),
+                            max(largest, amount)]
+
+    period_totals = ledger_app.retrieve_period_totals(
+        "Expenses", start_date, end_date, period, category)
+
+    assert period_totals == [tuple([bucket] + expected[bucket])
+                             for bucket in sorted(expected)]
+
+
+def test_weeks_are_labelled_with_their_monday(app):
+    # 2024-03-06 was a Wednesday and 2024-03-10 the Sunday of the same week.
+    app.add_to_table("Expenses", [["2024-03-06", 300, "Food", "Coffee"],
+                                  ["2024-03-10", 700, "Food", "Lunch"],
+                                  ["2024-03-11", 200, "Food", "Tea"]],
+                     "yes")
+
+    assert app.retrieve_period_totals("Expenses", "2024-03-01", "2024-03-31",
+                                      "week") == [("2024-03-04", 1000, 2,
+                                                   300, 700),
+                                                  ("2024-03-11", 200, 1,
+                                                   200, 200)]
+
+
+def test_long_range_totals_match_the_records(ledger_app):
+    amounts = [record[1] for record in ledger_app.records]
+
+    assert (ledger_app.retrieve_totals("Expenses", "2000-01-01", "2099-12-31")
+            == [sum(amounts), len(amounts), min(amounts), max(amounts)])
+
+    # A range with no records has no smallest or largest amount.
+    assert (ledger_app.retrieve_totals("Expenses", "2030-01-01", "2039-12-31")
+            == [0, 0, None, None])
+
+
+def test_ranges_and_periods_are_checked(functions):
+    assert (functions.validate_date_range("2015-01-01", "2025-12-31")
+            == [datetime.date(2015, 1, 1), datetime.date(2025, 12, 31)])
+    assert functions.validate_period("Month") == "month"
+
+    with pytest.raises(ValueError):
+        functions.validate_date_range("2024-03-02", "2024-03-01")
+
+    with pytest.raises(ValueError):
+        functions.validate_period("fortnight")
@@ -0,0 +1,101 @@
+"""
+Tests of the requests of the local JSON service, handled by 
+handle_api_request, and of the connections to it, handled by 
+handle_api_connection.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import sqlite3
+import threading
+
+import pytest
+
+
+def test_same_record_can_be_posted_twice(app):
+    parameters = {"table": "Expenses", "date": "2024-03-01", 
+                  "amount": "3.00", "category": "Food", 
+                  "description": "Coffee"}
+
+    [first_status, first_response] = app.handle_api_request("POST", 
+        "/records", parameters)
+    [second_status, second_response] = app.handle_api_request("POST", 
+        "/records", parameters)
+
+    assert first_status == 201 and second_status == 201
+    assert first_response["id"] != second_response["id"]
+
+
+def test_parameters_must_be_strings(app):
+    parameters = {"table": "Expenses", "date": "2024-03-01", "amount": 3, 
+                  "category": "Food", "description": "Coffee"}
+
+    # The amount may be a number.
+    assert app.handle_api_request("POST", "/records", parameters)[0] == 201
+
+    for name, value in [["description", None], ["description", 5], 
+                        ["category", ["Food"]], ["amount", True], 
+                        ["date", {"year": 2024}]]:
+        with pytest.raises(ValueError):
+            app.handle_api_request("POST", "/records", 
+                                   dict(parameters, **{name: value}))
+
+    # Nothing was added by the requests which were rejected.
+    app.cursor.execute('''SELECT description FROM Expenses''')
+    assert app.cursor.fetchall() == [("Coffee",)]
+
+
+async def request_goals_while_moving(app, no_of_requests, move_started):
+    read_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+    write_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+    server = await asyncio.start_server(
+        functools.partial(app.handle_api_connection, 
+                          read_executor = read_executor, 
+                          write_executor = write_executor), 
+        "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        (reader, writer) = await asyncio.open_connection("127.0.0.1", port)
+
+        for _ in range(no_of_requests):
+            writer.write(b"GET /goals HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            content_length = int(head.split(b"Content-Length: ")[1]
+                                 .split(b"\r\n")[0])
+            await reader.readexactly(content_length)
+            assert head.startswith(b"HTTP/1.1 200")
+
+        # Every request was answered while the first move was still 
+        # running, then the move is let finish.
+        move_started.set()
+
+        while app.goal_checkpoint_move != None:
+            await asyncio.sleep(0.01)
+
+        writer.close()
+
+    finally:
+        server.close()
+        await server.wait_closed()
+        read_executor.shutdown()
+        write_executor.shutdown()
+
+
+def test_goal_checkpoint_moves_are_not_queued(app, monkeypatch, capsys):
+    moves = []
+    move_started = threading.Event()
+
+    def move_goal_checkpoint():
+        moves.append(move_started.is_set())
+        move_started.wait(5)
+
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(app, "move_goal_checkpoint", move_goal_checkpoint)
+
+    asyncio.run(request_goals_while_moving(app, 3, move_started))
+
+    # Only the first request started a move and its error was reported.
+    assert moves == [False]
+    assert "database is locked" in capsys.readouterr().err
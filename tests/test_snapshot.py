@@ -0,0 +1,108 @@
+"""
+Tests of the snapshot files written by write_snapshot and read by 
+open_snapshot.
+"""
+import array
+import json
+
+
+def add_records(app):
+    app.add_to_table("Expenses", [["2024-01-01", 1000, "Food", "Shop"], 
+                                  ["2024-01-20", -2500, "Food", "Refund"], 
+                                  ["2024-02-10", 400, "Travel", "Bus"]], 
+                     "yes")
+    app.add_to_table("Income", ["2024-01-05", 10000, "Pay", "Wages"], "no")
+
+
+def read_header(data, app):
+    header_start = len(app.SNAPSHOT_MAGIC) + 8
+    header_length = int.from_bytes(data[len(app.SNAPSHOT_MAGIC)
+                                        :header_start], "little")
+    header = json.loads(data[header_start:header_start + header_length])
+
+    return [header, header_start + header_length]
+
+
+def test_snapshot_round_trips(app, tmp_path):
+    add_records(app)
+    file_path = str(tmp_path / "snapshot")
+
+    app.write_snapshot(file_path)
+    ledgers = app.open_snapshot(file_path)
+
+    expenses = ledgers["Expenses"]
+    assert list(expenses["amount"]) == [1000, -2500, 400]
+    assert sorted(expenses["categories"].values()) == ["Food", "Travel"]
+    assert list(ledgers["Income"]["amount"]) == [10000]
+
+
+def test_snapshot_columns_are_little_endian(app, tmp_path):
+    add_records(app)
+    file_path = str(tmp_path / "snapshot")
+
+    app.write_snapshot(file_path)
+    data = open(file_path, "rb").read()
+    [header, columns_start] = read_header(data, app)
+
+    assert header["byteorder"] == "little"
+
+    start = columns_start + header["tables"]["Expenses"]["amount"]
+    amounts = [int.from_bytes(data[start + 8 * i:start + 8 * (i + 1)], 
+                              "little", signed = True) for i in range(3)]
+    assert amounts == [1000, -2500, 400]
+
+
+def test_big_endian_snapshot_is_read(app, tmp_path):
+    add_records(app)
+    file_path = str(tmp_path / "snapshot")
+
+    app.write_snapshot(file_path)
+    data = open(file_path, "rb").read()
+    [header, columns_start] = read_header(data, app)
+
+    # Rewrite the snapshot as an older version of the app would have on a 
+    # big endian computer.
+    header["byteorder"] = "big"
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b" " * (-len(header_bytes) % 8)
+    columns = array.array("q", data[columns_start:])
+    columns.byteswap()
+
+    with open(file_path, "wb") as file:
+        file.write(app.SNAPSHOT_MAGIC)
+        file.write(len(header_bytes).to_bytes(8, "little"))
+        file.write(header_bytes)
+        file.write(columns.tobytes())
+
+    ledgers = app.open_snapshot(file_path)
+
+    assert list(ledgers["Expenses"]["amount"]) == [1000, -2500, 400]
+    assert list(ledgers["Income"]["amount"]) == [10000]
+
+
+def test_snapshot_of_empty_tables_round_trips(app, tmp_path):
+    file_path = str(tmp_path / "snapshot")
+
+    app.write_snapshot(file_path)
+    ledgers = app.open_snapshot(file_path)
+
+    for table_name in ["Income", "Expenses"]:
+        assert len(ledgers[table_name]["date"]) == 0
+        assert len(ledgers[table_name]["amount"]) == 0
+        assert ledgers[table_name]["categories"] == {}
+
+
+def test_snapshot_keeps_negative_amounts_and_day_numbers(app, tmp_path):
+    records = [["1999-12-31", -1, "Refunds", "Penny"],
+               ["2024-02-29", -2500, "Refunds", "Shoes"],
+               ["2024-03-01", -(2 ** 40), "Refunds", "House"]]
+    app.add_to_table("Expenses", records, "yes")
+    file_path = str(tmp_path / "snapshot")
+
+    app.write_snapshot(file_path)
+    ledger = app.open_snapshot(file_path)["Expenses"]
+
+    assert list(ledger["amount"]) == [record[1] for record in records]
+    assert (list(ledger["date"]) 
+            == [app.date_to_day_number(record[0]) for record in records])
+    assert list(ledger["categories"].values()) == ["Refunds"]